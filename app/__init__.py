@@ -15,7 +15,7 @@ logging.basicConfig(level=logging.INFO)
 db = SQLAlchemy(session_options={"expire_on_commit": False})
 migrate = Migrate()
 
-from app.config import config_map, TestingConfig
+from app.config import config_map, TestingConfig, validate_config, log_database
 
 # Blueprint imports
 from app.routes.auth_routes                import auth_bp
@@ -41,7 +41,11 @@ from app.routes.admin_routes               import admin_bp
 from app.routes.labor_equipment_routes     import labor_equipment_bp
 from app.routes.media_routes               import media_bp
 from app.routes.documents_routes           import documents_bp
+from app.routes.exports_routes             import exports_bp
+from app.routes.progress_routes            import progress_bp
 from app.utils.auth_decorators import login_required, roles_required
+from app.utils import (db_engine, project_resolver, master_cache, cost_summaries, thumbnails,
+                       picture_metadata, request_metrics, n_plus_one)
 
 
 
@@ -58,8 +62,12 @@ def create_app(config_name: str = None):
 
     if isinstance(config_name, type):
         config_class = config_name
+        # Validate a config class as the environment it derives from
+        env_name = next((name for name, cls in config_map.items()
+                         if issubclass(config_class, cls)), None)
     else:
         config_class = config_map.get(config_name, config_map['development'])
+        env_name = config_name
 
 
     app = Flask(
@@ -68,11 +76,23 @@ def create_app(config_name: str = None):
         template_folder=os.path.join(os.path.dirname(__file__), 'templates')
     )
 
+    validate_config(env_name)
     app.config.from_object(config_class)
     logger.info(f"Starting '{config_name}' mode → DB = {app.config['SQLALCHEMY_DATABASE_URI']}")
+    log_database(app.config['SQLALCHEMY_DATABASE_URI'])
 
+    db_engine.configure(app)
     db.init_app(app)
+    with app.app_context():
+        db_engine.install_pragmas(app, db.engine)
     migrate.init_app(app, db)
+    project_resolver.init_app(app)
+    master_cache.init_app(app)
+    cost_summaries.init_app(app)
+    thumbnails.init_app(app)
+    picture_metadata.init_app(app)
+    request_metrics.init_app(app)
+    n_plus_one.init_app(app)
     Session(app)
 
     if config_class is TestingConfig:
@@ -102,6 +122,8 @@ def create_app(config_name: str = None):
         labor_equipment_bp,
         media_bp,
         documents_bp,
+        exports_bp,
+        progress_bp,
         admin_bp,
     ]
     for bp in protected_bps:
@@ -156,6 +178,8 @@ def create_app(config_name: str = None):
     app.register_blueprint(labor_equipment_bp)
     app.register_blueprint(media_bp)
     app.register_blueprint(documents_bp)
+    app.register_blueprint(exports_bp)
+    app.register_blueprint(progress_bp)
     app.register_blueprint(admin_bp)
 
 
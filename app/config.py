@@ -44,10 +44,11 @@ def normalize_db_url(url: str) -> str:
 
 # ─── Required Env Vars ─────────────────────────────────────────────────────────
 
-def validate_config():
+def validate_config(env=None):
+    """Check required environment variables; called from ``create_app``."""
     required_env_vars = ['FLASK_SECRET_KEY', 'DATABASE_URL']
     optional_api_keys = ['WEATHER_API_KEY', 'SPEECH_API_KEY', 'SPEECH_REGION']
-    env = os.getenv("FLASK_ENV", "production")
+    env = env or os.getenv("FLASK_ENV", "production")
 
 
 
@@ -61,7 +62,6 @@ def validate_config():
             if env == "production":
                 raise RuntimeError(f"Critical Error: {key} is not set in Production!")
             logger.warning(f"Environment variable '{key}' is not set. Some features may be disabled.")
-validate_config()
 
 # ─── Base Config ────────────────────────────────────────────────────────────────
 
@@ -76,9 +76,51 @@ class Config:
     SQLALCHEMY_DATABASE_URI = normalize_db_url(raw_db)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Engine tuning applied in create_app (see app/utils/db_engine.py).
+    # Pool sizes apply to file-based SQLite and server databases; the
+    # PRAGMAs run on every new SQLite connection.
+    DB_POOL_SIZE    = int(os.getenv('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',       # readers and the writer no longer block each other
+        'synchronous': 'NORMAL',     # durable enough with WAL, far fewer fsyncs
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'cache_size': -65536,        # 64 MiB page cache (negative = KiB)
+        'mmap_size': 268435456,      # 256 MiB
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    }
+
     SESSION_TYPE      = 'filesystem'
     SESSION_PERMANENT = False
 
+    # Seconds a cached master-data dropdown payload may live in one process
+    # before it is rebuilt (picks up writes made by other workers).
+    MASTER_DATA_CACHE_TTL = int(os.getenv('MASTER_DATA_CACHE_TTL', '300'))
+
+    # Worker processes for picture thumbnails and EXIF extraction after upload
+    # (0 = run inline on commit).
+    THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', '2'))
+
+    # Per-endpoint request metrics served at /admin/metrics: number of recent
+    # requests kept per endpoint for the quantiles, and whether responses
+    # carry a Server-Timing header.
+    REQUEST_METRICS_WINDOW        = int(os.getenv('REQUEST_METRICS_WINDOW', '1024'))
+    REQUEST_METRICS_SERVER_TIMING = os.getenv('REQUEST_METRICS_SERVER_TIMING', 'true').lower() == 'true'
+
+    # N+1 detector (app/utils/n_plus_one.py): 'off', 'warn' or 'raise' when a
+    # request runs the same parameterised statement more than the threshold.
+    N_PLUS_ONE_MODE      = os.getenv('N_PLUS_ONE_MODE', 'off').lower()
+    N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '5'))
+
+    # Let the fronting web server stream document downloads: '' (off),
+    # 'x-sendfile' (Apache/lighttpd) or 'x-accel-redirect' (nginx, with an
+    # internal location at DOWNLOAD_ACCEL_PREFIX aliased to UPLOAD_FOLDER).
+    DOWNLOAD_OFFLOAD      = os.getenv('DOWNLOAD_OFFLOAD', '').lower()
+    DOWNLOAD_ACCEL_PREFIX = os.getenv('DOWNLOAD_ACCEL_PREFIX', '/protected-uploads/')
+
     # Paths to your CSV/data files
     PROJECT_FILE        = os.path.join(BASE_DIR,  'data',     'project.csv')
     WORKERS_FILE        = os.path.join(BASE_DIR,  'data',     'workers.csv')
@@ -94,12 +136,15 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    N_PLUS_ONE_MODE = os.getenv('N_PLUS_ONE_MODE', 'warn').lower()
     # In dev we explicitly re-use our sqlite file with the proper scheme
     SQLALCHEMY_DATABASE_URI = normalize_db_url(DEFAULT_DB_PATH)
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    THUMBNAIL_WORKERS = 0
+    N_PLUS_ONE_MODE = 'raise'
 
 class ProductionConfig(Config):
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY", Config.SECRET_KEY)
@@ -119,9 +164,9 @@ config_map = {
 
 # ─── Startup Logging ───────────────────────────────────────────────────────────
 
-logger.info(f"Config loaded. Using database: {Config.SQLALCHEMY_DATABASE_URI}")
-db_uri  = Config.SQLALCHEMY_DATABASE_URI
-db_path = db_uri.replace('sqlite:///', '')
-exists  = os.path.exists(db_path)
-logger.info(f"→ SQLALCHEMY_DATABASE_URI = {db_uri}")
-logger.info(f"→ underlying file {db_path!r} exists? {exists}")
+def log_database(db_uri):
+    """Log the database in use and, for SQLite, whether its file exists."""
+    logger.info(f"→ SQLALCHEMY_DATABASE_URI = {db_uri}")
+    if db_uri.startswith('sqlite:///'):
+        db_path = db_uri.replace('sqlite:///', '')
+        logger.info(f"→ underlying file {db_path!r} exists? {os.path.exists(db_path)}")
@@ -3,6 +3,10 @@ from app import db
 
 class EquipmentEntry(db.Model):
     __tablename__ = 'entries_equipment'  # Make sure this is set!
+    __table_args__ = (
+        # Tab loads filter on one project's day (and status), ordered by id
+        db.Index('ix_entries_equipment_project_date_status', 'project_id', 'date_of_report', 'status', 'id'),
+    )
 
     ############################## Core Fields ###############################
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -3,6 +3,10 @@ from app import db
 
 class SubcontractorEntry(db.Model):
     __tablename__ = 'subcontractor_entries'
+    __table_args__ = (
+        # Tab loads filter on one project's day (and status), ordered by id
+        db.Index('ix_subcontractor_entries_project_date_status', 'project_id', 'date', 'status', 'id'),
+    )
 
     ################################## Core Fields ###############################################
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
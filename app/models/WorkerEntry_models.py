@@ -7,6 +7,10 @@ class WorkerEntry(db.Model):
     Represents a daily worker entry for tracking labor hours, project details, and activity codes.
     """
     __tablename__ = 'entries_workers'
+    __table_args__ = (
+        # Tab loads filter on one project's day (and status), ordered by id
+        db.Index('ix_entries_workers_project_date_status', 'project_id', 'date_of_report', 'status', 'id'),
+    )
 
     ################################## Core Fields ###############################################
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
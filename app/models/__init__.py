@@ -8,6 +8,9 @@ from .daily_models import DailyNoteEntry, DailyPicture, WeatherLog
 from .DailyNoteAttachment import DailyNoteAttachment
 from .models import TabProgress, Document, SustainabilityMetric
 from .daily_report_status import DailyReportStatus
+from .report_draft import ReportDraft
+from .daily_cost_summary import DailyCostSummary
+from .project_progress import ProjectProgress
 from .purchase_order_models import PurchaseOrder, PurchaseOrderAttachment
 #from .daily_report_data import DailyReportData
 from .WorkerEntry_models import WorkerEntry
@@ -39,6 +42,8 @@ __all__ = [
             "Document",
             "SustainabilityMetric",
             "DailyReportStatus",
+            "ReportDraft",
+            "DailyCostSummary",
             "PurchaseOrder",
             "PurchaseOrderAttachment",
             "WorkerEntry",
@@ -156,6 +156,7 @@ class ProjectTask(db.Model):
     EAC = db.Column(db.Float, nullable=True, default=0.0)  # Estimate at Completion
     ETC = db.Column(db.Float, nullable=True, default=0.0)  # Estimate to Complete
     TCPI = db.Column(db.Float, nullable=True, default=0.0)  # To-Complete Performance Index
+    evm_computed_at = db.Column(db.DateTime, nullable=True)  # Last run of app.utils.evm over this task
 
     # Work Package and Specialty        
     CWP = db.Column(db.String(100), nullable=True)  # Construction Work Package
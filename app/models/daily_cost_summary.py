@@ -0,0 +1,50 @@
+from datetime import datetime
+from .. import db
+
+
+class DailyCostSummary(db.Model):
+    """Pre-aggregated cost of the committed entries of one project day.
+
+    One row per (project, report date, activity code).  Kept up to date by
+    ``app.utils.cost_summaries`` whenever entries are committed, rejected or
+    deleted, and rebuilt set-wise by ``manage.py rebuild-cost-summaries``.
+    """
+    __tablename__ = 'daily_cost_summaries'
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'report_date', 'activity_code_id',
+                            name='uq_daily_cost_summaries_project_date_activity'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    report_date = db.Column(db.Date, nullable=False)
+    activity_code_id = db.Column(db.Integer, db.ForeignKey('activity_codes.id'), nullable=True)
+
+    labor_hours = db.Column(db.Float, nullable=False, default=0.0)
+    labor_cost = db.Column(db.Float, nullable=False, default=0.0)  # hours_worked * taux_horaire
+    equipment_hours = db.Column(db.Float, nullable=False, default=0.0)
+    equipment_cost = db.Column(db.Float, nullable=False, default=0.0)  # hours_used * Equipment.hourly_rate
+    material_cost = db.Column(db.Float, nullable=False, default=0.0)  # quantity_used * Material.cost_per_unit
+    subcontractor_hours = db.Column(db.Float, nullable=False, default=0.0)
+    subcontractor_cost = db.Column(db.Float, nullable=False, default=0.0)
+    total_cost = db.Column(db.Float, nullable=False, default=0.0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DailyCostSummary {self.project_id}/{self.report_date}/{self.activity_code_id}>"
+
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'report_date': self.report_date.isoformat() if self.report_date else None,
+            'activity_code_id': self.activity_code_id,
+            'labor_hours': self.labor_hours,
+            'labor_cost': self.labor_cost,
+            'equipment_hours': self.equipment_hours,
+            'equipment_cost': self.equipment_cost,
+            'material_cost': self.material_cost,
+            'subcontractor_hours': self.subcontractor_hours,
+            'subcontractor_cost': self.subcontractor_cost,
+            'total_cost': self.total_cost,
+        }
@@ -4,6 +4,10 @@ from .. import db
 
 class DailyNoteEntry(db.Model):
     __tablename__ = 'entries_daily_notes'
+    __table_args__ = (
+        # Tab loads filter on one project's day (and status), ordered by id
+        db.Index('ix_entries_daily_notes_project_date_status', 'project_id', 'date_of_report', 'status', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -58,12 +62,18 @@ class DailyNoteEntry(db.Model):
 
 class DailyPicture(db.Model):
     __tablename__ = 'daily_pictures'
+    __table_args__ = (
+        # Media lists page through one project's rows newest first (keyset on uploaded_at, id)
+        db.Index('ix_daily_pictures_project_status_uploaded', 'project_id', 'status', 'uploaded_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)  # Links to a project
     #daily_log_id = db.Column(db.Integer, db.ForeignKey('daily_report_data.id'), nullable=True)  # Links to a daily log
     file_name = db.Column(db.String(255), nullable=False)  # Picture file name
     file_url = db.Column(db.String(2083), nullable=False)  # Path or URL to the picture
+    sha256 = db.Column(db.String(64), nullable=True, index=True)  # Content hash of the stored blob
+    file_size = db.Column(db.BigInteger, nullable=True)  # Size in bytes
     description = db.Column(db.Text, nullable=True)  # Description or notes about the picture
     taken_at = db.Column(db.DateTime, nullable=True)  # Timestamp when the picture was taken
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)  # Timestamp of upload
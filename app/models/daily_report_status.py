@@ -5,6 +5,10 @@ from .. import db
 
 class DailyReportStatus(db.Model):
     __tablename__ = 'daily_report_statuses'
+    __table_args__ = (
+        # Calendar month views filter on a date range first, then group by project
+        db.Index('ix_daily_report_statuses_date_project', 'report_date', 'project_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)  # Unique ID for the status record
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)  # FK to the Projects table
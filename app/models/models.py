@@ -142,6 +142,13 @@ class SustainabilityMetric(db.Model):
 
 class Document(db.Model):
     __tablename__ = 'documents'
+    __table_args__ = (
+        # Media lists page through one project's rows newest first (keyset on uploaded_at, id)
+        db.Index('ix_documents_project_status_uploaded', 'project_id', 'status', 'uploaded_at', 'id'),
+        # cw_packages is keyed by (project_id, code), so the reference must be too
+        db.ForeignKeyConstraint(['project_id', 'cwp_code'], ['cw_packages.project_id', 'cw_packages.code'],
+                                name='fk_documents_cwp_code'),
+    )
     
     # Core Fields
     id = db.Column(db.Integer, primary_key=True)
@@ -151,9 +158,11 @@ class Document(db.Model):
     file_url = db.Column(db.String(2083), nullable=False)  # Path or URL to the file
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)  # Timestamp of upload
     status = db.Column(db.Enum('pending', 'committed', name='record_status'), default='pending')    
+    sha256 = db.Column(db.String(64), nullable=True, index=True)  # Content hash of the stored blob
+    file_size = db.Column(db.BigInteger, nullable=True)  # Size in bytes
     activity_code_id = db.Column(db.Integer, db.ForeignKey('activity_codes.id'), nullable=True)
     payment_item_id = db.Column(db.Integer, db.ForeignKey('payment_items.id'), nullable=True)
-    cwp_code = db.Column(db.String(50), db.ForeignKey('cw_packages.code'), nullable=True)
+    cwp_code = db.Column(db.String(50), nullable=True)
 
     # Document Type and Category
     document_type = db.Column(
@@ -186,7 +195,8 @@ class Document(db.Model):
     #daily_log = db.relationship('DailyReportData', back_populates='documents')
     activity_code = db.relationship('ActivityCode', backref='documents', lazy=True, foreign_keys=[activity_code_id])
     payment_item = db.relationship('PaymentItem', backref='documents', lazy=True, foreign_keys=[payment_item_id])
-    cwp_package = db.relationship('CWPackage', backref='documents', lazy=True, foreign_keys=[cwp_code])
+    cwp_package = db.relationship('CWPackage', backref=db.backref('documents', viewonly=True), lazy=True,
+                                  foreign_keys=[project_id, cwp_code], viewonly=True)
 
     def __repr__(self):
         return f"<Document id={self.id} file_name={self.file_name}>"
@@ -0,0 +1,36 @@
+from datetime import datetime
+from .. import db
+
+
+class ProjectProgress(db.Model):
+    """One point of a project's progress time series.
+
+    Stores the day's deltas next to running (prefix) sums, so an S-curve is a
+    plain range read and the change over any period is the difference of two
+    cumulative values.  Maintained by ``app.utils.progress_series``.
+    """
+    __tablename__ = 'project_progress'
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'report_date', name='uq_project_progress_project_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    report_date = db.Column(db.Date, nullable=False)
+
+    # Daily deltas
+    actual_hours = db.Column(db.Float, nullable=False, default=0.0)
+    actual_cost = db.Column(db.Float, nullable=False, default=0.0)
+    earned_value = db.Column(db.Float, nullable=False, default=0.0)
+    planned_value = db.Column(db.Float, nullable=False, default=0.0)
+
+    # Prefix sums up to and including report_date
+    cumulative_actual_hours = db.Column(db.Float, nullable=False, default=0.0)
+    cumulative_cost = db.Column(db.Float, nullable=False, default=0.0)
+    cumulative_earned_value = db.Column(db.Float, nullable=False, default=0.0)
+    cumulative_planned_value = db.Column(db.Float, nullable=False, default=0.0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ProjectProgress {self.project_id}/{self.report_date}>"
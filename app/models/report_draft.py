@@ -0,0 +1,46 @@
+from datetime import datetime
+from .. import db
+
+
+class ReportDraft(db.Model):
+    """Work-in-progress data of one daily-report tab.
+
+    One row per (user, project, report date, tab).  Replaces the
+    ``session['daily_data']`` dict so the session only carries the current
+    project/date and draft writes touch a single row.
+    """
+    __tablename__ = 'report_drafts'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'project_number', 'report_date', 'tab',
+                            name='uq_report_drafts_user_project_date_tab'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Session user id; drafts can exist before a user row or project is chosen,
+    # so neither is a foreign key.
+    user_id = db.Column(db.String(64), nullable=False, default='')
+    project_number = db.Column(db.String(50), nullable=False, default='')
+    report_date = db.Column(db.Date, nullable=False)
+    tab = db.Column(db.String(50), nullable=False)
+
+    status = db.Column(db.String(20), nullable=False, default='incomplete')  # incomplete / completed
+    entries = db.Column(db.JSON, nullable=True)
+    # Bumped on every entries write; autosave patches are applied against it
+    revision = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ReportDraft {self.user_id}/{self.project_number}/{self.report_date}/{self.tab}>"
+
+    def to_dict(self):
+        return {
+            'tab': self.tab,
+            'status': self.status,
+            'entries': self.entries or [],
+            'revision': self.revision or 0,
+            'report_date': self.report_date.isoformat() if self.report_date else None,
+            'project_number': self.project_number,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, current_app
 from app.models.core_models import ActivityCode
+from app.utils.master_cache import cached_json
+from app.utils.master_payloads import activity_codes_payload
 from app import db
 
 # Define the Blueprint for activity code-related routes
@@ -13,20 +15,8 @@ def get_activity_codes():
     and return them as JSON.
     """
     try:
-        activity_codes = ActivityCode.query.all()
-        
-        if not activity_codes:
-            return jsonify({'status': 'error', 'message': 'No activity codes found'}), 404
-        
-        # Return both the activity code and description
-        activity_codes_list = [{
-            "id": ac.id,
-            "code": ac.code,
-            "description": ac.description
-        } for ac in activity_codes]
-        
-        return jsonify({'status': 'success', 'activity_codes': activity_codes_list})
-    
+        return cached_json('activity_codes', [ActivityCode], activity_codes_payload)
+
     except Exception as e:
         current_app.logger.error(f"Error fetching activity codes: {e}")
         return jsonify({'status': 'error', 'message': 'Internal server error'}), 500
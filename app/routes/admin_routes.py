@@ -1,8 +1,10 @@
-from flask import Blueprint, render_template, current_app
+from flask import Blueprint, render_template, current_app, Response
 import json
 import os
 import glob
 
+from app.utils.request_metrics import render_prometheus
+
 admin_bp = Blueprint("admin_bp", __name__, url_prefix="/admin")
 
 @admin_bp.route("/")
@@ -42,4 +44,10 @@ def index():
             if os.path.exists(css_candidate):
                 admin_css = f"admin/assets/{os.path.basename(css_candidate)}"
 
-    return render_template("admin/index.html", admin_js=admin_js, admin_css=admin_css)
\ No newline at end of file
+    return render_template("admin/index.html", admin_js=admin_js, admin_css=admin_css)
+
+
+@admin_bp.route("/metrics")
+def metrics():
+    """Per-endpoint latency and SQL quantiles in Prometheus text format."""
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
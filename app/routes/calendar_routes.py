@@ -8,7 +8,9 @@ from flask import (Blueprint, jsonify, session, render_template, redirect, url_f
 from ..utils.user_id_by_projects import get_user_projects  # If you're still using this helper
 from ..models.core_models import Project  # Import the Project model
 from ..models.daily_report_status import DailyReportStatus  # your DailyReportStatus model
+from ..utils.master_cache import cached_payload
 from .. import db
+from datetime import date
 import logging
 
 calendar_bp = Blueprint('calendar_bp', __name__, url_prefix='/calendar')
@@ -47,6 +49,43 @@ def calendar_page():
         username=session.get('username', 'Utilisateur')
     )
 
+def _calendar_window(args):
+    """
+    Return the ``[start, end)`` date window requested by the calendar.
+
+    ``year`` + ``month`` select one month (what calendar.js sends);
+    ``start`` / ``end`` (ISO dates, end exclusive) select an arbitrary
+    range.  Returns ``None`` when no window is given.  Raises ``ValueError``
+    on malformed parameters.
+    """
+    if args.get('start') or args.get('end'):
+        start = date.fromisoformat(args['start']) if args.get('start') else None
+        end = date.fromisoformat(args['end']) if args.get('end') else None
+        if start and end and end <= start:
+            raise ValueError("end must be after start")
+        return start, end
+
+    year, month = args.get('year'), args.get('month')
+    if not year and not month:
+        return None
+    if not year or not month:
+        raise ValueError("year and month are both required")
+    year, month = int(year), int(month)
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def _projects_payload():
+    projects = Project.query.all()
+    return {
+        # project_id -> "24-401" for calendar cell labels
+        'labels': {str(p.id): f"{p.project_number}" for p in projects},
+        # project_id -> "24-401 - My Project" for the front-end
+        'projects': {str(p.id): f"{p.project_number} - {p.name}" for p in projects},
+    }, 200
+
+
 @calendar_bp.route('/calendar-data', methods=['GET'])
 def get_calendar_data():
     """
@@ -62,74 +101,69 @@ def get_calendar_data():
           "2": "24-404 - Another Project"
         }
       }
-    """
 
+    ``year``/``month`` (or ``start``/``end``) restrict the statuses to that
+    window; without them every row is returned.
+    """
     try:
-        # 1) Get all Projects for labeling or a user-specific subset if needed
-        projects = Project.query.all()
-
-        # Build a map: project_id -> "project_number" or "24-401 - MyProject"
-        project_map = {
-            p.id: f"{p.project_number}"  # or add more detail if you'd like
-            for p in projects
-        }
+        window = _calendar_window(request.args)
+    except (KeyError, ValueError):
+        return jsonify({'error': "Invalid year/month or start/end parameters"}), 400
 
-        # 2) Query daily_report_status table
-        status_rows = DailyReportStatus.query.all()
+    try:
+        # 1) Project labels, served from the master-data cache
+        projects, _ = cached_payload('calendar_projects', [Project], _projects_payload)
+        project_map = projects['labels']
+
+        # 2) Query daily_report_status rows in the requested window
+        #    (uses ix_daily_report_statuses_date_project)
+        query = db.session.query(
+            DailyReportStatus.report_date,
+            DailyReportStatus.project_id,
+            DailyReportStatus.report_status,
+        )
+        if window:
+            start, end = window
+            if start:
+                query = query.filter(DailyReportStatus.report_date >= start)
+            if end:
+                query = query.filter(DailyReportStatus.report_date < end)
+        status_rows = query.all()
 
         if not status_rows and 'daily_data' in session:
             daily_data = session['daily_data']
             calendar_data = {}
             for date_str, info in daily_data.items():
-                projects = info.get('projects', {})
-                calendar_data[date_str] = {pid: pinfo['status'] for pid, pinfo in projects.items()}
+                if window and not _in_window(date_str, window):
+                    continue
+                session_projects = info.get('projects', {})
+                calendar_data[date_str] = {pid: pinfo['status'] for pid, pinfo in session_projects.items()}
             return jsonify({'calendar': calendar_data, 'projects': {}}), 200
 
-
-
-
-
-
         # 3) Build the calendar dictionary
         #    date_str => { "project_number": "status", ... }
         calendar_data = {}
 
-        for row in status_rows:
-            date_str = row.report_date.isoformat()  # e.g. "2025-01-06"
-            project_label = project_map.get(row.project_id, f"proj_{row.project_id}")
-
-            # We can use the row.report_status directly:
-            status_str = row.report_status
-            # If you want to combine tab statuses into a single daily status, 
-            # apply that logic here. For example:
-            #
-            #   tab_list = [
-            #     row.workers_tab, row.materials_tab, row.equipment_tab,
-            #     row.notes_tab, row.pictures_tab, row.subcontractors_tab, row.workorders_tab
-            #   ]
-            #   if all(t == 'completed' for t in tab_list):
-            #       status_str = 'completed'
-            #   elif any(t == 'in_progress' for t in tab_list):
-            #       status_str = 'in_progress'
-            #   else:
-            #       status_str = 'pending'
-
-            if date_str not in calendar_data:
-                calendar_data[date_str] = {}
-            
-            calendar_data[date_str][project_label] = status_str
-
-        # 4) Also build a simpler “projects” dictionary for the front-end
-        project_data = {
-            str(p.id): f"{p.project_number} - {p.name}"
-            for p in projects
-        }
+        for report_date, project_id, status_str in status_rows:
+            date_str = report_date.isoformat()  # e.g. "2025-01-06"
+            project_label = project_map.get(str(project_id), f"proj_{project_id}")
+            calendar_data.setdefault(date_str, {})[project_label] = status_str
 
+        # 4) Also return the simpler “projects” dictionary for the front-end
         return jsonify({
             'calendar': calendar_data,
-            'projects': project_data
+            'projects': projects['projects']
         }), 200
-    
+
     except Exception as e:
         logging.error(f"Error in get_calendar_data: {e}", exc_info=True)
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+def _in_window(date_str, window):
+    try:
+        day = date.fromisoformat(date_str)
+    except ValueError:
+        return False
+    start, end = window
+    return (start is None or day >= start) and (end is None or day < end)
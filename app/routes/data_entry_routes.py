@@ -1,15 +1,37 @@
 # app/routes/data_entry_routes.py
 from flask import Blueprint, request, session, jsonify, flash, redirect, url_for, render_template, current_app
+from app import db
 from app.models.workforce_models import Worker
-from app.models.core_models import ActivityCode, PaymentItem, CWPackage, Project
+from app.models.core_models import ActivityCode, PaymentItem, CWPackage
 import logging
 from app.models import DailyNoteEntry
 from datetime import datetime
-import openpyxl
-import os
-import pandas as pd
 from werkzeug.utils import secure_filename
-from app.utils.data_loader import load_data  # Import the load_data function
+from app.utils.project_resolver import project_by_number
+from app.utils.master_cache import cached_json, cached_payload
+from app.utils import report_drafts
+from app.utils.json_patch import JsonPatchError
+from app.utils import master_payloads
+from app.utils.master_payloads import cwps_payload
+from app.utils.compression import compressed_json
+from app.utils.blob_storage import store_upload
+from app.utils.entry_serializers import (
+    load_entries,
+    load_documents,
+    payment_items_by_id,
+    serialize_worker_entry,
+    serialize_equipment_entry,
+    serialize_material_entry,
+    serialize_subcontractor_entry,
+    serialize_document,
+)
+from app.models.equipment_models import Equipment
+from app.models.material_models import Material
+from app.models.subcontractor_models import Subcontractor
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.EquipmentEntry_models import EquipmentEntry
+from app.models.MaterialEntry import MaterialEntry
+from app.models.SubcontractorEntry import SubcontractorEntry
 
 data_entry_bp = Blueprint('data_entry_bp', __name__, url_prefix='/data-entry')
 
@@ -25,19 +47,18 @@ def initialize_day():
         if not date_stamp:
             return jsonify({'status': 'error', 'message': 'No date provided'}), 400
 
-        # Initialize daily_data in session
-        daily_data = session.get('daily_data', {})
-        if date_stamp not in daily_data:
-            daily_data[date_stamp] = {
-                'tab_statuses': {tab: 'incomplete' for tab in ['Workers', 'Materials', 'Equipment', 'Subcontractors', 'DailyNoteEntry', 'WorkOrders', 'Pictures']},
-                'entries': {}  # Placeholder for actual data
-            }
-            session['daily_data'] = daily_data
-            # store under new unified key
-            session['report_date'] = date_stamp
-            # keep legacy key for backward compatibility
-            session['current_reporting_date'] = date_stamp
-            session.modified = True
+        # store under new unified key
+        session['report_date'] = date_stamp
+        # keep legacy key for backward compatibility
+        session['current_reporting_date'] = date_stamp
+        session.modified = True
+
+        # Create the day's tab drafts (no-op for tabs that already exist)
+        key = report_drafts.current_key()
+        if key is None:
+            return jsonify({'status': 'error', 'message': 'Invalid date'}), 400
+        report_drafts.ensure_tabs(key)
+        db.session.commit()
 
         return jsonify({'status': 'success'}), 200
     except Exception as e:
@@ -49,18 +70,7 @@ def initialize_day():
 def get_days_status():
     """Return completed and in-progress days for the calendar."""
     try:
-        daily_data = session.get('daily_data', {})
-        completed_days = []
-        in_progress_days = []
-
-        # each value in daily_data is a dict with keys 'tab_statuses' and 'entries'
-        for date_stamp, info in daily_data.items():
-            tab_statuses = info.get('tab_statuses', {})
-            statuses = list(tab_statuses.values())
-            if statuses and all(s == 'completed' for s in statuses):
-                completed_days.append(date_stamp)
-            else:
-                in_progress_days.append(date_stamp)
+        completed_days, in_progress_days = report_drafts.days_status()
 
         return jsonify({
             'completedDays': completed_days,
@@ -87,7 +97,7 @@ def submit_data_entry():
     report_date    = session.get('report_date') or session.get('current_reporting_date')
 
     # resolve numeric PK from the project_number
-    project = Project.query.filter_by(project_number=project_number).first()
+    project = project_by_number(project_number)
     if project is None:
         flash("Projet introuvable !", "danger")
         return redirect(url_for('calendar_bp.calendar_page'))
@@ -115,7 +125,7 @@ def submit_data_entry():
 @data_entry_bp.route('/payment-items/list', methods=['GET'])
 def list_payment_items():
     project_number = session.get('project_id') or session.get('project_number')
-    project = Project.query.filter_by(project_number=project_number).first()
+    project = project_by_number(project_number)
     items = PaymentItem.query.filter_by(project_id=project.id).all()
     return jsonify({
         'payment_items': [
@@ -131,12 +141,90 @@ def list_payment_items():
 def list_cwps():
     project_number = session.get('project_id') or session.get('project_number')
     #project = Project.query.filter_by(project_number=project_number).first()
-    cwps = CWPackage.query.filter_by(project_id=project_number).all()
-    return jsonify({
-        'cwps': [
-            {'code': c.code, 'name': c.name}
-            for c in cwps
-        ]
+
+    return cached_json('cwps', [CWPackage], lambda: cwps_payload(project_number),
+                       scope=project_number)
+
+# ──────────────────────────────────────────────────────────────────────────────
+#   4) One-shot bootstrap for the data-entry screen
+# ──────────────────────────────────────────────────────────────────────────────
+@data_entry_bp.route('/bootstrap', methods=['GET'])
+def bootstrap():
+    """
+    Return everything the data-entry screen needs in one (gzip) response:
+    the dropdown master data and the day's pending entries, notes and
+    documents for the session's project/date.
+
+    Master data comes from the versioned master-data cache; the day's rows
+    are loaded with one query per table, so the cost does not grow with
+    the number of rows.
+    """
+    project_number = (request.args.get('project_id')
+                      or session.get('project_id') or session.get('project_number'))
+    date_str = (request.args.get('date')
+                or session.get('report_date') or session.get('current_reporting_date'))
+    if not project_number or not date_str:
+        return jsonify(error="No active project or report date"), 400
+
+    project = project_by_number(project_number)
+    if project is None:
+        return jsonify(error="Invalid project number"), 400
+
+    try:
+        date_obj = datetime.fromisoformat(date_str).date()
+    except ValueError:
+        return jsonify(error="Invalid date format, expected YYYY-MM-DD"), 400
+
+    try:
+        master = {}
+        for name, models, build, scope in (
+            ('workers', [Worker], master_payloads.workers_payload, None),
+            ('equipment', [Equipment], master_payloads.equipment_payload, None),
+            ('activity_codes', [ActivityCode], master_payloads.activity_codes_payload, None),
+            ('payment_items', [PaymentItem], master_payloads.payment_items_payload, None),
+            ('materials', [Material], master_payloads.materials_payload, None),
+            ('cwps', [CWPackage], lambda: cwps_payload(project_number), project_number),
+            ('subcontractors', [Subcontractor],
+             lambda: master_payloads.subcontractors_payload(project.id), project.id),
+        ):
+            payload, status = cached_payload(name, models, build, scope=scope)
+            if status == 200:
+                master.update(payload)
+
+        workers = load_entries(WorkerEntry, project.id, date_obj, status='pending')
+        equipment = load_entries(EquipmentEntry, project.id, date_obj, status='pending')
+        materials = load_entries(MaterialEntry, project.id, date_obj, status='pending')
+        subcontractors = load_entries(SubcontractorEntry, project.id, date_obj, status='pending')
+        payment_items = payment_items_by_id(workers, equipment, materials)
+        notes = (DailyNoteEntry.query
+                 .filter_by(project_id=project.id, date_of_report=date_obj)
+                 .order_by(DailyNoteEntry.note_datetime.asc())
+                 .all())
+        documents = load_documents(project.id, date_obj)
+    except Exception as exc:
+        current_app.logger.exception(exc)
+        return jsonify(error="Internal server error"), 500
+
+    return compressed_json({
+        'project': {'id': project.id, 'project_number': project.project_number, 'name': project.name},
+        'report_date': date_obj.isoformat(),
+        'master': {
+            'workers': master.get('workers', []),
+            'equipment': master.get('equipment', []),
+            'activity_codes': master.get('activity_codes', []),
+            'payment_items': master.get('payment_items', []),
+            'materials': master.get('materials', []),
+            'cwps': master.get('cwps', []),
+            'subcontractors': master.get('subcontractors', []),
+        },
+        'pending': {
+            'workers': [serialize_worker_entry(w, payment_items) for w in workers],
+            'equipment': [serialize_equipment_entry(e, payment_items) for e in equipment],
+            'materials': [serialize_material_entry(m, payment_items) for m in materials],
+            'subcontractors': [serialize_subcontractor_entry(s) for s in subcontractors],
+        },
+        'notes': [note.to_dict() for note in notes],
+        'documents': [serialize_document(d) for d in documents],
     })
 
 @data_entry_bp.route('/report', methods=['POST'])
@@ -191,31 +279,75 @@ def reset_session():
 
 @data_entry_bp.route('/save_draft', methods=['POST'])
 def save_draft():
-    """Persist tab entries into the session as a draft."""
+    """
+    Persist tab entries as a draft of the current report date.
+
+    Incremental autosave sends an RFC 6902 JSON Patch against the draft
+    revision it last saw::
+
+        {"tab": "materials", "base_revision": 4, "patch": [{"op": "replace", ...}]}
+
+    A full snapshot (``{"tab": ..., "entries": [...]}``, optionally with
+    ``base_revision``) replaces the entries; without ``base_revision`` it
+    overwrites whatever is stored, so clients only send that when the user
+    chooses to after a conflict.  Every write returns the new ``revision``;
+    a stale ``base_revision`` gets 409 with the current one.
+    """
     try:
         data = request.get_json() or {}
         tab = data.get('tab')
-        entries = data.get('entries', [])
 
         if not tab:
             return jsonify({'error': 'Tab is required'}), 400
 
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-
-        if not current_date:
+        key = report_drafts.current_key()
+        if key is None:
             return jsonify({'error': 'No reporting date selected'}), 400
 
-        daily_data = session.setdefault('daily_data', {})
-        current_data = daily_data.setdefault(current_date, {})
-        session_entries = current_data.setdefault('entries', {})
-        session_entries[tab] = entries
-        session.modified = True
-
-        return jsonify({'message': 'Draft saved', 'entries': len(entries)}), 200
+        base_revision = data.get('base_revision')
+        if base_revision is not None and (not isinstance(base_revision, int) or isinstance(base_revision, bool)):
+            return jsonify({'error': 'base_revision must be an integer'}), 400
+
+        if 'patch' in data:
+            if base_revision is None:
+                return jsonify({'error': 'base_revision is required with a patch'}), 400
+            revision, entries = report_drafts.patch_entries(key, tab, base_revision, data['patch'])
+        else:
+            entries = data.get('entries', [])
+            if not isinstance(entries, list):
+                return jsonify({'error': 'entries must be a list'}), 400
+            revision = report_drafts.save_snapshot(key, tab, entries, base_revision=base_revision)
+        db.session.commit()
+
+        return jsonify({'message': 'Draft saved', 'entries': len(entries), 'revision': revision}), 200
+    except report_drafts.StaleDraftRevision as e:
+        db.session.rollback()
+        return jsonify({'error': 'Draft revision is stale', 'revision': e.current_revision}), 409
+    except JsonPatchError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Invalid patch: {e}'}), 400
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"Error saving draft: {e}", exc_info=True)
         return jsonify({'error': 'Failed to save draft'}), 500
-    
+
+
+@data_entry_bp.route('/draft', methods=['GET'])
+def get_draft():
+    """Return the current draft (entries and revision) of ``?tab=`` for the report date."""
+    tab = request.args.get('tab')
+    if not tab:
+        return jsonify({'error': 'Tab is required'}), 400
+
+    key = report_drafts.current_key()
+    if key is None:
+        return jsonify({'error': 'No reporting date selected'}), 400
+
+    draft = report_drafts.get_tab(key, tab)
+    if draft is None:
+        return jsonify({'tab': tab, 'status': 'incomplete', 'entries': [], 'revision': 0}), 200
+    return jsonify(draft.to_dict()), 200
+
 def collect_form_data(prefix, fields, max_count):
     data_list = []
 
@@ -257,10 +389,8 @@ def collect_work_orders(max_count, upload_folder):
             # Save signed work order file if exists
             if work_order_signed and work_order_signed.filename:
                 try:
-                    filename = secure_filename(work_order_signed.filename)
-                    save_path = os.path.join(upload_folder, filename)
-                    work_order_signed.save(save_path)
-                    work_order_entry['Signed Work Order'] = filename
+                    blob = store_upload(work_order_signed, upload_folder)
+                    work_order_entry['Signed Work Order'] = blob.upload_path
                 except Exception as e:
                     current_app.logger.debug(f"Failed to save signed work order: {e}")
                     flash("Failed to save signed work order.", "danger")
@@ -269,10 +399,8 @@ def collect_work_orders(max_count, upload_folder):
             for picture in work_order_pictures:
                 if picture and picture.filename:
                     try:
-                        pic_filename = secure_filename(picture.filename)
-                        pic_save_path = os.path.join(upload_folder, pic_filename)
-                        picture.save(pic_save_path)
-                        work_order_entry['Pictures'].append(pic_filename)
+                        blob = store_upload(picture, upload_folder)
+                        work_order_entry['Pictures'].append(blob.upload_path)
                     except Exception as e:
                         current_app.logger.debug(f"Failed to save work order picture: {e}")
                         flash("Failed to save work order picture.", "danger")
@@ -312,6 +440,9 @@ def collect_work_orders(max_count, upload_folder):
 
 
 #def save_data_to_excel(workers_data=None, materials_data=None, equipment_data=None, subcontractors_data=None, work_orders_data=None, pictures_of_the_day=None, general_notes=None, project_number=None, timestamp=None):
+    import openpyxl
+    import pandas as pd
+
     file_path = f'C:\\Users\\patri\\OneDrive\\Bureau\\TCC_V2.0\\project_data_{project_number}.xlsx'
 
     try:
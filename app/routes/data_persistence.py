@@ -1,5 +1,7 @@
-from flask import Blueprint, session, jsonify, request, current_app
-from app.utils.data_loader import load_data
+from flask import Blueprint, jsonify, current_app
+from app import db
+from app.utils.data_loader import load_data, save_to_csv as write_report_csv
+from app.utils import report_drafts
 import csv
 from datetime import datetime
 import os
@@ -57,36 +59,22 @@ default_data_path = os.path.abspath(
 # Route to save report
 @data_persistence_bp.route('/save-report', methods=['POST'])
 def save_to_csv():
-    current_date = session.get('report_date') or session.get('current_reporting_date')
+    key = report_drafts.current_key()
+    tab_data = report_drafts.day_entries(key) if key else {}
 
-    if not current_date or current_date not in session['daily_data']:
+    if not tab_data:
         return jsonify({'error': 'No data available to save.'}), 400
 
-    # Fetch data for the current date
-    daily_data = session['daily_data'][current_date]
-
-    # Flatten the session data into a row-based format
-    rows = []
-    for tab, entries in daily_data['data'].items():
-        for entry in entries:
-            row = {
-                'dateStamp': current_date,
-                'tabType': tab,
-                # Add more columns as necessary based on your session data
-                **entry
-            }
-            rows.append(row)
+    current_date = key.report_date.isoformat()
 
     # Determine the CSV file path from configuration with a sensible fallback
     data_file_path = current_app.config.get('DATA_FILE_PATH', default_data_path)
 
-    # Save rows to the CSV using the resolved path
-    save_to_csv(data_file_path, rows, append=True)
+    # Save the draft rows (one per entry, tagged with their tab) to the CSV
+    write_report_csv({current_date: tab_data}, current_date, data_file_path)
 
+    # Clear the drafts of the saved date
+    report_drafts.delete_day(key)
+    db.session.commit()
 
-
-    # Clear session data for the saved date
-    session['daily_data'].pop(current_date)
-    session.modified = True
-
-    return jsonify({'message': 'Report saved successfully!', 'status': 'success'})
\ No newline at end of file
+    return jsonify({'message': 'Report saved successfully!', 'status': 'success'})
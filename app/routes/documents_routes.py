@@ -1,19 +1,87 @@
 from flask import (Blueprint, request, jsonify, session, current_app,url_for, send_from_directory)
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
 from datetime import datetime
+import mimetypes
 import os
 from .. import db
 from ..models.models import Document
-from ..models.core_models import Project
+from ..models.daily_models import DailyPicture
+from ..utils.project_resolver import resolve_project
+from ..utils.entry_serializers import load_documents, serialize_document
+from ..utils.blob_storage import BLOB_DIR, store_upload, discard_new_blobs
 
 
 documents_bp = Blueprint('documents_bp', __name__, url_prefix='/documents')
 
 
+# Blobs never change once written, so clients may cache them for a year
+BLOB_MAX_AGE = 365 * 24 * 3600
+
+
+def _offloaded_response(path, filename, download_name, etag, max_age):
+    """Let the fronting web server send ``path`` (``DOWNLOAD_OFFLOAD`` mode).
+
+    The server handles Range requests; we still answer conditional ones.
+    """
+    mode = current_app.config.get("DOWNLOAD_OFFLOAD")
+    response = current_app.response_class()
+    if mode == "x-accel-redirect":
+        prefix = current_app.config.get("DOWNLOAD_ACCEL_PREFIX", "/protected-uploads/")
+        response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + filename
+    else:
+        response.headers["X-Sendfile"] = os.path.abspath(path)
+    response.content_type = (mimetypes.guess_type(download_name or filename)[0]
+                             or "application/octet-stream")
+    if download_name:
+        response.headers.set("Content-Disposition", "inline", filename=download_name)
+    response.set_etag(etag or f"{os.path.getmtime(path)}-{os.path.getsize(path)}")
+    response.last_modified = int(os.path.getmtime(path))
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
 @documents_bp.route("/files/<path:filename>")
 def download_document(filename):
-    """Serve a file from the configured upload directory."""
-    return send_from_directory(current_app.config["UPLOAD_FOLDER"], filename)
+    """
+    Serve a file from the configured upload directory.
+
+    Supports ``Range`` (206) and ``If-None-Match``/``If-Modified-Since`` (304).
+    Content-addressed blobs use their SHA-256 as ETag and are sent with
+    private, immutable cache headers.  With ``DOWNLOAD_OFFLOAD`` set to ``x-sendfile``
+    or ``x-accel-redirect`` the bytes are streamed by the web server.
+    """
+    upload_folder = os.path.join(current_app.root_path, current_app.config["UPLOAD_FOLDER"])
+    path = safe_join(upload_folder, filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    download_name = etag = max_age = None
+    immutable = False
+    if filename.startswith(BLOB_DIR + "/"):
+        # Blobs are stored without extension: type and name come from the row
+        sha256 = os.path.basename(filename)
+        record = (Document.query.filter_by(sha256=sha256).first()
+                  or DailyPicture.query.filter_by(sha256=sha256).first())
+        if record is not None:
+            download_name = record.file_name
+        etag, max_age, immutable = sha256, BLOB_MAX_AGE, True
+
+    if current_app.config.get("DOWNLOAD_OFFLOAD"):
+        response = _offloaded_response(path, filename, download_name, etag, max_age or 0)
+    else:
+        response = send_from_directory(upload_folder, filename, download_name=download_name,
+                                       etag=etag or True, max_age=max_age,
+                                       conditional=True)
+    # Downloads are behind login: shared caches must not keep them.
+    # send_file marks anything with a max_age public, so undo that here.
+    response.cache_control.public = None
+    response.cache_control.private = True
+    if immutable:
+        response.cache_control.immutable = True
+    return response
 
 @documents_bp.route("/list", methods=["GET"])
 def list_documents():
@@ -25,14 +93,7 @@ def list_documents():
         return jsonify(documents=[]), 200
 
     # Resolve numeric project.id
-    project = None
-    if isinstance(proj_val, str) and not proj_val.isdigit():
-        project = Project.query.filter_by(project_number=proj_val).first()
-    else:
-        try:
-            project = Project.query.get(int(proj_val))
-        except (TypeError, ValueError):
-            pass
+    project = resolve_project(proj_val)
     if not project:
         return jsonify(documents=[]), 200
 
@@ -41,31 +102,8 @@ def list_documents():
     except ValueError:
         date_obj = None
 
-    query = Document.query.filter_by(project_id=project.id)
-    if date_obj:
-        start = datetime.combine(date_obj, datetime.min.time())
-        end = datetime.combine(date_obj, datetime.max.time())
-        query = query.filter(Document.uploaded_at >= start, Document.uploaded_at <= end)
-    query = query.filter(Document.status.in_(["pending", "committed"]))
-
-
-    docs = query.all()
-
-    results = [
-        {
-            "id": d.id,
-            "file_name": d.file_name,
-            "file_url": url_for("documents_bp.download_document", filename=os.path.basename(d.file_url)),
-            "document_type": d.document_type,
-            "status": d.status,
-            "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None,
-            "doc_notes": d.doc_notes,
-            "activity_code_id": d.activity_code_id,
-            "payment_item_id": d.payment_item_id,
-            "cwp_code": d.cwp_code,
-        }
-        for d in docs
-    ]
+    docs = load_documents(project.id, date_obj)
+    results = [serialize_document(d) for d in docs]
     return jsonify(documents=results), 200
 
 
@@ -88,14 +126,7 @@ def upload_documents():
 
 
     # resolve project
-    project = None
-    if isinstance(proj_val, str) and not proj_val.isdigit():
-        project = Project.query.filter_by(project_number=proj_val).first()
-    else:
-        try:
-            project = Project.query.get(int(proj_val))
-        except (TypeError, ValueError):
-            pass
+    project = resolve_project(proj_val)
     if not project:
         return jsonify(error="Invalid project"), 400
 
@@ -104,26 +135,22 @@ def upload_documents():
     except Exception:
         upload_dt = datetime.utcnow()
 
-    upload_folder = current_app.config.get("UPLOAD_FOLDER", "uploads")
-
-    os.makedirs(upload_folder, exist_ok=True)
-
     created = []
-    saved_paths = []
+    stored = []
     try:
         for f in files:
             if not f or not f.filename:
                 continue
             filename = secure_filename(f.filename)
-            save_path = os.path.join(upload_folder, filename)
-            f.save(save_path)
-            saved_paths.append(save_path)
-            rel_path = os.path.relpath(save_path, start=current_app.root_path)
+            blob = store_upload(f)
+            stored.append(blob)
 
             doc = Document(
                 project_id=project.id,
                 file_name=filename,
-                file_url=rel_path,
+                file_url=blob.file_url,
+                sha256=blob.sha256,
+                file_size=blob.size,
                 uploaded_at=upload_dt,
                 document_type=doc_type,
                 status="pending",
@@ -138,11 +165,7 @@ def upload_documents():
         db.session.commit()
     except Exception as exc:
         db.session.rollback()
-        for path in saved_paths:
-            try:
-                os.remove(path)
-            except OSError:
-                pass
+        discard_new_blobs(stored)
         current_app.logger.exception(exc)
         return jsonify(error='Upload failed'), 500
     return jsonify(records=[d.id for d in created]), 201
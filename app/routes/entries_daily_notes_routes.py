@@ -3,7 +3,9 @@
 from flask import Blueprint, jsonify, session, current_app, request
 from sqlalchemy.exc import SQLAlchemyError
 from ..models.daily_models import DailyNoteEntry
-from ..models.core_models import Project
+from ..models.core_models import ActivityCode, PaymentItem
+from ..utils.project_resolver import resolve_project
+from ..utils.bulk_entries import bulk_insert, existing_ids, first_missing
 from .. import db
 from datetime import datetime, date
 
@@ -20,10 +22,11 @@ def get_daily_notes():
         # 1) Base query
         q = DailyNoteEntry.query
 
-        # 2) Filter by project if in session
+        # 2) Filter by project if in session (number or numeric id)
         proj_id = session.get('project_id')
         if proj_id:
-            q = q.filter_by(project_id=proj_id)
+            project = resolve_project(proj_id)
+            q = q.filter_by(project_id=project.id if project else None)
 
         # 3) Filter by report_date if in session
         report_date = session.get('report_date')
@@ -82,22 +85,10 @@ def add_daily_note():
         return jsonify(error="No active project selected"), 400
 
     # 1a) Turn it into the true numeric projects.id
-    if isinstance(proj_val, str):
-        # digits? cast directly
-        if proj_val.isdigit():
-            project_id = int(proj_val)
-        else:
-            # otherwise treat it as a project_number → look it up
-            proj_obj = Project.query.filter_by(project_number=proj_val).first()
-            if not proj_obj:
-                return jsonify(error=f"Project '{proj_val}' not found"), 400
-            project_id = proj_obj.id
-    else:
-        # not a string? hope it’s already an int or convertible
-        try:
-            project_id = int(proj_val)
-        except (TypeError, ValueError):
-            return jsonify(error="Invalid project_id"), 400
+    proj_obj = resolve_project(proj_val)
+    if not proj_obj:
+        return jsonify(error=f"Project '{proj_val}' not found"), 400
+    project_id = proj_obj.id
 
     # 2) Compute date_of_report (session date → payload → today)
     session_date = session.get('report_date')  # "YYYY-MM-DD"
@@ -257,51 +248,61 @@ def confirm_daily_notes():
     if not notes or not isinstance(notes, list):
         return jsonify(error="Missing notes list"), 400
 
-    created = []
-    try:
-        for n in notes:
-            if not n.get('project_id') or not n.get('content'):
-                return jsonify(error="project_id and content are required"), 400
+    # Pass 1: validate every staged note before touching the database
+    rows = []
+    for n in notes:
+        if not n.get('project_id') or not n.get('content'):
+            return jsonify(error="project_id and content are required"), 400
 
-            note_dt = n.get('note_datetime')
+        note_dt = n.get('note_datetime')
+        try:
             note_datetime = datetime.fromisoformat(note_dt) if note_dt else None
-            date_of_report = note_datetime.date() if note_datetime else datetime.utcnow().date()
-
-            try:
-                act_id = int(n['activity_code_id']) if n.get('activity_code_id') else None
-            except (TypeError, ValueError):
-                return jsonify(error="Invalid activity_code_id"), 400
+        except ValueError:
+            return jsonify(error="Invalid note_datetime"), 400
+        date_of_report = note_datetime.date() if note_datetime else datetime.utcnow().date()
 
-            try:
-                pay_id = int(n['payment_item_id']) if n.get('payment_item_id') else None
-            except (TypeError, ValueError):
-                return jsonify(error="Invalid payment_item_id"), 400
+        try:
+            act_id = int(n['activity_code_id']) if n.get('activity_code_id') else None
+        except (TypeError, ValueError):
+            return jsonify(error="Invalid activity_code_id"), 400
 
-            try:
-                wo_id = int(n['work_order_id']) if n.get('work_order_id') else None
-            except (TypeError, ValueError):
-                return jsonify(error="Invalid work_order_id"), 400
-            
-            new_note = DailyNoteEntry(
-                project_id=n.get('project_id'),
-                note_datetime=note_datetime,
-                date_of_report=date_of_report,
-                author=n.get('author'),
-                category=n.get('category'),
-                tags=n.get('tags'),
-                content=n.get('content'),
-                priority=n.get('priority'),
-                activity_code_id=act_id,
-                payment_item_id=pay_id,
-                work_order_id=wo_id,
-                cwp=n.get('cwp'),
-                editable_by=n.get('editable_by'),
-            )
-            db.session.add(new_note)
-            created.append(new_note)
+        try:
+            pay_id = int(n['payment_item_id']) if n.get('payment_item_id') else None
+        except (TypeError, ValueError):
+            return jsonify(error="Invalid payment_item_id"), 400
 
+        try:
+            wo_id = int(n['work_order_id']) if n.get('work_order_id') else None
+        except (TypeError, ValueError):
+            return jsonify(error="Invalid work_order_id"), 400
+
+        rows.append({
+            'project_id': n.get('project_id'),
+            'note_datetime': note_datetime,
+            'date_of_report': date_of_report,
+            'author': n.get('author'),
+            'category': n.get('category'),
+            'tags': n.get('tags'),
+            'content': n.get('content'),
+            'priority': n.get('priority'),
+            'activity_code_id': act_id,
+            'payment_item_id': pay_id,
+            'work_order_id': wo_id,
+            'cwp': n.get('cwp'),
+            'editable_by': n.get('editable_by'),
+        })
+
+    # Pass 2: resolve referenced activity codes / payment items in one query each
+    for model, key in ((ActivityCode, 'activity_code_id'), (PaymentItem, 'payment_item_id')):
+        ids = [r[key] for r in rows]
+        if first_missing(ids, existing_ids(model, ids)) is not None:
+            return jsonify(error=f"Invalid {key}"), 400
+
+    # Pass 3: single INSERT ... RETURNING for the batch
+    try:
+        records = bulk_insert(DailyNoteEntry, rows)
         db.session.commit()
-        return jsonify(records=[c.id for c in created]), 200
+        return jsonify(records=records), 200
 
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -1,9 +1,12 @@
 # app/routes/equipment_routes.py
 
-from flask import Blueprint, session, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app import db
 from app.models.equipment_models import Equipment  # Ensure this import is correct
+from app.utils.master_cache import cached_json
+from app.utils.master_payloads import equipment_payload
+from app.utils import report_drafts
 
 # Define the Blueprint for equipment-related routes
 equipment_bp = Blueprint('equipment_bp', __name__, url_prefix='/equipment')
@@ -12,29 +15,7 @@ equipment_bp = Blueprint('equipment_bp', __name__, url_prefix='/equipment')
 def get_equipment_list():
     """Fetch the list of available equipment from the database with better error handling."""
     try:
-        equipment = Equipment.query.all()
-        current_app.logger.info(f"Fetched {len(equipment)} equipment items from database.")
-
-        # ✅ Check if the database has no equipment records
-        if not equipment:
-            return jsonify({'message': "No equipment found in the database.", 'equipment': []}), 200
-
-        # ✅ Filter out invalid rows (skip NULL names or statuses)
-        equipment_list = [
-            {
-                'id': equip.id,
-                'name': equip.name if equip.name else "Unnamed Equipment",
-                'serial_number': equip.serial_number if equip.serial_number else "Unknown Serial",
-                'maintenance_status': equip.maintenance_status if equip.maintenance_status in ['operational', 'under_maintenance', 'out_of_service'] else "operational"
-            }
-            for equip in equipment if equip.name and equip.maintenance_status
-        ]
-
-        # ✅ If all records were invalid, return an empty response with a warning message
-        if not equipment_list:
-            return jsonify({'message': "All equipment records are invalid or missing required fields.", 'equipment': []}), 200
-
-        return jsonify({'equipment': equipment_list}), 200
+        return cached_json('equipment', [Equipment], equipment_payload)
 
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error fetching equipment: {str(e)}", exc_info=True)
@@ -45,17 +26,14 @@ def get_equipment_list():
 
 @equipment_bp.route('/add-entry', methods=['POST'])
 def add_equipment_entry():
-    """Adds an equipment entry to the session for the current reporting date."""
+    """Adds an equipment entry to the equipment draft of the current reporting date."""
     try:
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        if not current_date:
+        key = report_drafts.current_key()
+        if key is None:
             return jsonify({'error': 'No reporting date selected'}), 400
 
-        # Initialize session storage
-        daily_data = session.setdefault('daily_data', {})
-        current_data = daily_data.setdefault(current_date, {})
-        entries = current_data.setdefault('entries', {})
-        equipment_entries = entries.setdefault('equipment', [])
+        # Current draft of the equipment tab
+        equipment_entries = report_drafts.tab_entries(key, 'equipment')
 
         # Parse request data
         data = request.json
@@ -66,12 +44,12 @@ def add_equipment_entry():
         if not equipment_name or not labor_hours or not activity_code:
             return jsonify({"error": "All fields are required"}), 400
 
-        # Ensure equipment is unique in session
+        # Ensure equipment is unique in the draft
         for existing_equipment in equipment_entries:
             if existing_equipment["equipmentName"] == equipment_name and existing_equipment["activityCode"] == activity_code:
                 return jsonify({"error": f"Equipment '{equipment_name}' is already added to the session with the same activity."}), 400
 
-        # Add to session storage
+        # Add to the draft
         equipment_entry = {
             "equipmentName": equipment_name,
             "laborHours": labor_hours,
@@ -79,7 +57,8 @@ def add_equipment_entry():
         }
 
         equipment_entries.append(equipment_entry)
-        session.modified = True
+        report_drafts.upsert(key, 'equipment', entries=equipment_entries)
+        db.session.commit()
 
         return jsonify({"message": "Equipment added successfully", "equipment_entries": equipment_entries}), 200
 
@@ -0,0 +1,58 @@
+# app/routes/exports_routes.py
+
+from datetime import date
+
+from flask import Blueprint, Response, jsonify, request, session, stream_with_context
+
+from ..utils.entry_exports import ENTRY_SOURCES, EXPORT_FORMATS
+from ..utils.project_resolver import resolve_project
+
+exports_bp = Blueprint('exports_bp', __name__, url_prefix='/exports')
+
+
+@exports_bp.route('/entries', methods=['GET'])
+def export_entries():
+    """
+    Stream the committed entries of a project for a date range.
+
+    Query parameters:
+      project_id  project number or id (defaults to the session project)
+      start, end  ISO dates, both inclusive
+      format      csv (default), ndjson or xlsx
+      types       comma-separated subset of workers, equipment, materials,
+                  subcontractors, notes (default: all)
+    """
+    project = resolve_project(request.args.get('project_id') or session.get('project_id'))
+    if project is None:
+        return jsonify(error="Unknown or missing project"), 404
+
+    try:
+        start = date.fromisoformat(request.args['start'])
+        end = date.fromisoformat(request.args['end'])
+    except KeyError:
+        return jsonify(error="start and end dates are required"), 400
+    except ValueError:
+        return jsonify(error="Dates must be in YYYY-MM-DD format"), 400
+    if start > end:
+        return jsonify(error="start must not be after end"), 400
+
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify(error=f"Unsupported format '{fmt}'"), 400
+
+    types = request.args.get('types')
+    entry_types = [t.strip() for t in types.split(',') if t.strip()] if types else list(ENTRY_SOURCES)
+    unknown = [t for t in entry_types if t not in ENTRY_SOURCES]
+    if unknown or not entry_types:
+        return jsonify(error=f"Unknown entry types: {', '.join(unknown) or '(none)'}"), 400
+
+    chunks, mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f"entries_{project.project_number}_{start.isoformat()}_{end.isoformat()}.{extension}"
+    response = Response(
+        stream_with_context(chunks(entry_types, project.id, start, end)),
+        mimetype=mimetype,
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Let reverse proxies pass chunks through instead of buffering the whole export
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -4,7 +4,17 @@ from flask import Blueprint, request, jsonify, current_app
 from app import db
 from app.models.WorkerEntry_models import WorkerEntry
 from app.models.EquipmentEntry_models import EquipmentEntry
-from app.models.core_models import ActivityCode, Project, PaymentItem, CWPackage
+from app.models.core_models import ActivityCode, PaymentItem, CWPackage
+from app.models.workforce_models import Worker
+from app.models.equipment_models import Equipment
+from app.utils.bulk_entries import bulk_insert, existing_ids, first_missing
+from app.utils.project_resolver import project_by_number
+from app.utils.entry_serializers import (
+    load_entries,
+    payment_items_by_id,
+    serialize_worker_entry,
+    serialize_equipment_entry,
+)
 from datetime import datetime
 
 labor_equipment_bp = Blueprint('labor_equipment_bp', __name__,url_prefix='/labor-equipment')
@@ -31,7 +41,7 @@ def confirm_labor_equipment():
     if not usage or not project_number or not date_str:
         return jsonify(error="Missing project, date, or usage"), 400
 
-    proj = Project.query.filter_by(project_number=project_number).first()
+    proj = project_by_number(project_number)
     if not proj:
         return jsonify(error="Invalid project number"), 400
 
@@ -40,7 +50,8 @@ def confirm_labor_equipment():
     except ValueError:
         return jsonify(error="Invalid date format"), 400
 
-    created_entries = []
+    # Pass 1: validate every line and collect the referenced ids
+    parsed = []
     for line in usage:
         w_id        = line.get('employee_id')
         e_id        = line.get('equipment_id')
@@ -59,47 +70,81 @@ def confirm_labor_equipment():
         if hours is None or act_id is None:
             return jsonify(error="Missing hours or activity_code_id"), 400
 
-        activity = ActivityCode.query.get(int(act_id))
-        if not activity:
-            return jsonify(error=f"Invalid activity_code_id: {act_id}"), 400
-
-        pi_id    = line.get('payment_item_id')
-        cwp_code = line.get('cwp_id')
+        try:
+            act_id = int(act_id)
+            hours  = float(hours)
+            w_id   = int(w_id) if w_id is not None else None
+            e_id   = int(e_id) if e_id is not None else None
+            pi_id  = line.get('payment_item_id')
+            pi_id  = int(pi_id) if pi_id not in (None, "") else None
+        except (TypeError, ValueError):
+            return jsonify(error="Invalid numeric value in usage line"), 400
 
         # decide entry type
-        if w_id is not None or (is_manual and manual_type=='worker'):
-            # Worker entry (manual or by ID)
-            entry = WorkerEntry(
-                project_id      = proj.id,
-                worker_id       = int(w_id) if w_id is not None else None,
-                worker_name     = manual_nm if is_manual and manual_type=='worker' else None,
-                date_of_report  = date_obj,
-                hours_worked    = float(hours),
-                activity_id     = activity.id,
-                payment_item_id = pi_id,
-                cwp             = cwp_code,
-                status          = 'pending'
-            )
-
+        is_worker = w_id is not None or (is_manual and manual_type == 'worker')
+        entry_type = 'worker' if is_worker else 'equipment'
+        parsed.append({
+            'is_worker': is_worker,
+            'worker_id': w_id if is_worker else None,
+            'equipment_id': None if is_worker else e_id,
+            'manual_name': manual_nm if manual_type == entry_type else None,
+            'hours': hours,
+            'activity_id': act_id,
+            'payment_item_id': pi_id,
+            'cwp': line.get('cwp_id'),
+        })
+
+    # Pass 2: resolve every foreign key with one IN query per table
+    checks = [
+        (ActivityCode, 'activity_id',     "Invalid activity_code_id"),
+        (PaymentItem,  'payment_item_id', "Invalid payment_item_id"),
+        (Worker,       'worker_id',       "Invalid employee_id"),
+        (Equipment,    'equipment_id',    "Invalid equipment_id"),
+    ]
+    for model, key, message in checks:
+        ids = [p[key] for p in parsed]
+        missing = first_missing(ids, existing_ids(model, ids))
+        if missing is not None:
+            return jsonify(error=f"{message}: {missing}"), 400
+
+    # Pass 3: one multi-row INSERT ... RETURNING per table
+    worker_rows, equipment_rows = [], []
+    for p in parsed:
+        common = {
+            'project_id':      proj.id,
+            'date_of_report':  date_obj,
+            'activity_id':     p['activity_id'],
+            'payment_item_id': p['payment_item_id'],
+            'cwp':             p['cwp'],
+            'status':          'pending',
+        }
+        if p['is_worker']:
+            worker_rows.append({
+                **common,
+                'worker_id':    p['worker_id'],
+                'worker_name':  p['manual_name'],
+                'hours_worked': p['hours'],
+            })
         else:
-            # Equipment entry (manual or by ID)
-            entry = EquipmentEntry(
-                project_id       = proj.id,
-                equipment_id     = int(e_id) if e_id is not None else None,
-                equipment_name   = manual_nm if is_manual and manual_type=='equipment' else None,
-                date_of_report   = date_obj,
-                hours_used       = float(hours),
-                activity_id      = activity.id,
-                payment_item_id  = pi_id,
-                cwp              = cwp_code,
-                status           = 'pending'
-            )
-
-        db.session.add(entry)
-        created_entries.append(entry)
-
-    db.session.commit()
-    return jsonify(records=[e.id for e in created_entries]), 200
+            equipment_rows.append({
+                **common,
+                'equipment_id':   p['equipment_id'],
+                'equipment_name': p['manual_name'],
+                'hours_used':     p['hours'],
+            })
+
+    try:
+        worker_ids    = iter(bulk_insert(WorkerEntry, worker_rows))
+        equipment_ids = iter(bulk_insert(EquipmentEntry, equipment_rows))
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.exception(exc)
+        return jsonify(error="Failed to save entries"), 500
+
+    # report ids in the original line order
+    records = [next(worker_ids) if p['is_worker'] else next(equipment_ids) for p in parsed]
+    return jsonify(records=records), 200
 
 # ------------------------------------------------
 # 2) Fetch all the “pending” lines for the UI table
@@ -111,7 +156,7 @@ def get_pending_labor_equipment():
     if not project_number or not date_str:
         return jsonify(error="Missing project_id or date"), 400
 
-    proj = Project.query.filter_by(project_number=project_number).first()
+    proj = project_by_number(project_number)
     if not proj:
         return jsonify(error="Invalid project number"), 400
 
@@ -121,60 +166,16 @@ def get_pending_labor_equipment():
         return jsonify(error="Invalid date format"), 400
 
     try:
-        w_entries = WorkerEntry.query.filter_by(
-            project_id=proj.id,
-            date_of_report=date_obj,
-            status="pending"
-        ).all()
+        w_entries = load_entries(WorkerEntry, proj.id, date_obj, status="pending")
+        e_entries = load_entries(EquipmentEntry, proj.id, date_obj, status="pending")
+        payment_items = payment_items_by_id(w_entries, e_entries)
     except Exception as exc:
         current_app.logger.exception(exc)
         return jsonify(error="Internal server error"), 500
 
-    try:
-        e_entries = EquipmentEntry.query.filter_by(
-            project_id=proj.id,
-            date_of_report=date_obj,
-            status="pending"
-        ).all()
-
-    except Exception as exc:
-        current_app.logger.exception(exc)
-        return jsonify(error="Internal server error"), 500
-    
-
-    def serialize(entry, is_worker=True):
-        pi = (PaymentItem.query.get(entry.payment_item_id)
-              if entry.payment_item_id else None)
-
-        base = {
-            "hours": entry.hours_worked if is_worker else entry.hours_used,
-            "activity_id": entry.activity_id,
-            "activity_code": entry.activity.code if entry.activity else None,
-            "activity_description": entry.activity.description if entry.activity else None,
-            "payment_item_id": entry.payment_item_id,
-            "payment_item_code": pi.payment_code if pi else None,
-            "payment_item_name": pi.item_name if pi else None,
-            "cwp": entry.cwp
-        }
-
-        if is_worker:
-            return {
-                "id": entry.id,
-                "worker_id": entry.worker_id,
-                "worker_name": entry.worker.name if entry.worker else entry.worker_name,
-                **base
-            }
-        else:
-            return {
-                "id": entry.id,
-                "equipment_id": entry.equipment_id,
-                "equipment_name": entry.equipment.name if entry.equipment else entry.equipment_name,
-                **base
-            }
-
     return jsonify(
-        workers   = [serialize(w, True)  for w in w_entries],
-        equipment = [serialize(e, False) for e in e_entries]
+        workers   = [serialize_worker_entry(w, payment_items)    for w in w_entries],
+        equipment = [serialize_equipment_entry(e, payment_items) for e in e_entries]
     ), 200
 
 
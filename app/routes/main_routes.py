@@ -1,10 +1,8 @@
 # app/routes/main_routes.py
 from flask                  import Blueprint, render_template, current_app, redirect, url_for
-from app.utils.data_loader  import load_data
-import requests
 from flask                  import jsonify, session
 from ..utils.data_loader    import save_to_csv
-import pandas as pd
+from ..utils                import report_drafts
 from flask                  import send_from_directory
 from flask                  import current_app
 
@@ -18,6 +16,8 @@ def weather():
     if not api_key:
         return jsonify(error='No API key configured'), 500
 
+    import requests  # only this endpoint needs it
+
     city = 'Montreal'
     url  = 'https://api.openweathermap.org/data/2.5/weather'
     resp = requests.get(url, params={'q': city, 'units': 'metric', 'appid': api_key})
@@ -68,16 +68,18 @@ def favicon():
 @main_bp.route('/save-report', methods=['POST'])
 def save_report():
     """
-    Save session data for the selected reporting date to the CSV file.
+    Save the drafts of the selected reporting date to the CSV file.
     """
-    # Get the current date from session
-    date = session.get('report_date') or session.get('current_reporting_date')
-    if not date or date not in session.get('daily_data', {}):
+    # Get the current date's drafts
+    key = report_drafts.current_key()
+    tab_data = report_drafts.day_entries(key) if key else {}
+    if not tab_data:
         return jsonify({'error': 'No data to save for the selected date'}), 400
 
-    # Save session data to CSV
+    # Save draft data to CSV
+    date = key.report_date.isoformat()
     try:
-        save_to_csv(session['daily_data'], date)
+        save_to_csv({date: tab_data}, date)
         return jsonify({'message': f'Data for {date} saved successfully!'}), 200
     except Exception as e:
         current_app.logger.debug(f"Error saving data: {e}")
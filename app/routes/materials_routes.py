@@ -4,7 +4,16 @@ from flask import Blueprint, request, jsonify, current_app
 from app import db
 from app.models.material_models import Material
 from app.models.MaterialEntry import MaterialEntry
-from app.models.core_models import ActivityCode, Project, PaymentItem
+from app.models.core_models import ActivityCode
+from app.utils.bulk_entries import bulk_insert, existing_ids, first_missing
+from app.utils.project_resolver import project_by_number
+from app.utils.master_cache import cached_json
+from app.utils.master_payloads import materials_payload
+from app.utils.entry_serializers import (
+    load_entries,
+    payment_items_by_id,
+    serialize_material_entry,
+)
 from datetime import datetime
 
 materials_bp = Blueprint('materials_bp', __name__, url_prefix='/materials')
@@ -14,12 +23,7 @@ materials_bp = Blueprint('materials_bp', __name__, url_prefix='/materials')
 # --------------------------------------
 @materials_bp.route('/list', methods=['GET'])
 def get_materials_catalog():
-    materials = Material.query.all()
-    material_list = [
-        {"id": m.id, "name": m.name, "cost_per_unit": m.cost_per_unit, "unit": m.unit}
-        for m in materials
-    ]
-    return jsonify(materials=material_list), 200
+    return cached_json('materials', [Material], materials_payload)
 
 @materials_bp.route('/create', methods=['POST'])
 def create_material():
@@ -76,7 +80,7 @@ def confirm_materials():
     if not usage_lines or not project_number or not date_str:
         return jsonify(error="Missing project_id, date_of_report, or usage"), 400
 
-    project = Project.query.filter_by(project_number=project_number).first()
+    project = project_by_number(project_number)
     if not project:
         return jsonify(error="Invalid project number"), 400
 
@@ -85,8 +89,8 @@ def confirm_materials():
     except ValueError:
         return jsonify(error="Invalid date format, expected YYYY-MM-DD"), 400
 
-    created = []
-    upserted = []
+    # Pass 1: validate every line before touching the database
+    rows = []
     for line in usage_lines:
         entity_id   = line.get('entityId')
         manual_name = line.get('manual_name')
@@ -104,31 +108,48 @@ def confirm_materials():
         except (TypeError, ValueError):
             return jsonify(error=f"Invalid quantity: {quantity}"), 400
 
-        # lookup activity by PK
         try:
             act_id_int = int(act_id)
         except (TypeError, ValueError):
             return jsonify(error=f"Invalid activity_code_id: {act_id}"), 400
-        activity = ActivityCode.query.get(act_id_int)
-        if not activity:
-            return jsonify(error=f"Activity not found for id: {act_id}"), 400
-
-        # build the entry, only int() the ID if present
-        entry = MaterialEntry(
-            project_id         = project.id,
-            material_id        = int(entity_id) if entity_id else None,
-            material_name      = manual_name if not entity_id else None,
-            quantity_used      = qty_val,
-            activity_code_id   = activity.id,
-            date_of_report     = date_obj,
-            status             = 'pending',
-            created_at         = datetime.utcnow()
-        )
-        db.session.add(entry)
-        created.append(entry)
 
-    db.session.commit()
-    return jsonify(records=[e.id for e in created]), 200
+        try:
+            material_id = int(entity_id) if entity_id else None
+        except (TypeError, ValueError):
+            return jsonify(error=f"Invalid entityId: {entity_id}"), 400
+
+        # only int() the ID if present
+        rows.append({
+            'project_id':       project.id,
+            'material_id':      material_id,
+            'material_name':    manual_name if not entity_id else None,
+            'quantity_used':    qty_val,
+            'activity_code_id': act_id_int,
+            'date_of_report':   date_obj,
+            'status':           'pending',
+        })
+
+    # Pass 2: resolve activities and catalog materials with one IN query each
+    act_ids = [r['activity_code_id'] for r in rows]
+    missing = first_missing(act_ids, existing_ids(ActivityCode, act_ids))
+    if missing is not None:
+        return jsonify(error=f"Activity not found for id: {missing}"), 400
+
+    mat_ids = [r['material_id'] for r in rows]
+    missing = first_missing(mat_ids, existing_ids(Material, mat_ids))
+    if missing is not None:
+        return jsonify(error=f"Material not found for id: {missing}"), 400
+
+    # Pass 3: single INSERT ... RETURNING for the whole batch
+    try:
+        records = bulk_insert(MaterialEntry, rows)
+        db.session.commit()
+    except Exception as e:
+        current_app.logger.error(f"Error confirming materials: {e}", exc_info=True)
+        db.session.rollback()
+        return jsonify(error="Failed to save entries"), 500
+
+    return jsonify(records=records), 200
 
 @materials_bp.route('/by-project-date', methods=['GET'])
 def get_pending_materials():
@@ -139,7 +160,7 @@ def get_pending_materials():
     if not project_number or not date_str:
         return jsonify(error="Missing project_id or date"), 400
 
-    project = Project.query.filter_by(project_number=project_number).first()
+    project = project_by_number(project_number)
     if not project:
         return jsonify(error="Invalid project number"), 400
 
@@ -148,34 +169,13 @@ def get_pending_materials():
     except ValueError:
         return jsonify(error="Invalid date format, expected YYYY-MM-DD"), 400
 
-    # 2) Fetch only “pending” materials for that project & date
-    entries = MaterialEntry.query.filter_by(
-        project_id      = project.id,
-        date_of_report  = date_obj,
-        status          = 'pending'
-    ).all()
+    # 2) Fetch only “pending” materials for that project & date,
+    #    with activity/material eager-loaded and payment items in one query
+    entries = load_entries(MaterialEntry, project.id, date_obj, status='pending')
+    payment_items = payment_items_by_id(entries)
 
     # 3) Build the JSON result
-    materials = []
-    for e in entries:
-        # Look up payment item if set
-        pi = None
-        if e.payment_item_id is not None:
-            pi = PaymentItem.query.get(e.payment_item_id)
-
-        materials.append({
-            "id":                    e.id,
-            "material_id":           e.material_id,
-            "material_name":         e.material.name if e.material else e.material_name,
-            "quantity":              e.quantity_used,
-            "activity_id":           e.activity_code_id,
-            "activity_code":         e.activity_code.code if e.activity_code else None,
-            "activity_description":  e.activity_code.description if e.activity_code else None,
-            "payment_item_id":       e.payment_item_id,
-            "payment_item_code":     pi.payment_code if pi else None,
-            "payment_item_name":     pi.item_name    if pi else None,
-            "cwp":                   e.cwp
-        })
+    materials = [serialize_material_entry(e, payment_items) for e in entries]
 
     return jsonify(materials=materials), 200 
 
@@ -1,20 +1,16 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, send_file, session
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import os
 from .. import db
 from ..models import Document, DailyPicture
-import pandas as pd
+from ..models.DailyNoteAttachment import DailyNoteAttachment
+from ..utils.blob_storage import store_upload, discard_new_blobs
+from ..utils import media_listing, thumbnails
+from ..utils.project_resolver import resolve_project
 
 media_bp = Blueprint('media_bp', __name__, url_prefix='/media')
 
-def load_data(filepath, columns=None):
-    """Load data from a CSV file using pandas."""
-    df = pd.read_csv(filepath)
-    if columns:
-        df = df[columns]
-    return df
-
 IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff'}
 
 def _is_image(filename: str) -> bool:
@@ -32,79 +28,113 @@ def upload_media():
     if not project_id or not files:
         return jsonify({'error': 'project_id and files are required'}), 400
 
-    upload_folder = current_app.config.get('UPLOAD_FOLDER')
-    os.makedirs(upload_folder, exist_ok=True)
-
     created = []
-    for file in files:
-        if not file or not file.filename:
-            continue
-        filename = secure_filename(file.filename)
-        save_path = os.path.join(upload_folder, filename)
-        file.save(save_path)
-        rel_path = os.path.relpath(save_path, start=current_app.root_path)
-
-        if _is_image(filename):
-            record = DailyPicture(
-                project_id=project_id,
-                file_name=filename,
-                file_url=rel_path,
-                uploaded_at=datetime.utcnow(),
-                activity_code=activity_code,
-                description=category,
-                status='pending'
-            )
-            db.session.add(record)
-            created.append({'type': 'picture', 'file': filename})
-        else:
-            record = Document(
-                project_id=project_id,
-                file_name=filename,
-                file_url=rel_path,
-                uploaded_at=datetime.utcnow(),
-                document_type=category or 'general',
-                category=category,
-                status='pending'
-            )
-            db.session.add(record)
-            created.append({'type': 'document', 'file': filename})
-    db.session.commit()
+    stored = []
+    try:
+        for file in files:
+            if not file or not file.filename:
+                continue
+            filename = secure_filename(file.filename)
+            blob = store_upload(file)
+            stored.append(blob)
+
+            if _is_image(filename):
+                record = DailyPicture(
+                    project_id=project_id,
+                    file_name=filename,
+                    file_url=blob.file_url,
+                    sha256=blob.sha256,
+                    file_size=blob.size,
+                    uploaded_at=datetime.utcnow(),
+                    activity_code=activity_code,
+                    description=category,
+                    status='pending'
+                )
+                db.session.add(record)
+                created.append({'type': 'picture', 'file': filename, 'duplicate': not blob.created})
+            else:
+                record = Document(
+                    project_id=project_id,
+                    file_name=filename,
+                    file_url=blob.file_url,
+                    sha256=blob.sha256,
+                    file_size=blob.size,
+                    uploaded_at=datetime.utcnow(),
+                    document_type=category or 'general',
+                    category=category,
+                    status='pending'
+                )
+                db.session.add(record)
+                created.append({'type': 'document', 'file': filename, 'duplicate': not blob.created})
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        discard_new_blobs(stored)
+        current_app.logger.exception(exc)
+        return jsonify({'error': 'Upload failed'}), 500
     return jsonify({'message': 'Files uploaded successfully', 'created': created}), 201
 
 @media_bp.route('/media/list', methods=['GET'])
 def list_media():
-    """Return pictures and document records."""
-    pics_file = current_app.config.get('DAILY_PICTURES_FILE')
-    docs_file = current_app.config.get('DOCUMENTS_FILE')
-
-    media = []
-    if pics_file and os.path.exists(pics_file):
-        df = load_data(pics_file, columns=['file_name', 'description', 'file_url'])
-        media += [
-            {
-                'filename': row.get('file_name'),
-                'description': row.get('description', ''),
-                'url': row.get('file_url'),
-                'type': 'picture',
-                'status': 'committed'
-            }
-            for _, row in df.iterrows()
-        ]
-
-    if docs_file and os.path.exists(docs_file):
-        df = load_data(docs_file, columns=['file_name', 'file_url', 'document_type'])
-        media += [
-            {
-                'filename': row.get('file_name'),
-                'description': '',
-                'url': row.get('file_url'),
-                'type': 'pdf' if str(row.get('document_type', '')).lower().endswith('pdf') else 'document',
-                'status': 'committed'
-            }
-            for _, row in df.iterrows()
-        ]
-
-    return jsonify({'media': media})
+    """
+    Return picture and document records of a project, newest first.
+
+    Query parameters: project_id (defaults to the session project), date or
+    start/end, status (comma separated), type (picture or document), limit
+    and cursor (``next_cursor`` of the previous page).
+    """
+    project = resolve_project(request.args.get('project_id') or session.get('project_id'))
+    if project is None:
+        return jsonify(media=[], next_cursor=None), 200
+
+    options, error = media_listing.parse_args(request.args)
+    if error:
+        return jsonify(error=error), 400
+    kind = request.args.get('type')
+    if kind and kind not in media_listing.MEDIA_MODELS:
+        return jsonify(error="type must be picture or document"), 400
+    kinds = (kind,) if kind else tuple(media_listing.MEDIA_MODELS)
+
+    try:
+        rows, next_cursor = media_listing.list_media(project.id, kinds, **options)
+    except media_listing.InvalidCursor:
+        return jsonify(error="Invalid cursor"), 400
+    return jsonify(media=[media_listing.serialize_media(k, r) for k, r in rows],
+                   next_cursor=next_cursor), 200
+
+
+def _send_rendition(record, size):
+    if record is None:
+        return jsonify(error="Not found"), 404
+    if size not in thumbnails.SIZES:
+        return jsonify(error=f"size must be one of {', '.join(thumbnails.SIZES)}"), 400
+    if not _is_image(record.file_name or record.file_url or ''):
+        return jsonify(error="File is not an image"), 415
+
+    source = thumbnails.source_path(record)
+    if not os.path.exists(source):
+        return jsonify(error="File not found"), 404
+    target = thumbnails.rendition_path(source, size)
+    if not os.path.exists(target):
+        # Background job has not finished (or failed); render it now
+        try:
+            thumbnails.render_renditions(source)
+        except Exception as exc:
+            current_app.logger.warning("Thumbnail rendering failed for %s: %s", source, exc)
+            return jsonify(error="Could not render thumbnail"), 415
+    return send_file(target, mimetype='image/webp', conditional=True, max_age=86400)
+
+
+@media_bp.route('/thumb/<int:picture_id>/<size>', methods=['GET'])
+def picture_thumbnail(picture_id, size):
+    """Serve a WebP rendition (thumb or medium) of a daily picture."""
+    return _send_rendition(db.session.get(DailyPicture, picture_id), size)
+
+
+@media_bp.route('/attachment-thumb/<int:attachment_id>/<size>', methods=['GET'])
+def attachment_thumbnail(attachment_id, size):
+    """Serve a WebP rendition (thumb or medium) of a daily note attachment."""
+    return _send_rendition(db.session.get(DailyNoteAttachment, attachment_id), size)
 
 
 @media_bp.route('/confirm', methods=['POST'])
@@ -1,8 +1,10 @@
 # app/routes/payment_items_routes.py
 
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from app import db
 from app.models.core_models import PaymentItem  # PaymentItem lives here :contentReference[oaicite:0]{index=0}
+from app.utils.master_cache import cached_json
+from app.utils.master_payloads import payment_items_payload
 
 payment_items_bp = Blueprint(
     'payment_items',            # blueprint name
@@ -15,18 +17,4 @@ def list_payment_items():
     """
     Return JSON for populating a dropdown of payment items.
     """
-    # Query all payment items, ordered by the item name
-    items = PaymentItem.query.order_by(PaymentItem.item_name).all()
-
-    # Convert the query result to a list of dictionaries
-    # Each dictionary contains the id, payment_code, and item_name of the payment item
-    return jsonify({
-        'payment_items': [
-            {
-                'id': item.id,
-                'payment_code': item.payment_code,
-                'item_name': item.item_name
-            }
-            for item in items
-        ]
-    }), 200
+    return cached_json('payment_items', [PaymentItem], payment_items_payload)
@@ -1,6 +1,6 @@
-from flask import Blueprint, jsonify, current_app
-from ..utils.data_loader import load_data
-import os
+from flask import Blueprint, jsonify, request, session
+from ..utils import media_listing
+from ..utils.project_resolver import resolve_project
 
 
 pictures_bp = Blueprint('pictures_bp', __name__, url_prefix='/pictures')
@@ -8,28 +8,22 @@ pictures_bp = Blueprint('pictures_bp', __name__, url_prefix='/pictures')
 @pictures_bp.route('/pictures/list', methods=['GET'])
 def get_pictures():
     """
-    Fetch and return the list of pictures from the CSV file.
-    """
-    # 1. Retrieve the file path from config, or use a fallback
-    pictures_file = current_app.config.get("PICTURES_FILE", "fallback_pictures.csv")
-    abs_path = os.path.abspath(pictures_file)
+    Return the pictures of a project, newest first, one page at a time.
 
-    # 2. Check if the file even exists
-    if not os.path.exists(abs_path):
-        current_app.logger.info(f"No pictures CSV found at {abs_path}, returning empty list.")
-        return jsonify({"pictures": []}), 200
+    Accepts the same filters as /media/media/list (project_id, date or
+    start/end, status, limit, cursor).
+    """
+    project = resolve_project(request.args.get('project_id') or session.get('project_id'))
+    if project is None:
+        return jsonify({"pictures": [], "next_cursor": None}), 200
 
-    # 3. Attempt to load the CSV; columns can be adjusted as needed
-    pictures_df = load_data(abs_path, columns=["filename", "description"])
-    if pictures_df.empty:
-        current_app.logger.info("Pictures CSV is empty or invalid, returning empty list.")
-        return jsonify({"pictures": []}), 200
-    
-    # 4. If the DataFrame is empty, just return an empty list
-    if pictures_df.empty:
-        current_app.logger.info("Pictures CSV is empty or invalid, returning empty list.")
-        return jsonify({"pictures": []}), 200
+    options, error = media_listing.parse_args(request.args)
+    if error:
+        return jsonify(error=error), 400
+    try:
+        rows, next_cursor = media_listing.list_media(project.id, ('picture',), **options)
+    except media_listing.InvalidCursor:
+        return jsonify(error="Invalid cursor"), 400
 
-    # 5. Otherwise, convert DataFrame to a list of dicts for JSON response
-    pictures_list = pictures_df.to_dict(orient="records")
-    return jsonify({"pictures": pictures_list}), 200
\ No newline at end of file
+    pictures = [media_listing.serialize_media(kind, record) for kind, record in rows]
+    return jsonify({"pictures": pictures, "next_cursor": next_cursor}), 200
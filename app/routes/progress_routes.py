@@ -0,0 +1,68 @@
+# app/routes/progress_routes.py
+
+from datetime import date
+
+from flask import Blueprint, jsonify, request, session
+
+from ..utils.progress_series import s_curve, trend
+from ..utils.project_resolver import resolve_project
+
+progress_bp = Blueprint('progress_bp', __name__, url_prefix='/progress')
+
+TREND_BUCKETS = ('day', 'week', 'month')
+
+
+def _project_and_range(args):
+    """Return ``(project, start, end, error_response)`` from the query string."""
+    project = resolve_project(args.get('project_id') or session.get('project_id'))
+    if project is None:
+        return None, None, None, (jsonify(error="Unknown or missing project"), 404)
+    try:
+        start = date.fromisoformat(args['start'])
+        end = date.fromisoformat(args['end'])
+    except KeyError:
+        return None, None, None, (jsonify(error="start and end dates are required"), 400)
+    except ValueError:
+        return None, None, None, (jsonify(error="Dates must be in YYYY-MM-DD format"), 400)
+    if start > end:
+        return None, None, None, (jsonify(error="start must not be after end"), 400)
+    return project, start, end, None
+
+
+@progress_bp.route('/s-curve', methods=['GET'])
+def get_s_curve():
+    """
+    Cumulative hours, cost, earned and planned value per recorded day.
+
+    Query parameters: project_id (number or id, defaults to the session
+    project), start and end (ISO dates, inclusive).
+    """
+    project, start, end, error = _project_and_range(request.args)
+    if error:
+        return error
+    return jsonify({
+        'project': project.project_number,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'points': s_curve(project.id, start, end),
+    }), 200
+
+
+@progress_bp.route('/trend', methods=['GET'])
+def get_trend():
+    """
+    Change of hours, cost, earned and planned value per day, week or month.
+
+    Same parameters as /s-curve plus ``bucket`` (day, week or month; default week).
+    """
+    project, start, end, error = _project_and_range(request.args)
+    if error:
+        return error
+    bucket = request.args.get('bucket', 'week')
+    if bucket not in TREND_BUCKETS:
+        return jsonify(error=f"bucket must be one of {', '.join(TREND_BUCKETS)}"), 400
+    return jsonify({
+        'project': project.project_number,
+        'bucket': bucket,
+        'periods': trend(project.id, start, end, bucket),
+    }), 200
@@ -1,11 +1,10 @@
 from flask import Blueprint, request, jsonify, session, current_app, render_template
-from app.utils.data_loader import load_data
-import pandas as pd
 from app.models.core_models import Project  # Adjust the import path as necessary
 from app import db  # Import the db object
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import or_
+from app.utils.project_resolver import project_by_number
 
 # Define a new blueprint for projects
 projects_bp = Blueprint('projects_bp', __name__, url_prefix='/projects')
@@ -32,7 +31,7 @@ def set_project():
         if not project_number:
             return jsonify({'error': 'No project number provided'}), 400
         
-        project = Project.query.filter_by(project_number=project_number).first()
+        project = project_by_number(project_number)
         if not project:
             return jsonify({'error': 'Invalid project number'}), 404
 
@@ -2,7 +2,10 @@ from flask import Blueprint, request, jsonify, current_app, session
 from datetime import datetime
 from ..models.subcontractor_models import Subcontractor
 from ..models.SubcontractorEntry import SubcontractorEntry
-from ..models.core_models import ActivityCode, Project
+from ..models.core_models import ActivityCode
+from ..utils.bulk_entries import bulk_insert, existing_ids, first_missing
+from ..utils.entry_serializers import load_entries, serialize_subcontractor_entry
+from ..utils.project_resolver import project_by_number
 from .. import db  # Import the database instance
 
 # Routes managing subcontractor data entries
@@ -19,7 +22,7 @@ def list_subcontractors():
         if not project_number:
             return jsonify({"error": "No active project selected"}), 400
 
-        proj = Project.query.filter_by(project_number=project_number).first()
+        proj = project_by_number(project_number)
         if not proj:
             return jsonify({"error": "Invalid project number"}), 400
 
@@ -40,7 +43,7 @@ def add_subcontractor():
         if not project_number:   
             return jsonify({"error": "No active project selected"}), 400
 
-        proj = Project.query.filter_by(project_number=project_number).first()
+        proj = project_by_number(project_number)
         if not proj:
             return jsonify({"error": "Invalid project number"}), 400
         data = request.json
@@ -122,9 +125,8 @@ def confirm_entries():
     project_number = data.get('project_number')
     date_str = data.get('date')
     # validate project_number, date_str, and each usage line...
-    created = []
     if usage and project_number and date_str:
-        proj = Project.query.filter_by(project_number=project_number).first()
+        proj = project_by_number(project_number)
         if not proj:
             return jsonify({"error": "Invalid project number"}), 400
 
@@ -133,6 +135,8 @@ def confirm_entries():
         except ValueError:
             return jsonify({"error": "Invalid date format"}), 400
         
+        # Pass 1: validate every line and collect referenced ids / names
+        parsed = []
         for entry in usage:
             sub_id    = entry.get('subcontractor_id')
             manual_nm = entry.get('manual_name')
@@ -145,27 +149,63 @@ def confirm_entries():
             if hours is None or act_id is None:
                 return jsonify(error="Missing hours or activity_code_id"), 400
 
-            if sub_id is None:
-                existing = Subcontractor.query.filter_by(project_id=proj.id, name=manual_nm).first()
-                if not existing:
-                    existing = Subcontractor(project_id=proj.id, name=manual_nm)
-                    db.session.add(existing)
-                    db.session.flush()
-                sub_id = existing.id
-
-            new_entry = SubcontractorEntry(
-                project_id=proj.id,
-                date=date_obj,
-                subcontractor_id=sub_id,
-                num_employees=int(emp or 0),
-                labor_hours=float(hours),
-                activity_code_id=int(act_id) if act_id else None,
-                status='pending'
-            )
-            db.session.add(new_entry)
-            created.append(new_entry)
-        db.session.commit()
-        return jsonify(records=[e.id for e in created]), 200
+            try:
+                parsed.append({
+                    'subcontractor_id': int(sub_id) if sub_id is not None else None,
+                    'manual_name':      manual_nm if sub_id is None else None,
+                    'num_employees':    int(emp or 0),
+                    'labor_hours':      float(hours),
+                    'activity_code_id': int(act_id) if act_id else None,
+                })
+            except (TypeError, ValueError):
+                return jsonify(error="Invalid numeric value in usage line"), 400
+
+        # Pass 2: resolve activities and subcontractors with one IN query each
+        act_ids = [p['activity_code_id'] for p in parsed]
+        missing = first_missing(act_ids, existing_ids(ActivityCode, act_ids))
+        if missing is not None:
+            return jsonify(error=f"Invalid activity_code_id: {missing}"), 400
+
+        sub_ids = [p['subcontractor_id'] for p in parsed]
+        missing = first_missing(sub_ids, existing_ids(Subcontractor, sub_ids))
+        if missing is not None:
+            return jsonify(error=f"Invalid subcontractor_id: {missing}"), 400
+
+        try:
+            # Manual names: look up existing subcontractors in one query and
+            # create the rest in one INSERT, instead of a lookup + flush each.
+            names = list(dict.fromkeys(p['manual_name'] for p in parsed if p['manual_name']))
+            by_name = {}
+            if names:
+                by_name = dict(db.session.execute(
+                    db.select(Subcontractor.name, Subcontractor.id)
+                    .where(Subcontractor.project_id == proj.id, Subcontractor.name.in_(names))
+                ).all())
+                new_names = [n for n in names if n not in by_name]
+                new_ids = bulk_insert(
+                    Subcontractor, [{'project_id': proj.id, 'name': n} for n in new_names]
+                )
+                by_name.update(zip(new_names, new_ids))
+
+            rows = [
+                {
+                    'project_id':       proj.id,
+                    'date':             date_obj,
+                    'subcontractor_id': p['subcontractor_id'] or by_name[p['manual_name']],
+                    'num_employees':    p['num_employees'],
+                    'labor_hours':      p['labor_hours'],
+                    'activity_code_id': p['activity_code_id'],
+                    'status':           'pending',
+                }
+                for p in parsed
+            ]
+            records = bulk_insert(SubcontractorEntry, rows)
+            db.session.commit()
+        except Exception as e:
+            current_app.logger.error(f"Error confirming subcontractor entries: {e}", exc_info=True)
+            db.session.rollback()
+            return jsonify(error="Failed to save entries"), 500
+        return jsonify(records=records), 200
     else:
         return jsonify({"error": "Missing required fields"}), 400
 
@@ -179,7 +219,7 @@ def get_pending_entries():
         return jsonify({"error": "Missing required query parameters"}), 400
 
 
-    proj = Project.query.filter_by(project_number=project_number).first()
+    proj = project_by_number(project_number)
     if not proj:
         return jsonify({"error": "Invalid project number"}), 400
     
@@ -188,25 +228,8 @@ def get_pending_entries():
     except ValueError:
         return jsonify(error="Invalid date format, expected YYYY-MM-DD"), 400
     
-    query = SubcontractorEntry.query.filter_by(
-        project_id=proj.id,
-        date=date_obj
-    )
-
-    if status:
-        query = query.filter_by(status=status)
-    entries = query.all()
-    result = []
-    for e in entries:
-        result.append({
-            "id": e.id,
-            "subcontractor_id": e.subcontractor_id,
-            "subcontractor_name": e.subcontractor.name if e.subcontractor else None,
-            "num_employees": e.num_employees,
-            "labor_hours": e.labor_hours,
-            "activity_code_id": e.activity_code_id,
-            "activity_code": e.activity_code.code if e.activity_code else None,
-        })
+    entries = load_entries(SubcontractorEntry, proj.id, date_obj, status=status)
+    result = [serialize_subcontractor_entry(e) for e in entries]
 
     return jsonify(entries=result), 200
 
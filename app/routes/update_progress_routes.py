@@ -3,6 +3,8 @@ from flask import Blueprint
 from app.utils.validation import validate_worker_input
 from app.routes.data_persistence import save_to_csv
 from flask import session, current_app
+from app import db
+from app.utils import report_drafts
 import logging
 
 app = Flask(__name__)
@@ -16,31 +18,26 @@ TOTAL_TABS = 7
 def mark_tab_completed(tab_name):
     """Mark a tab as completed and update progress."""
     try:
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        if not current_date:
+        key = report_drafts.current_key()
+        if key is None:
             logging.error("No reporting date in session.")
             return {'error': 'No reporting date in session'}, 400
 
-        # Ensure daily_data exists
-        daily_data = session.setdefault('daily_data', {})
-        current_data = daily_data.setdefault(current_date, {})
-        tab_statuses = current_data.setdefault('tab_statuses', {})  # Ensure tab_statuses exists
-
         # Mark the tab as completed
-        tab_statuses[tab_name] = 'completed'
+        report_drafts.upsert(key, tab_name, status='completed')
+        db.session.commit()
 
         # Calculate progress percentage
-        completed_tabs = sum(1 for status in daily_data[current_date]['tab_statuses'].values() if status == 'completed')
-        total_tabs = len(daily_data[current_date]['tab_statuses'])
+        tab_statuses = {tab: d.status for tab, d in report_drafts.day_drafts(key).items()}
+        completed_tabs = sum(1 for status in tab_statuses.values() if status == 'completed')
+        total_tabs = len(tab_statuses)
         progress_percentage = int((completed_tabs / total_tabs) * 100)
 
-        session['daily_data'] = daily_data
-        session.modified = True
-
         logging.info(f"Tab '{tab_name}' marked as completed. Progress: {progress_percentage}%")
         return {'progressPercentage': progress_percentage}
     except Exception as e:
         logging.error(f"Error marking tab {tab_name} as completed: {e}", exc_info=True)
+        db.session.rollback()
         return {'error': str(e)}
 
 @update_progress_bp.route('/update-progress', methods=['POST'])
@@ -84,15 +81,13 @@ def reset_progress():
 @update_progress_bp.route('/check-all-tabs-completed', methods=['GET'])
 def check_all_tabs_completed():
     try:
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        daily_data = session.get('daily_data', {})
+        key = report_drafts.current_key()
+        drafts = report_drafts.day_drafts(key) if key else {}
 
-        if not current_date or current_date not in daily_data:
+        if not drafts:
             return jsonify({'allTabsCompleted': False}), 200
 
-        all_tabs_completed = all(
-            status == 'completed' for status in daily_data[current_date]['tab_statuses'].values()
-        )
+        all_tabs_completed = all(d.status == 'completed' for d in drafts.values())
 
         return jsonify({'allTabsCompleted': all_tabs_completed}), 200
     except Exception as e:
@@ -105,14 +100,14 @@ def get_progress():
     Get the progress percentage and list of completed tabs.
     """
     try:
-        # Retrieve session data
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        daily_data = session.get('daily_data', {})
+        # Retrieve the day's drafts
+        key = report_drafts.current_key()
+        drafts = report_drafts.day_drafts(key) if key else {}
 
-        if not current_date or current_date not in daily_data:
+        if not drafts:
             return jsonify({'progressPercentage': 0, 'completedTabs': []}), 200
 
-        tab_statuses = daily_data[current_date].get('tab_statuses', {})
+        tab_statuses = {tab: d.status for tab, d in drafts.items()}
         completed_tabs = [tab for tab, status in tab_statuses.items() if status == 'completed']
         progress_percentage = (len(completed_tabs) / TOTAL_TABS) * 100 if TOTAL_TABS else 0
 
@@ -8,6 +8,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from app import db
 from app.models.workforce_models import Worker
 from app.routes.update_progress_routes import mark_tab_completed
+from app.utils.master_cache import cached_json
+from app.utils.master_payloads import workers_payload
+from app.utils import report_drafts
 
 # Define the Blueprint for worker-related routes
 workers_bp = Blueprint('workers_bp', __name__, url_prefix='/workers')
@@ -23,16 +26,7 @@ VALID_ROLES = {"admin", "manager", "superintendent", "foreman", "worker"}
 def get_workers_list():
     """Fetch the list of valid workers from the database."""
     try:
-        workers = Worker.query.all()
-        logging.info(f"Fetched {len(workers)} workers from the database.")
-
-        # Validate and filter only workers with valid fields
-        valid_workers = [
-            {'id': worker.id, 'name': worker.name}
-            for worker in workers if worker.id and worker.name
-        ]
-
-        return jsonify({'workers': valid_workers}), 200
+        return cached_json('workers', [Worker], workers_payload)
 
     except SQLAlchemyError as e:
         logging.error(f"Database error fetching workers: {str(e)}", exc_info=True)
@@ -45,19 +39,15 @@ def get_workers_list():
 @workers_bp.route('/add-worker', methods=['POST'])
 def add_worker():
     """
-    Adds a worker to the database and session for the current reporting date.
+    Adds a worker to the database and to the workers draft of the current reporting date.
     """
     try:
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        if not current_date:
+        key = report_drafts.current_key()
+        if key is None:
             return jsonify({'error': 'No reporting date selected'}), 400
 
-        # Initialize daily session data
-        daily_data = session.setdefault('daily_data', {})
-        current_data = daily_data.setdefault(current_date, {})
-        entries = current_data.setdefault('entries', {})
-        workers = entries.setdefault('workers', [])
-        tab_statuses = current_data.setdefault('tab_statuses', {})
+        # Current draft of the workers tab
+        workers = report_drafts.tab_entries(key, 'workers')
 
         # Parse and validate incoming data
         data = request.json
@@ -85,7 +75,7 @@ def add_worker():
         except ValueError:
             return jsonify({"error": "Invalid number for labor hours"}), 400
 
-        # Ensure worker is unique in session
+        # Ensure worker is unique in the draft
         for existing_worker in workers:
             if existing_worker["workerName"] == worker_name and existing_worker["activityCode"] == activity_code:
                 return jsonify({"error": f"Worker '{worker_name}' is already added to the session with the same activity."}), 400
@@ -99,7 +89,7 @@ def add_worker():
             db.session.commit()
             logging.info(f"Worker '{worker_name}' added to database.")
 
-        # Add worker details to session
+        # Add worker details to the draft
         worker_entry = {
             "workerName": worker_name,
             "laborHours": labor_hours,
@@ -109,7 +99,8 @@ def add_worker():
         }
 
         workers.append(worker_entry)
-        session.modified = True  # ✅ Ensure session updates persist
+        report_drafts.upsert(key, 'workers', entries=workers)
+        db.session.commit()
 
         return jsonify({"message": "Worker added successfully", "workers": workers}), 200
 
@@ -145,18 +136,14 @@ def delete_worker(worker_id):
 @workers_bp.route('/confirm-workers', methods=['POST'])
 def confirm_workers():
     """
-    Confirms workers for the current reporting date and updates session data.
+    Confirms workers for the current reporting date and updates the workers draft.
     """
     try:
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        if not current_date:
+        key = report_drafts.current_key()
+        if key is None:
             return jsonify({'error': 'No reporting date selected'}), 400
 
-        daily_data = session.setdefault('daily_data', {})
-        current_data = daily_data.setdefault(current_date, {})
-        entries = current_data.setdefault('entries', {})
-        workers = entries.setdefault('workers', [])
-        tab_statuses = current_data.setdefault('tab_statuses', {})
+        workers = report_drafts.tab_entries(key, 'workers')
 
         # Parse the incoming JSON payload
         data = request.get_json()
@@ -175,7 +162,8 @@ def confirm_workers():
                 ):
                     existing_worker['status'] = 'confirmed'
 
-        session.modified = True
+        report_drafts.upsert(key, 'workers', entries=workers)
+        db.session.commit()
 
         # Mark the workers tab as completed
         progress_data = mark_tab_completed('workers')
@@ -183,7 +171,7 @@ def confirm_workers():
             logging.error(f"Error in mark_tab_completed: {progress_data}")
             return jsonify(progress_data), 400
 
-        logging.info(f"Workers confirmed for {current_date}. Updated session data: {session.get('daily_data')}")
+        logging.info(f"Workers confirmed for {key.report_date}: {len(workers)} draft workers.")
         return jsonify({'message': 'Workers confirmed successfully!', 'status': 'success', **progress_data}), 200
 
     except Exception as e:
@@ -193,15 +181,14 @@ def confirm_workers():
 
 @workers_bp.route('/session-list', methods=['GET'])
 def get_session_workers():
-    """Fetch workers from the session for the current reporting date."""
+    """Fetch draft workers for the current reporting date."""
     try:
-        current_date = session.get('report_date') or session.get('current_reporting_date')
-        if not current_date:
+        key = report_drafts.current_key()
+        if key is None:
             return jsonify({'error': 'No reporting date in session'}), 400
 
-        daily_data = session.get('daily_data', {})
-        workers = daily_data.get(current_date, {}).get('entries', {}).get('workers', [])
-        logging.info(f"Fetched workers for {current_date}: {workers}")
+        workers = report_drafts.tab_entries(key, 'workers')
+        logging.info(f"Fetched workers for {key.report_date}: {workers}")
         return jsonify({'workers': workers}), 200
     except Exception as e:
         logging.error(f"Error fetching session workers: {e}")
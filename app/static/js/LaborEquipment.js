@@ -1,6 +1,6 @@
 // static/js/LaborEquipment.js
 
-import { populateDropdowns } from './populate_drop_downs.js';
+import { populateDropdowns, takeBootstrap } from './populate_drop_downs.js';
 
 // In-memory staging of new (preview) lines
 let staging = [];
@@ -242,6 +242,11 @@ async function confirmUsageLines(e) {
  */
 async function loadPendingEntries(projectId, reportDate) {
   try {
+    const boot = await takeBootstrap('labor-equipment', projectId, reportDate);
+    if (boot) {
+      renderConfirmedTable(boot.pending.workers, boot.pending.equipment);
+      return;
+    }
     const resp = await fetch(`/labor-equipment/by-project-date?project_id=${encodeURIComponent(projectId)}&date=${encodeURIComponent(reportDate)}`);
     if (!resp.ok) throw new Error(await resp.text());
     const { workers, equipment } = await resp.json();
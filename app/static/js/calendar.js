@@ -10,17 +10,58 @@ document.addEventListener("DOMContentLoaded", () => {
     updateCalendar();
 });
 
+// Month payloads already fetched (or in flight), keyed by "YYYY-M".
+// Adjacent months are prefetched so month navigation renders instantly.
+const calendarCache = new Map();
+
+function loadMonth(year, month) {
+    const key = `${year}-${month}`;
+    if (!calendarCache.has(key)) {
+        const request = fetch(`/calendar/calendar-data?year=${year}&month=${month}`)
+            .then(response => {
+                if (!response.ok) throw new Error('Failed to fetch calendar data.');
+                return response.json();
+            })
+            .catch(error => {
+                calendarCache.delete(key);  // allow a retry on the next visit
+                throw error;
+            });
+        calendarCache.set(key, request);
+    }
+    return calendarCache.get(key);
+}
+
+function shiftMonth(year, month, delta) {
+    const d = new Date(year, month - 1 + delta, 1);
+    return [d.getFullYear(), d.getMonth() + 1];
+}
+
+function prefetchAdjacentMonths(year, month) {
+    const prefetch = () => {
+        [-1, 1].forEach(delta => {
+            loadMonth(...shiftMonth(year, month, delta)).catch(() => {});
+        });
+    };
+    if ('requestIdleCallback' in window) {
+        window.requestIdleCallback(prefetch);
+    } else {
+        setTimeout(prefetch, 200);
+    }
+}
+
 async function fetchCalendarData(year, month) {
     try {
-        const response = await fetch(`/calendar/calendar-data?year=${year}&month=${month}`);
-        if (!response.ok) throw new Error('Failed to fetch calendar data.');
-        const data = await response.json();
+        const data = await loadMonth(year, month);
 
         if (!data.calendar) throw new Error('No calendar data available.');
         if (!data.projects) throw new Error('No project data available.');
 
+        // Ignore a stale response if the user already navigated elsewhere
+        if (year !== selectedYear || month !== selectedMonth) return;
+
         const calendar = generateFullCalendar(year, month);
         renderCalendar(calendar, data.calendar);
+        prefetchAdjacentMonths(year, month);
     } catch (error) {
         alert('Failed to load calendar data. Please try again.');
         console.error('Error fetching calendar data:', error);
@@ -1,5 +1,7 @@
 // app/static/js/documents.js
 
+import { takeBootstrap } from './populate_drop_downs.js';
+
 let pendingFiles = [];
 
 export function initDocumentsTab() {
@@ -18,6 +20,11 @@ export async function loadDocuments() {
   if (!tbody) return;
   tbody.innerHTML = '';
   try {
+    const boot = await takeBootstrap('documents');
+    if (boot) {
+      renderDocumentsTable(boot.documents);
+      return;
+    }
     const resp = await fetch('/documents/list');
     if (!resp.ok) throw new Error('Erreur chargement');
     const respData = await resp.json();
@@ -0,0 +1,132 @@
+// File: static/js/draft_autosave.js
+
+/**
+ * Incremental draft autosave.
+ *
+ * Instead of uploading the whole entry list of a tab on every save, the
+ * client remembers the last saved entries + revision per tab and sends an
+ * RFC 6902 JSON Patch with only the changed rows.  When the server answers
+ * 409 (the draft changed elsewhere) we reload its draft and replay our patch
+ * on top of it if the two edits touch different rows.  Otherwise the save
+ * fails with a DraftConflictError; the caller decides whether to overwrite
+ * the other session with `saveDraft(tab, entries, { overwrite: true })`.
+ */
+
+const savedDrafts = new Map();  // tab -> { revision, entries }
+
+async function loadDraft(tab) {
+  const resp = await fetch(`/data-entry/draft?tab=${encodeURIComponent(tab)}`);
+  if (!resp.ok) throw new Error(`Status ${resp.status}`);
+  const { revision, entries } = await resp.json();
+  return { revision, entries: entries || [] };
+}
+
+export class DraftConflictError extends Error {
+  constructor(tab, server) {
+    super(`The ${tab} draft was changed in another session`);
+    this.name = "DraftConflictError";
+    this.tab = tab;
+    this.server = server;  // { revision, entries } as saved elsewhere
+  }
+}
+
+/**
+ * Row-level diff of two entry lists as JSON Patch operations.
+ */
+export function diffEntries(before, after) {
+  const ops = [];
+  const common = Math.min(before.length, after.length);
+  for (let i = 0; i < common; i++) {
+    if (JSON.stringify(before[i]) !== JSON.stringify(after[i])) {
+      ops.push({ op: "replace", path: `/${i}`, value: after[i] });
+    }
+  }
+  for (let i = common; i < after.length; i++) {
+    ops.push({ op: "add", path: "/-", value: after[i] });
+  }
+  // Remove from the end so earlier indexes stay valid
+  for (let i = before.length - 1; i >= after.length; i--) {
+    ops.push({ op: "remove", path: `/${i}` });
+  }
+  return ops;
+}
+
+function applyPatch(entries, ops) {
+  const result = structuredClone(entries);
+  for (const { op, path, value } of ops) {
+    if (op === "add") result.push(structuredClone(value));
+    else if (op === "replace") result[Number(path.slice(1))] = structuredClone(value);
+    else if (op === "remove") result.splice(Number(path.slice(1)), 1);
+  }
+  return result;
+}
+
+/**
+ * Whether `ops` (a diff against `base`) can be replayed on `server`:
+ * every row it replaces or removes must be unchanged there.  Appends
+ * always can; removals also need the row indexes to be unchanged.
+ */
+function canRebase(base, server, ops) {
+  const same = i => i < server.length && JSON.stringify(base[i]) === JSON.stringify(server[i]);
+  return ops.every(({ op, path }) => {
+    if (op === "add") return true;
+    const i = Number(path.slice(1));
+    if (op === "remove" && server.length !== base.length) return false;
+    return same(i);
+  });
+}
+
+async function postDraft(body) {
+  const resp = await fetch("/data-entry/save_draft", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
+  });
+  const data = await resp.json();
+  return { status: resp.status, data };
+}
+
+/**
+ * Save `entries` as the draft of `tab`, sending only what changed.
+ * Resolves to the server response ({ message, entries, revision }); after
+ * a rebase `draft` holds the merged entries, which may include rows saved
+ * elsewhere.  Rejects with DraftConflictError when the edits collide,
+ * unless `overwrite` asks for a full snapshot that replaces the draft.
+ */
+export async function saveDraft(tab, entries, { overwrite = false } = {}) {
+  if (overwrite) {
+    const { status, data } = await postDraft({ tab, entries });
+    if (status !== 200) throw new Error(data.error || `Status ${status}`);
+    savedDrafts.set(tab, { revision: data.revision, entries: structuredClone(entries) });
+    return data;
+  }
+
+  let state = savedDrafts.get(tab);
+  if (!state) {
+    state = await loadDraft(tab);
+    savedDrafts.set(tab, state);
+  }
+
+  const patch = diffEntries(state.entries, entries);
+  if (!patch.length) {
+    return { message: "Draft unchanged", entries: entries.length, revision: state.revision };
+  }
+
+  let draft = entries;
+  let { status, data } = await postDraft({ tab, base_revision: state.revision, patch });
+  if (status === 409) {
+    // Someone else saved this draft meanwhile: replay our rows on theirs.
+    // On conflict the old base is kept, so later saves conflict too.
+    const server = await loadDraft(tab);
+    if (!canRebase(state.entries, server.entries, patch)) {
+      throw new DraftConflictError(tab, server);
+    }
+    draft = applyPatch(server.entries, patch);
+    ({ status, data } = await postDraft({ tab, base_revision: server.revision, patch }));
+    if (status === 409) throw new DraftConflictError(tab, await loadDraft(tab));
+  }
+  if (status !== 200) throw new Error(data.error || `Status ${status}`);
+
+  savedDrafts.set(tab, { revision: data.revision, entries: structuredClone(draft) });
+  return draft === entries ? data : { ...data, draft };
+}
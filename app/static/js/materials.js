@@ -1,6 +1,6 @@
 // static/js/Materials.js
 
-import { populateDropdowns } from './populate_drop_downs.js';
+import { populateDropdowns, takeBootstrap } from './populate_drop_downs.js';
 
 //
 // In-memory staging of manual material entries
@@ -172,6 +172,11 @@ async function confirmMaterialLines(e) {
 // ────────────────────────────────────────────────────
 async function loadPendingMaterials(projectId, reportDate) {
   try {
+    const boot = await takeBootstrap('materials', projectId, reportDate);
+    if (boot) {
+      renderConfirmedTable(boot.pending.materials);
+      return;
+    }
     const resp = await fetch(
       `/materials/by-project-date?project_id=${encodeURIComponent(projectId)}&date=${encodeURIComponent(reportDate)}`
     );
@@ -1,7 +1,7 @@
 let stagedMedia = [];
 
 export async function fetchAndRenderMedia() {
-    const resp = await fetch('/media/list');
+    const resp = await fetch('/media/media/list');
     const data = await resp.json();
     renderCommittedTable(data.media || []);
     renderPreviewTable();
@@ -37,7 +37,9 @@ function renderCommittedTable(media) {
         const div = document.createElement('div');
         div.classList.add('media-item');
         if (m.type === 'picture') {
-            div.innerHTML = `<img src="${m.url}" alt="${m.filename}" class="thumb">`;
+            // Small WebP rendition in the grid; the original opens on click
+            div.innerHTML = `<a href="${m.url}" target="_blank">` +
+                `<img src="${m.thumbnail_url || m.url}" alt="${m.filename}" class="thumb" loading="lazy"></a>`;
         } else {
             div.innerHTML = `<a href="${m.url}" target="_blank">📄 ${m.filename}</a>`;
         }
@@ -1,5 +1,7 @@
 // app/static/js/notes.js
 
+import { takeBootstrap } from './populate_drop_downs.js';
+
 let editingNoteId = null;
 let stagedNotes   = [];
 
@@ -40,15 +42,19 @@ export async function fetchAndRenderDailyNotes() {
   tbody.innerHTML = '';
 
   try {
-    // 3) Fetch from the new endpoint
-    const resp = await fetch('/entries_daily_notes/list');
-    const data = await resp.json();
-
-    // 4) If the status is not OK, throw to be caught below
-    if (!resp.ok) throw new Error(data.error || 'Fetch failed');
-
-    // 5) Pull the list from data.entries (empty array fallback)
-    const notes = Array.isArray(data.entries) ? data.entries : [];
+    // 3) First load comes with the page's bootstrap payload
+    const boot = await takeBootstrap('notes');
+    let notes = boot ? boot.notes : null;
+
+    if (!notes) {
+      // 4) Otherwise fetch from the endpoint; throw on error status
+      const resp = await fetch('/entries_daily_notes/list');
+      const data = await resp.json();
+      if (!resp.ok) throw new Error(data.error || 'Fetch failed');
+
+      // 5) Pull the list from data.entries (empty array fallback)
+      notes = Array.isArray(data.entries) ? data.entries : [];
+    }
 
     // 6) Render each note
     notes.forEach(note => {
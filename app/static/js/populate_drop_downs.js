@@ -1,19 +1,60 @@
 // File: static/js/populate_drop_downs.js
 
+/**
+ * 0) Shared bootstrap payload
+ *    One GET /data-entry/bootstrap per page load returns every dropdown list
+ *    plus the day's pending entries, notes and documents.  Resolves to null
+ *    when it is not available, e.g. before a project/date is selected, in
+ *    which case the individual endpoints are used.
+ */
+let bootstrapPromise = null;
+
+export function getBootstrap() {
+  if (!bootstrapPromise) {
+    bootstrapPromise = fetch("/data-entry/bootstrap")
+      .then(resp => (resp.ok ? resp.json() : null))
+      .catch(() => null);
+  }
+  return bootstrapPromise;
+}
+
+const takenSections = new Set();
+
+/**
+ * The bootstrap payload for a tab's first load of its rows, or null.
+ * Each `section` gets it once, and only for the same project/date, so
+ * reloads after a confirm/edit/delete go to the tab's own endpoint.
+ */
+export async function takeBootstrap(section, projectNumber, reportDate) {
+  if (takenSections.has(section)) return null;
+  takenSections.add(section);
+  const boot = await getBootstrap();
+  if (!boot) return null;
+  if (projectNumber && String(boot.project.project_number) !== String(projectNumber)) return null;
+  if (reportDate && boot.report_date !== reportDate) return null;
+  return boot;
+}
+
+async function masterList(key, url) {
+  const boot = await getBootstrap();
+  if (boot && boot.master && Array.isArray(boot.master[key])) {
+    return boot.master[key];
+  }
+  const resp = await fetch(url);
+  if (!resp.ok) throw new Error(`Status ${resp.status}`);
+  return (await resp.json())[key];
+}
+
 /**
  * 1) Populate Workers & Equipment dropdown
  */
 export async function populateWorkersAndEquipmentDropdown() {
   console.log("[populateWorkersAndEquipmentDropdown] fetching workers & equipment...");
   try {
-    const [wkResp, eqResp] = await Promise.all([
-      fetch("/workers/list"),
-      fetch("/equipment/list")
+    const [workers, equipment] = await Promise.all([
+      masterList("workers", "/workers/list"),
+      masterList("equipment", "/equipment/list")
     ]);
-    if (!wkResp.ok || !eqResp.ok) throw new Error("Fetch failed");
-
-    const { workers }   = await wkResp.json();
-    const { equipment } = await eqResp.json();
     const dd = document.getElementById("workerName");
     if (!dd) return;
 
@@ -45,10 +86,7 @@ export async function populateWorkersAndEquipmentDropdown() {
 export async function populateActivityDropdown() {
   console.log("[populateActivityDropdown] fetching codes...");
   try {
-    const resp = await fetch("/activity-codes/get_activity_codes");
-    if (!resp.ok) throw new Error("Fetch failed");
-
-    const { activity_codes } = await resp.json();
+    const activity_codes = await masterList("activity_codes", "/activity-codes/get_activity_codes");
     window.activityCodesList = activity_codes;  // store for inline editing
 
     const ids = [
@@ -83,9 +121,7 @@ export async function populateActivityDropdown() {
 export async function populatePaymentItemDropdown() {
   console.log("[populatePaymentItemDropdown] fetching payment items...");
   try {
-    const resp = await fetch("/payment-items/list");
-    if (!resp.ok) throw new Error(`Status ${resp.status}`);
-    const { payment_items: items } = await resp.json();
+    const items = await masterList("payment_items", "/payment-items/list");
     window.paymentItemsList = items;     // store for inline editing
 
     
@@ -117,9 +153,7 @@ export async function populatePaymentItemDropdown() {
 export async function populateCwpDropdown() {
   let cwps;
   try {
-    const resp = await fetch("/data-entry/cw-packages/list");
-    if (!resp.ok) throw new Error(`Status ${resp.status}`);
-    ({ cwps } = await resp.json());
+    cwps = await masterList("cwps", "/data-entry/cw-packages/list");
     window.cwpList = cwps;  // store for inline editing
   } catch (err) {
     return;
@@ -1,5 +1,5 @@
 // static/js/subcontractors.js
-import { populateDropdowns } from './populate_drop_downs.js';
+import { populateDropdowns, takeBootstrap } from './populate_drop_downs.js';
 
 let stagedSubs = [];
 export const subcontractorMap = new Map();
@@ -163,6 +163,12 @@ async function confirmSubLines(e) {
 
 async function loadPendingSubs(projectNumber, reportDate, status = 'pending') {
     try {
+        const boot = status === 'pending'
+            ? await takeBootstrap('subcontractors', projectNumber, reportDate) : null;
+        if (boot) {
+            renderConfirmedTable(boot.pending.subcontractors);
+            return;
+        }
         const resp = await fetch(
             `/subcontractors/by-project-date?project_number=${encodeURIComponent(projectNumber)}&date=${encodeURIComponent(reportDate)}&status=${encodeURIComponent(status)}`
         );
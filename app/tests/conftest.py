@@ -1,4 +1,8 @@
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
+
 from app import create_app, db
 
 
@@ -14,4 +18,33 @@ def app():
 
 @pytest.fixture
 def client(app):
-    return app.test_client()
\ No newline at end of file
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager collecting ``(statement, parameters)`` of every SQL statement run in it.
+
+    Usage::
+
+        with count_queries() as queries:
+            client.get(...)
+        assert len(queries) == 0
+    """
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def capture():
+        queries = []
+
+        def before(conn, cursor, statement, parameters, context, executemany):
+            queries.append((statement, parameters))
+
+        event.listen(engine, 'before_cursor_execute', before)
+        try:
+            yield queries
+        finally:
+            event.remove(engine, 'before_cursor_execute', before)
+
+    return capture
@@ -0,0 +1,52 @@
+from sqlalchemy import select
+
+from app import db
+from app.models import DailyReportStatus, WorkerEntry
+from app.utils.benchmarks import SCENARIOS, compare, run_benchmarks
+from app.utils.synthetic_data import generate
+
+
+def _snapshot():
+    return db.session.execute(
+        select(WorkerEntry.project_id, WorkerEntry.date_of_report, WorkerEntry.worker_id,
+               WorkerEntry.hours_worked, WorkerEntry.status).order_by(WorkerEntry.id)).all()
+
+
+def test_generator_is_seeded_and_scaled(app):
+    counts = generate(projects=2, days=3, entries=4, masters=10, seed=7)
+    db.session.commit()
+    assert counts['entries_workers'] == 2 * 3 * 4
+    assert counts['daily_report_statuses'] == 2 * 3
+    assert counts['daily_cost_summaries'] > 0
+    first = _snapshot()
+    pending = db.session.scalars(
+        select(WorkerEntry.date_of_report).where(WorkerEntry.status == 'pending').distinct()).all()
+    assert len(pending) == 1
+    assert pending[0] == db.session.scalar(select(DailyReportStatus.report_date)
+                                           .order_by(DailyReportStatus.report_date.desc()).limit(1))
+
+    db.drop_all()
+    db.create_all()
+    generate(projects=2, days=3, entries=4, masters=10, seed=7)
+    db.session.commit()
+    assert _snapshot() == first
+
+
+def test_benchmarks_cover_every_scenario(app):
+    # Eight rows per tab: enough for the testing N+1 guard to raise
+    generate(projects=1, days=3, entries=8, masters=10)
+    db.session.commit()
+    results = run_benchmarks(app, repeat=1, batch_size=8)
+    assert set(results['scenarios']) == {name for name, _ in SCENARIOS}
+    for name, row in results['scenarios'].items():
+        assert row['status'] == [200], name
+
+    # Export SQL runs while the body streams; it must still be counted
+    assert results['scenarios']['export_csv']['queries'] > 0
+    assert results['scenarios']['export_ndjson']['queries'] > 0
+
+    slower = {'scenarios': {name: {**row, 'median_ms': row['median_ms'] * 2}
+                            for name, row in results['scenarios'].items()}}
+    rows = compare(results, slower)
+    assert all(row['regression'] and row['ratio'] == 2 for row in rows if row['baseline_ms'])
+    assert not any(row['regression'] for row in compare(results, results))
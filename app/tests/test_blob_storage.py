@@ -0,0 +1,111 @@
+import hashlib
+import io
+import os
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+from app import db
+from app.models.models import Document
+from app.models.daily_models import DailyPicture
+from app.models.core_models import Project
+from app.utils.blob_storage import blob_path
+
+
+def _setup(client, app, tmp_dir):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = 'manager'
+    project = Project(name='Blob', project_number='BL1', category='Test')
+    db.session.add(project)
+    db.session.commit()
+    app.config['UPLOAD_FOLDER'] = tmp_dir
+    return project
+
+
+def _blob_files(folder):
+    return sorted(
+        name for _, _, names in os.walk(os.path.join(folder, 'blobs')) for name in names
+    )
+
+
+def test_same_name_different_content_does_not_overwrite(client, app):
+    with TemporaryDirectory() as tmp_dir:
+        project = _setup(client, app, tmp_dir)
+        for content in (b'first foreman', b'second foreman'):
+            resp = client.post('/documents/upload', content_type='multipart/form-data', data={
+                'project_id': project.id,
+                'work_date': datetime.utcnow().isoformat(),
+                'files': (io.BytesIO(content), 'IMG_0001.txt'),
+            })
+            assert resp.status_code == 201
+
+        docs = Document.query.order_by(Document.id).all()
+        assert [d.file_name for d in docs] == ['IMG_0001.txt', 'IMG_0001.txt']
+        assert docs[0].sha256 == hashlib.sha256(b'first foreman').hexdigest()
+        assert docs[1].file_size == len(b'second foreman')
+        with open(blob_path(docs[0].sha256, tmp_dir), 'rb') as f:
+            assert f.read() == b'first foreman'
+
+        with client.session_transaction() as sess:
+            sess['project_id'] = project.id
+            sess['report_date'] = datetime.utcnow().date().isoformat()
+        listed = client.get('/documents/list').get_json()['documents']
+        resp = client.get(listed[1]['file_url'])
+        assert resp.status_code == 200
+        assert resp.data == b'second foreman'
+        assert resp.mimetype == 'text/plain'
+
+
+def test_duplicate_uploads_share_one_blob(client, app):
+    with TemporaryDirectory() as tmp_dir:
+        project = _setup(client, app, tmp_dir)
+        photo = b'\xff\xd8same site photo'
+        resp = client.post('/media/upload', content_type='multipart/form-data', data={
+            'project_id': project.id,
+            'files': [(io.BytesIO(photo), 'a.jpg'), (io.BytesIO(photo), 'b.jpg'),
+                      (io.BytesIO(photo), 'c.jpg')],
+        })
+        assert resp.status_code == 201
+        assert [c['duplicate'] for c in resp.get_json()['created']] == [False, True, True]
+
+        pictures = DailyPicture.query.all()
+        assert len(pictures) == 3
+        assert len({p.file_url for p in pictures}) == 1
+        assert _blob_files(tmp_dir) == [hashlib.sha256(photo).hexdigest()]
+        assert os.listdir(os.path.join(tmp_dir, 'tmp')) == []
+
+
+def test_blob_downloads_support_etag_and_ranges(client, app):
+    with TemporaryDirectory() as tmp_dir:
+        project = _setup(client, app, tmp_dir)
+        content = b'%PDF-1.4 ' + bytes(range(256)) * 64
+        client.post('/documents/upload', content_type='multipart/form-data', data={
+            'project_id': project.id,
+            'work_date': datetime.utcnow().isoformat(),
+            'files': (io.BytesIO(content), 'drawing.pdf'),
+        })
+        doc = Document.query.one()
+        url = '/documents/files/' + os.path.relpath(blob_path(doc.sha256, tmp_dir), tmp_dir)
+
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert resp.headers['ETag'] == f'"{doc.sha256}"'
+        assert 'immutable' in resp.headers['Cache-Control']
+        assert 'private' in resp.headers['Cache-Control']
+        assert 'public' not in resp.headers['Cache-Control']
+        assert 'filename=drawing.pdf' in resp.headers['Content-Disposition']
+
+        assert client.get(url, headers={'If-None-Match': f'"{doc.sha256}"'}).status_code == 304
+        resp = client.get(url, headers={'Range': 'bytes=100-199'})
+        assert resp.status_code == 206
+        assert resp.data == content[100:200]
+        assert resp.headers['Content-Range'] == f'bytes 100-199/{len(content)}'
+
+        app.config['DOWNLOAD_OFFLOAD'] = 'x-accel-redirect'
+        resp = client.get(url)
+        assert resp.data == b''
+        assert resp.headers['X-Accel-Redirect'] == '/protected-uploads/' + url.split('/files/', 1)[1]
+        assert resp.mimetype == 'application/pdf'
+        assert 'private' in resp.headers['Cache-Control']
+        assert 'public' not in resp.headers['Cache-Control']
+        assert client.get('/documents/files/../secret.txt').status_code == 404
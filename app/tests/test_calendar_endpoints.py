@@ -49,3 +49,40 @@ def test_calendar_data_structure(client, app):
 
     assert data['projects'][str(project_a.id)].startswith(project_a.project_number)
     assert data['projects'][str(project_b.id)].startswith(project_b.project_number)
+
+
+def test_calendar_data_honours_month_window(client, app):
+    with app.app_context():
+        project_a, _ = create_sample_data()
+        db.session.add(DailyReportStatus(project_id=project_a.id, report_date=date(2025, 2, 3),
+                                         report_status='completed'))
+        db.session.commit()
+
+    with client.session_transaction() as sess:
+        sess['user_id'] = '123'
+
+    january = client.get('/calendar/calendar-data?year=2025&month=1').get_json()
+    assert sorted(january['calendar']) == ['2025-01-06', '2025-01-07']
+
+    february = client.get('/calendar/calendar-data?year=2025&month=2').get_json()
+    assert february['calendar'] == {'2025-02-03': {project_a.project_number: 'completed'}}
+    assert str(project_a.id) in february['projects']
+
+    december = client.get('/calendar/calendar-data?year=2024&month=12').get_json()
+    assert december['calendar'] == {}
+
+
+def test_calendar_data_rejects_bad_window(client):
+    with client.session_transaction() as sess:
+        sess['user_id'] = '123'
+    assert client.get('/calendar/calendar-data?year=2025&month=13').status_code == 400
+    assert client.get('/calendar/calendar-data?year=2025').status_code == 400
+    assert client.get('/calendar/calendar-data?month=5').status_code == 400
+    assert client.get('/calendar/calendar-data?start=2025-02-01&end=2025-01-01').status_code == 400
+
+
+def test_daily_report_statuses_has_date_project_index(app):
+    from sqlalchemy import inspect
+    with app.app_context():
+        indexes = {ix['name']: ix['column_names'] for ix in inspect(db.engine).get_indexes('daily_report_statuses')}
+    assert indexes['ix_daily_report_statuses_date_project'] == ['report_date', 'project_id']
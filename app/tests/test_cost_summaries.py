@@ -0,0 +1,99 @@
+from datetime import date
+
+from app import db
+from app.models.core_models import Project, ActivityCode
+from app.models.equipment_models import Equipment
+from app.models.material_models import Material
+from app.models.daily_cost_summary import DailyCostSummary
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.EquipmentEntry_models import EquipmentEntry
+from app.models.MaterialEntry import MaterialEntry
+from app.utils.cost_summaries import rebuild_cost_summaries
+
+DAY = date(2025, 4, 1)
+
+
+def _setup():
+    project = Project(name="Cost", project_number="CS1", category="Test")
+    activity = ActivityCode(code="CA1", description="desc")
+    equipment = Equipment(name="Loader", hourly_rate=100.0)
+    material = Material(name="Sand", cost_per_unit=20.0)
+    db.session.add_all([project, activity, equipment, material])
+    db.session.commit()
+    return project, activity, equipment, material
+
+
+def _summaries(project_id):
+    return {
+        s.activity_code_id: s
+        for s in DailyCostSummary.query.filter_by(project_id=project_id, report_date=DAY)
+    }
+
+
+def test_summary_follows_commit_reject_and_delete(app):
+    project, activity, equipment, material = _setup()
+    worker = WorkerEntry(project_id=project.id, date_of_report=DAY, hours_worked=8,
+                         taux_horaire=50, activity_id=activity.id, status='pending')
+    machine = EquipmentEntry(project_id=project.id, date_of_report=DAY, hours_used=2,
+                             equipment_id=equipment.id, activity_id=activity.id, status='pending')
+    sand = MaterialEntry(project_id=project.id, date_of_report=DAY, quantity_used=3,
+                         material_id=material.id, status='committed')
+    db.session.add_all([worker, machine, sand])
+    db.session.commit()
+
+    # Pending entries contribute nothing; the committed material row does
+    rows = _summaries(project.id)
+    assert set(rows) == {None}
+    assert rows[None].material_cost == 60.0
+
+    worker.status = 'committed'
+    machine.status = 'committed'
+    db.session.commit()
+    row = _summaries(project.id)[activity.id]
+    db.session.refresh(row)
+    assert (row.labor_hours, row.labor_cost, row.equipment_cost, row.total_cost) == (8, 400, 200, 600)
+
+    machine.status = 'rejected'
+    db.session.commit()
+    db.session.refresh(row)
+    assert (row.equipment_hours, row.total_cost) == (0, 400)
+
+    db.session.delete(worker)
+    db.session.commit()
+    db.session.refresh(row)
+    assert row.total_cost == 0
+
+
+def test_rollback_discards_summary_changes(app):
+    project, activity, _, _ = _setup()
+    db.session.add(WorkerEntry(project_id=project.id, date_of_report=DAY, hours_worked=8,
+                               taux_horaire=50, status='committed'))
+    db.session.flush()
+    db.session.rollback()
+    assert DailyCostSummary.query.count() == 0
+
+
+def test_rebuild_matches_incremental_totals(app):
+    project, activity, equipment, material = _setup()
+    db.session.add_all([
+        WorkerEntry(project_id=project.id, date_of_report=DAY, hours_worked=8, taux_horaire=50,
+                    activity_id=activity.id, status='committed'),
+        WorkerEntry(project_id=project.id, date_of_report=DAY, hours_worked=4, taux_horaire=50,
+                    activity_id=activity.id, status='pending'),
+        EquipmentEntry(project_id=project.id, date_of_report=DAY, hours_used=2,
+                       equipment_id=equipment.id, activity_id=activity.id, status='committed'),
+        MaterialEntry(project_id=project.id, date_of_report=DAY, quantity_used=3,
+                      material_id=material.id, status='committed'),
+    ])
+    db.session.commit()
+    incremental = {k: v.to_dict() for k, v in _summaries(project.id).items()}
+
+    # Simulate a backfill on a table that drifted
+    DailyCostSummary.query.delete()
+    db.session.commit()
+    assert rebuild_cost_summaries(project_id=project.id) == 2
+    db.session.commit()
+
+    rebuilt = {k: v.to_dict() for k, v in _summaries(project.id).items()}
+    assert rebuilt == incremental
+    assert rebuilt[activity.id]['total_cost'] == 600
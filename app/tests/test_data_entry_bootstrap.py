@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import date
+
+from app import db
+from app.models.core_models import Project, ActivityCode, PaymentItem
+from app.models.workforce_models import Worker
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.daily_models import DailyNoteEntry
+
+
+def _setup(client, app):
+    with app.app_context():
+        project = Project(name="Boot", project_number="BS1", category="Test")
+        activity = ActivityCode(code="AC1", description="desc")
+        db.session.add_all([project, activity])
+        db.session.commit()
+        ids = project.id, activity.id
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['project_id'] = "BS1"
+        sess['report_date'] = "2025-03-04"
+    return ids
+
+
+def _add_rows(project_id, activity_id, start, count):
+    for i in range(start, start + count):
+        worker = Worker(name=f"W{i}", worker_id=f"W{i}")
+        pi = PaymentItem(project_id=project_id, payment_code=f"PI{i}",
+                         activity_code_id=activity_id, item_name=f"Item {i}")
+        db.session.add_all([worker, pi])
+        db.session.flush()
+        db.session.add(WorkerEntry(
+            project_id=project_id, worker_id=worker.id, date_of_report=date(2025, 3, 4),
+            hours_worked=8, activity_id=activity_id, payment_item_id=pi.id, status='pending',
+        ))
+    db.session.commit()
+
+
+def _fetch(client, **headers):
+    resp = client.get("/data-entry/bootstrap", headers=headers)
+    assert resp.status_code == 200
+    return resp
+
+
+def test_bootstrap_returns_master_data_and_pending_entries(client, app):
+    project_id, activity_id = _setup(client, app)
+    with app.app_context():
+        _add_rows(project_id, activity_id, 0, 2)
+        db.session.add(DailyNoteEntry(project_id=project_id, date_of_report=date(2025, 3, 4),
+                                      content="Pour slab"))
+        db.session.commit()
+
+    data = _fetch(client).get_json()
+    assert data["project"]["project_number"] == "BS1"
+    assert [w["name"] for w in data["master"]["workers"]] == ["W0", "W1"]
+    assert len(data["master"]["payment_items"]) == 2
+    assert data["master"]["activity_codes"][0]["code"] == "AC1"
+    assert data["pending"]["workers"][0]["payment_item_code"] == "PI0"
+    assert data["notes"][0]["content"] == "Pour slab"
+    assert data["documents"] == []
+
+
+def test_bootstrap_query_count_is_constant(client, app, count_queries):
+    project_id, activity_id = _setup(client, app)
+    with app.app_context():
+        _add_rows(project_id, activity_id, 0, 2)
+        _fetch(client)  # warm the master-data and project caches
+        with count_queries() as small:
+            _fetch(client)
+
+        _add_rows(project_id, activity_id, 2, 30)
+        _fetch(client)
+        with count_queries() as large:
+            resp = _fetch(client)
+
+    assert len(small) == len(large)
+    assert len(resp.get_json()["pending"]["workers"]) == 32
+
+
+def test_bootstrap_is_gzip_encoded_when_accepted(client, app):
+    project_id, activity_id = _setup(client, app)
+    with app.app_context():
+        _add_rows(project_id, activity_id, 0, 20)
+
+    resp = _fetch(client, **{"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    data = json.loads(gzip.decompress(resp.data))
+    assert len(data["pending"]["workers"]) == 20
+
+
+def test_bootstrap_requires_project_and_date(client, app):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    assert client.get("/data-entry/bootstrap").status_code == 400
@@ -0,0 +1,34 @@
+import os
+
+from app.utils import data_loader
+
+
+def test_load_data_sniffs_once_and_caches_by_mtime(tmp_path, monkeypatch):
+    data_loader.clear_cache()
+    calls = []
+    real_read = data_loader._read_csv
+    monkeypatch.setattr(data_loader, '_read_csv',
+                        lambda *args: calls.append(args) or real_read(*args))
+
+    path = tmp_path / 'workers.csv'
+    path.write_text(' name ;taux_horaire\nAlice;45.5\nBob;38\n', encoding='utf-8')
+
+    df = data_loader.load_data(str(path))
+    assert list(df.columns) == ['name', 'taux_horaire']
+    assert df['taux_horaire'].tolist() == [45.5, 38.0]
+    assert calls[0][1] == ';'
+
+    # Unchanged file: served from the cache, and callers get their own copy
+    df.loc[0, 'name'] = 'changed'
+    again = data_loader.load_data(str(path), columns=['name'])
+    assert again['name'].tolist() == ['Alice', 'Bob']
+    assert len(calls) == 1
+
+    path.write_text('name,taux_horaire\nCarol,50\n', encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert data_loader.load_data(str(path))['name'].tolist() == ['Carol']
+    assert len(calls) == 2
+
+    assert data_loader.load_data(str(path), columns=['missing']).empty
+    assert data_loader.load_data(str(tmp_path / 'nope.csv')).empty
@@ -0,0 +1,34 @@
+from sqlalchemy import text
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.utils.db_engine import engine_options
+
+
+def test_file_sqlite_gets_pragmas_and_pool(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tcc.db'}"
+        DB_POOL_SIZE = 3
+        SQLITE_PRAGMAS = {**TestingConfig.SQLITE_PRAGMAS, 'busy_timeout': 1234}
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        with db.engine.connect() as conn:
+            pragmas = {name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                       for name in ('journal_mode', 'synchronous', 'busy_timeout', 'foreign_keys', 'temp_store')}
+        assert pragmas == {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 1234,
+                           'foreign_keys': 1, 'temp_store': 2}
+        assert db.engine.pool.size() == 3
+        db.engine.dispose()
+
+
+def test_explicit_engine_options_win():
+    config = {
+        'SQLALCHEMY_DATABASE_URI': 'postgresql://tcc@db/tcc',
+        'DB_POOL_SIZE': 10,
+        'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 2},
+    }
+    options = engine_options(config)
+    assert options['pool_size'] == 2
+    assert options['pool_pre_ping'] is True
+    assert 'pool_size' not in engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
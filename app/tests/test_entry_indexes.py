@@ -0,0 +1,80 @@
+import re
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models.core_models import Project
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.EquipmentEntry_models import EquipmentEntry
+from app.models.MaterialEntry import MaterialEntry
+from app.models.SubcontractorEntry import SubcontractorEntry
+from app.utils.entry_exports import ENTRY_SOURCES, iter_rows
+from app.utils.entry_serializers import load_entries
+
+ENTRY_TABLES = ('entries_workers', 'entries_equipment', 'entries_material',
+                'entries_daily_notes', 'subcontractor_entries')
+
+
+def _selects(queries):
+    return [(s, p) for s, p in queries if s.lstrip().upper().startswith('SELECT')]
+
+
+def _assert_entry_tables_use_index(queries):
+    """Every statement touching an entry table must search it through an index."""
+    checked = set()
+    for statement, parameters in _selects(queries):
+        plan = db.session.connection().exec_driver_sql(
+            'EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        details = [row[-1] for row in plan]
+        for table in ENTRY_TABLES:
+            if not re.search(rf'\b{table}\b', statement):
+                continue
+            steps = [d for d in details if re.search(rf'\b{table}\b', d)]
+            assert steps, (table, details)
+            for step in steps:
+                assert step.startswith('SEARCH') and 'INDEX' in step, (table, details)
+            checked.add(table)
+    return checked
+
+
+@pytest.fixture
+def project(app):
+    project = Project(name='Indexes', project_number='IX1', category='Test')
+    db.session.add(project)
+    db.session.commit()
+    return project
+
+
+@pytest.mark.parametrize('model', [WorkerEntry, EquipmentEntry, MaterialEntry, SubcontractorEntry])
+@pytest.mark.parametrize('status', ['pending', None])
+def test_tab_loads_search_composite_index(app, project, model, status, count_queries):
+    with count_queries() as queries:
+        load_entries(model, project.id, date(2025, 1, 10), status=status)
+    assert _assert_entry_tables_use_index(queries) == {model.__tablename__}
+    if status:
+        plan = ' '.join(row[-1] for statement, parameters in _selects(queries)
+                        for row in db.session.connection().exec_driver_sql(
+                            'EXPLAIN QUERY PLAN ' + statement, parameters))
+        # project, date and status all bind to the composite index, and id
+        # order comes from it too (no temp b-tree sort)
+        assert f'ix_{model.__tablename__}_project_date_status' in plan
+        assert 'USE TEMP B-TREE' not in plan
+
+
+def test_daily_notes_list_searches_composite_index(client, project, count_queries):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['project_id'] = 'IX1'
+        sess['report_date'] = '2025-01-10'
+    with count_queries() as queries:
+        resp = client.get('/entries_daily_notes/list')
+    assert resp.status_code == 200
+    assert _assert_entry_tables_use_index(queries) == {'entries_daily_notes'}
+
+
+def test_exports_search_composite_index(app, project, count_queries):
+    with count_queries() as queries:
+        for entry_type in ENTRY_SOURCES:
+            list(iter_rows(entry_type, project.id, date(2025, 1, 1), date(2025, 1, 31)))
+    assert _assert_entry_tables_use_index(queries) == set(ENTRY_TABLES)
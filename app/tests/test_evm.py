@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models.core_models import Project, ActivityCode, ProjectTask
+from app.models.WorkerEntry_models import WorkerEntry
+from app.utils.evm import run_evm
+
+
+def _setup():
+    project = Project(name="EVM", project_number="EV1", category="Test", budget=10000.0)
+    activity = ActivityCode(code="EA1", description="desc")
+    other = ActivityCode(code="EA2", description="desc")
+    db.session.add_all([project, activity, other])
+    db.session.flush()
+    tasks = [
+        ProjectTask(project_id=project.id, name="Dig", activity_code_id=activity.id,
+                    start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+                    man_hour_budget=60, progress=50),
+        ProjectTask(project_id=project.id, name="Pour", activity_code_id=activity.id,
+                    start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+                    man_hour_budget=20, progress=0),
+        ProjectTask(project_id=project.id, name="Paint", activity_code_id=other.id,
+                    man_hour_budget=20, progress=0),
+    ]
+    db.session.add_all(tasks)
+    # 40 committed hours at 50/h on the shared activity code
+    db.session.add(WorkerEntry(project_id=project.id, date_of_report=date(2025, 1, 3), hours_worked=40,
+                               taux_horaire=50, activity_id=activity.id, status='committed'))
+    db.session.commit()
+    return project, tasks
+
+
+def test_evm_indices_for_a_project(app):
+    project, (dig, pour, paint) = _setup()
+    assert run_evm(as_of=date(2025, 1, 5)) == 3
+    db.session.commit()
+    for task in (dig, pour, paint):
+        db.session.refresh(task)
+
+    # BAC = 10000 * 60/100; actual 2000 split 3:1 between tasks on the code
+    assert dig.EV == pytest.approx(3000)
+    assert dig.PV == pytest.approx(3000)
+    assert dig.AC == pytest.approx(1500)
+    assert dig.man_hours == pytest.approx(30)
+    assert dig.CPI == pytest.approx(2.0)
+    assert dig.SPI == pytest.approx(1.0)
+    assert dig.EAC == pytest.approx(3000)
+    assert dig.VAC == pytest.approx(3000)
+    assert dig.TCPI == pytest.approx(3000 / 4500)
+    assert pour.AC == pytest.approx(500)
+    # No schedule and no actuals: undefined ratios stay NULL
+    assert paint.PV is None and paint.CPI is None
+    assert paint.EAC == pytest.approx(2000)
+
+
+def test_incremental_run_skips_unchanged_projects(app):
+    project, (dig, pour, paint) = _setup()
+    as_of = date(2025, 2, 1)  # after every task window
+    assert run_evm(as_of=as_of) == 3
+    db.session.commit()
+
+    assert run_evm(incremental=True, as_of=as_of) == 0
+
+    dig.progress = 100
+    db.session.commit()
+    assert run_evm(incremental=True, as_of=as_of) == 3
+    db.session.commit()
+    db.session.refresh(dig)
+    assert dig.EV == pytest.approx(6000)
+    assert run_evm(incremental=True, as_of=as_of) == 0
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+from datetime import date
+
+from app import db
+from app.models.core_models import Project
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.MaterialEntry import MaterialEntry
+from app.models.daily_models import DailyNoteEntry
+from app.models.EquipmentEntry_models import EquipmentEntry
+from app.models.workforce_models import Worker
+from app.models.equipment_models import Equipment
+from app.models.material_models import Material
+
+
+def _setup(client, app):
+    with app.app_context():
+        project = Project(name="Export", project_number="EX1", category="Test")
+        db.session.add(project)
+        db.session.flush()
+        db.session.add_all([
+            WorkerEntry(project_id=project.id, worker_name="Ann", hours_worked=8, taux_horaire=50,
+                        date_of_report=date(2025, 1, 10), status='committed'),
+            WorkerEntry(project_id=project.id, worker_name="Bob", hours_worked=4,
+                        date_of_report=date(2025, 1, 11), status='pending'),
+            WorkerEntry(project_id=project.id, worker_name="Cid", hours_worked=2,
+                        date_of_report=date(2025, 3, 1), status='committed'),
+            MaterialEntry(project_id=project.id, material_name="Sand", quantity_used=3, unit="t",
+                          date_of_report=date(2025, 1, 12), status='committed'),
+            DailyNoteEntry(project_id=project.id, content="Rain", author="Eve",
+                           date_of_report=date(2025, 1, 12), status='committed'),
+        ])
+        db.session.commit()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+
+
+def test_csv_export_streams_committed_rows_in_range(client, app):
+    _setup(client, app)
+    resp = client.get("/exports/entries?project_id=EX1&start=2025-01-01&end=2025-01-31")
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert 'entries_EX1_2025-01-01_2025-01-31.csv' in resp.headers['Content-Disposition']
+
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [(r['entry_type'], r['name']) for r in rows] == [
+        ('workers', 'Ann'), ('materials', 'Sand'), ('notes', 'Eve'),
+    ]
+    assert rows[0]['cost'] == '400.0'
+    assert rows[2]['description'] == 'Rain'
+
+
+def test_ndjson_export_filters_entry_types(client, app):
+    _setup(client, app)
+    resp = client.get("/exports/entries?project_id=EX1&start=2025-01-01&end=2025-12-31"
+                      "&format=ndjson&types=workers")
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [(l['name'], l['report_date']) for l in lines] == [('Ann', '2025-01-10'), ('Cid', '2025-03-01')]
+
+
+def test_xlsx_export_has_one_sheet_per_type(client, app):
+    from openpyxl import load_workbook
+
+    _setup(client, app)
+    resp = client.get("/exports/entries?project_id=EX1&start=2025-01-01&end=2025-12-31"
+                      "&format=xlsx&types=workers,materials")
+    assert resp.status_code == 200
+    workbook = load_workbook(io.BytesIO(resp.get_data()), read_only=True)
+    assert workbook.sheetnames == ['workers', 'materials']
+    workers = list(workbook['workers'].values)
+    assert workers[0][:3] == ('id', 'report_date', 'name')
+    assert [row[2] for row in workers[1:]] == ['Ann', 'Cid']
+
+
+def test_export_names_catalog_linked_entries(client, app):
+    _setup(client, app)
+    with app.app_context():
+        project = db.session.query(Project).filter_by(project_number="EX1").one()
+        worker = Worker(name="Dana", worker_id="W-EX1")
+        equipment = Equipment(name="Excavator")
+        material = Material(name="Gravel")
+        db.session.add_all([worker, equipment, material])
+        db.session.flush()
+        # Catalog picks leave the *_name columns empty
+        db.session.add_all([
+            WorkerEntry(project_id=project.id, worker_id=worker.id, hours_worked=8,
+                        date_of_report=date(2025, 2, 3), status='committed'),
+            EquipmentEntry(project_id=project.id, equipment_id=equipment.id, hours_used=5,
+                           date_of_report=date(2025, 2, 3), status='committed'),
+            MaterialEntry(project_id=project.id, material_id=material.id, quantity_used=2,
+                          date_of_report=date(2025, 2, 3), status='committed'),
+        ])
+        db.session.commit()
+    resp = client.get("/exports/entries?project_id=EX1&start=2025-02-01&end=2025-02-28")
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [(r['entry_type'], r['name']) for r in rows] == [
+        ('workers', 'Dana'), ('equipment', 'Excavator'), ('materials', 'Gravel'),
+    ]
+
+
+def test_export_rejects_bad_parameters(client, app):
+    _setup(client, app)
+    base = "/exports/entries?project_id=EX1"
+    assert client.get(base + "&start=2025-01-01").status_code == 400
+    assert client.get(base + "&start=2025-02-01&end=2025-01-01").status_code == 400
+    assert client.get(base + "&start=2025-01-01&end=2025-01-31&format=pdf").status_code == 400
+    assert client.get(base + "&start=2025-01-01&end=2025-01-31&types=pictures").status_code == 400
+    assert client.get("/exports/entries?project_id=NOPE&start=2025-01-01&end=2025-01-31").status_code == 404
@@ -44,4 +44,124 @@ def test_confirm_and_fetch_labor_equipment(client, app):
     )
     assert resp.status_code == 200
     data = resp.get_json()
-    assert len(data["workers"]) == 1
\ No newline at end of file
+    assert len(data["workers"]) == 1
+
+def test_pending_labor_equipment_constant_queries(client, app, count_queries):
+    from datetime import date
+    from app.models.core_models import PaymentItem
+    from app.models.workforce_models import Worker
+    from app.models.WorkerEntry_models import WorkerEntry
+
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    project, activity = setup_project_and_activity(app)
+
+    def add_rows(start, count):
+        with app.app_context():
+            for i in range(start, start + count):
+                worker = Worker(name=f"W{i}", worker_id=f"W{i}")
+                pi = PaymentItem(project_id=project.id, payment_code=f"PI{i}",
+                                 activity_code_id=activity.id, item_name=f"Item {i}")
+                db.session.add_all([worker, pi])
+                db.session.flush()
+                db.session.add(WorkerEntry(
+                    project_id=project.id, worker_id=worker.id, date_of_report=date(2025, 3, 4),
+                    hours_worked=8, activity_id=activity.id, payment_item_id=pi.id, status='pending',
+                ))
+            db.session.commit()
+
+    def fetch():
+        resp = client.get(
+            "/labor-equipment/by-project-date",
+            query_string={"project_id": project.project_number, "date": "2025-03-04"},
+        )
+        assert resp.status_code == 200
+        return resp.get_json()
+
+    add_rows(0, 2)
+    fetch()  # warm the project resolver cache
+    with count_queries() as small:
+        fetch()
+    add_rows(2, 20)
+    with count_queries() as large:
+        fetch()
+
+    assert len(small) == len(large)
+    data = fetch()
+    assert len(data["workers"]) == 22
+    assert data["workers"][0]["payment_item_code"] == "PI0"
+    assert data["workers"][0]["worker_name"] == "W0"
+
+
+def test_confirm_labor_equipment_is_set_based(client, app, count_queries):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    project, activity = setup_project_and_activity(app)
+
+    def payload(n):
+        return {
+            "project_id": project.project_number,
+            "date_of_report": "2025-03-05",
+            "usage": [
+                {
+                    "employee_id": None,
+                    "equipment_id": None,
+                    "hours": 4,
+                    "activity_code_id": activity.id,
+                    "is_manual": True,
+                    "manual_name": f"Line {i}",
+                    "manual_type": "worker" if i % 2 else "equipment",
+                }
+                for i in range(n)
+            ],
+        }
+
+    results = {}
+
+    def post(n):
+        resp = client.post("/labor-equipment/confirm-labor-equipment", json=payload(n))
+        assert resp.status_code == 200
+        results[n] = resp.get_json()["records"]
+
+    post(1)  # warm the project resolver cache
+    with count_queries() as small:
+        post(2)
+    with count_queries() as large:
+        post(60)
+    assert len(small) == len(large)
+    assert len(results[60]) == 60
+
+    resp = client.get(
+        "/labor-equipment/by-project-date",
+        query_string={"project_id": project.project_number, "date": "2025-03-05"},
+    )
+    data = resp.get_json()
+    assert len(data["workers"]) == 31
+    assert len(data["equipment"]) == 32
+
+
+def test_confirm_labor_equipment_rejects_unknown_activity(client, app):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    project, activity = setup_project_and_activity(app)
+    payload = {
+        "project_id": project.project_number,
+        "date_of_report": "2025-03-05",
+        "usage": [
+            {"employee_id": None, "equipment_id": None, "hours": 1,
+             "activity_code_id": activity.id, "is_manual": True,
+             "manual_name": "Ok", "manual_type": "worker"},
+            {"employee_id": None, "equipment_id": None, "hours": 1,
+             "activity_code_id": 9999, "is_manual": True,
+             "manual_name": "Bad", "manual_type": "worker"},
+        ],
+    }
+    resp = client.post("/labor-equipment/confirm-labor-equipment", json=payload)
+    assert resp.status_code == 400
+    assert "9999" in resp.get_json()["error"]
+
+    resp = client.get(
+        "/labor-equipment/by-project-date",
+        query_string={"project_id": project.project_number, "date": "2025-03-05"},
+    )
+    assert resp.get_json()["workers"] == []
@@ -0,0 +1,73 @@
+from app import db
+from app.models.core_models import Project, ActivityCode, PaymentItem
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = 'admin'
+
+
+def _seed_payment_item(app, code="PI-1", name="Excavation"):
+    with app.app_context():
+        project = Project.query.first()
+        if project is None:
+            project = Project(name="Cache", project_number="MC1", category="Test")
+            db.session.add(project)
+        activity = ActivityCode.query.first()
+        if activity is None:
+            activity = ActivityCode(code="AC1", description="desc")
+            db.session.add(activity)
+        db.session.flush()
+        db.session.add(PaymentItem(project_id=project.id, activity_code_id=activity.id,
+                                   payment_code=code, item_name=name))
+        db.session.commit()
+
+
+def test_payment_items_etag_and_304_without_queries(client, app, count_queries):
+    _login(client)
+    _seed_payment_item(app)
+
+    first = client.get("/payment-items/list")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert [i["payment_code"] for i in first.get_json()["payment_items"]] == ["PI-1"]
+
+    with count_queries() as queries:
+        cached = client.get("/payment-items/list")
+    assert cached.status_code == 200
+    assert cached.headers["ETag"] == etag
+    assert queries == []
+
+    with count_queries() as queries:
+        not_modified = client.get("/payment-items/list", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+    assert queries == []
+
+
+def test_commit_bumps_version_and_changes_etag(client, app):
+    _login(client)
+    _seed_payment_item(app)
+    etag = client.get("/payment-items/list").headers["ETag"]
+
+    _seed_payment_item(app, code="PI-2", name="Backfill")
+
+    resp = client.get("/payment-items/list", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert len(resp.get_json()["payment_items"]) == 2
+
+
+def test_error_payload_is_not_cached(client, app):
+    _login(client)
+    assert client.get("/activity-codes/get_activity_codes").status_code == 404
+
+    with app.app_context():
+        db.session.add(ActivityCode(code="AC9", description="late"))
+        db.session.commit()
+
+    resp = client.get("/activity-codes/get_activity_codes")
+    assert resp.status_code == 200
+    assert resp.get_json()["activity_codes"][0]["code"] == "AC9"
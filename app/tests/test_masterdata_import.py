@@ -0,0 +1,75 @@
+from datetime import date
+
+from app import db
+from app.models import ActivityCode, Equipment, PaymentItem, Project, ProjectTask, Worker
+from app.utils.masterdata_import import import_masterdata
+
+
+def _write(folder, name, text, encoding='utf-8'):
+    (folder / name).write_bytes(text.encode(encoding))
+
+
+def test_import_normalises_resolves_and_upserts(app, tmp_path):
+    _write(tmp_path, 'projects.csv',
+           'id,name,project_number,category,status, budget ,risk_level,start_date,tags(mots-cles)\n'
+           '1,Tunnel,24-401,Civil,in_progress,"$4,200,000.00",High,2025-05-01,"civil, mtq"\n'
+           '2,Maison,25-101,Civil,in progress, $150.00 ,unknown,2025-05-01,\n'
+           '3,Sans numero,,Civil,,,,,\n', encoding='cp1252')
+    _write(tmp_path, 'activity_codes.csv',
+           'id,activity_code,description,unit,st_man-hours_per-unit\n'
+           '1,1313,Gestion de projet,hrs,1\n'
+           '2,31000,Excavations,m3,0.03\n')
+    _write(tmp_path, 'equipment.csv',
+           'id,equipment_id,name,serial_number,maintenance_status,hourly_rate\n'
+           '1,BU-06,Bouteur,S1,operational, $120.00 \n'
+           ',,,,, \n')
+    _write(tmp_path, 'workers.csv',
+           'id,worker_name,worker_id,courriel,taux_horaire,role\n'
+           '1,Joe,1234,joe@example.com, $75.00 ,employe\n'
+           '2,Serge,4567,joe@example.com,abc,foreman\n')
+    _write(tmp_path, 'project_tasks.csv',
+           'id,project_id,name,activity_code_id,status,man_hour_budget, PV(Planned value) \n'
+           '1,24-401,Gestion,1313,not started,1000,"$200,000.00"\n'
+           '2,24-401,Excavation,99999,not started,200,$1.00\n')
+    _write(tmp_path, 'payment_items.csv',
+           'id,project_id,payment_code,activity_code_id,task_id,item_name,rate_per_unit\n'
+           '1,24-401,1.01,1313,1,Mobilisation,25000\n'
+           '2,25-101,1.01,1313,1,Mobilisation,25000\n')
+
+    reports = {r.table: r for r in import_masterdata(str(tmp_path))}
+    db.session.commit()
+
+    assert reports['projects'].inserted == 2
+    assert reports['projects'].rejects == [(4, 'project_number is required')]
+    assert (3, "risk_level 'unknown' is not one of low, medium, high") in reports['projects'].warnings
+    tunnel = Project.query.filter_by(project_number='24-401').one()
+    assert tunnel.budget == 4200000.0
+    assert tunnel.risk_level == 'high'
+    assert tunnel.tags == ['civil', 'mtq']
+    assert tunnel.start_date == date(2025, 5, 1)
+    assert Project.query.filter_by(project_number='25-101').one().status == 'in_progress'
+
+    assert Equipment.query.one().hourly_rate == 120.0
+    joe, serge = Worker.query.order_by(Worker.worker_id).all()
+    assert (joe.role, joe.taux_horaire, joe.courriel) == ('worker', 75.0, 'joe@example.com')
+    assert serge.courriel is None and serge.taux_horaire is None
+
+    task = ProjectTask.query.one()
+    assert (task.status, task.PV) == ('not_started', 200000.0)
+    assert task.activity_code_id == ActivityCode.query.filter_by(code='1313').one().id
+    assert reports['project_tasks'].rejects == [(3, "unknown activity code '99999'")]
+
+    item = PaymentItem.query.one()
+    assert item.task_id == task.id
+    assert reports['payment_items'].rejects == [(3, 'duplicate payment_code in file')]
+
+    # A second run updates in place
+    _write(tmp_path, 'activity_codes.csv',
+           'id,activity_code,description,unit,st_man-hours_per-unit\n'
+           '1,1313,Gestion de projet et suivi,hrs,2\n')
+    reports = {r.table: r for r in import_masterdata(str(tmp_path), tables={'activity_codes'})}
+    db.session.commit()
+    assert (reports['activity_codes'].inserted, reports['activity_codes'].updated) == (0, 1)
+    code = ActivityCode.query.filter_by(code='1313').one()
+    assert (code.description, code.std_man_hours_per_unit) == ('Gestion de projet et suivi', 2.0)
+    assert ActivityCode.query.count() == 2
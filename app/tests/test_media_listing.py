@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.core_models import Project
+from app.models.daily_models import DailyPicture
+from app.models.models import Document
+
+
+def _setup(client):
+    project = Project(name='Media', project_number='MD1', category='Test')
+    db.session.add(project)
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['project_id'] = 'MD1'
+    base = datetime(2025, 5, 1, 8, 0)
+    for i in range(5):
+        db.session.add(DailyPicture(project_id=project.id, file_name=f'p{i}.jpg',
+                                    file_url=f'uploads/p{i}.jpg', status='committed',
+                                    uploaded_at=base + timedelta(hours=2 * i)))
+        db.session.add(Document(project_id=project.id, file_name=f'd{i}.pdf',
+                                file_url=f'uploads/d{i}.pdf', status='pending',
+                                document_type='general',
+                                uploaded_at=base + timedelta(hours=2 * i + 1)))
+    # Same timestamp as p4: ties are broken by id
+    db.session.add(DailyPicture(project_id=project.id, file_name='p5.jpg', file_url='uploads/p5.jpg',
+                                status='committed', uploaded_at=base + timedelta(hours=8)))
+    db.session.commit()
+    return project
+
+
+def _walk(client, url):
+    names, cursor, pages = [], None, 0
+    while True:
+        resp = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert resp.status_code == 200
+        data = resp.get_json()
+        key = 'media' if 'media' in data else 'pictures'
+        names += [m['filename'] for m in data[key]]
+        pages += 1
+        cursor = data['next_cursor']
+        if not cursor:
+            return names, pages
+
+
+def test_media_list_pages_both_tables_newest_first(client, app):
+    _setup(client)
+    names, pages = _walk(client, '/media/media/list?limit=4')
+    assert names == ['d4.pdf', 'p5.jpg', 'p4.jpg', 'd3.pdf', 'p3.jpg', 'd2.pdf',
+                     'p2.jpg', 'd1.pdf', 'p1.jpg', 'd0.pdf', 'p0.jpg']
+    assert pages == 3
+
+    names, _ = _walk(client, '/media/media/list?limit=3&status=pending')
+    assert names == ['d4.pdf', 'd3.pdf', 'd2.pdf', 'd1.pdf', 'd0.pdf']
+
+    media = client.get('/media/media/list?type=document&limit=1').get_json()['media']
+    assert media[0]['type'] == 'pdf'
+    assert media[0]['url'].startswith('/documents/files/')
+
+    assert client.get('/media/media/list?cursor=not-a-cursor').status_code == 400
+    assert client.get('/media/media/list?limit=0').status_code == 400
+
+
+def test_pictures_list_filters_by_date(client, app):
+    project = _setup(client)
+    db.session.add(DailyPicture(project_id=project.id, file_name='next-day.jpg',
+                                file_url='uploads/n.jpg', status='committed',
+                                uploaded_at=datetime(2025, 5, 2, 9, 0)))
+    db.session.commit()
+
+    names, pages = _walk(client, '/pictures/pictures/list?date=2025-05-01&limit=2')
+    assert names == ['p5.jpg', 'p4.jpg', 'p3.jpg', 'p2.jpg', 'p1.jpg', 'p0.jpg']
+    assert pages == 3
+
+    pictures = client.get('/pictures/pictures/list?start=2025-05-02').get_json()['pictures']
+    assert [p['filename'] for p in pictures] == ['next-day.jpg']
+    assert pictures[0]['thumbnail_url'].endswith('/thumb')
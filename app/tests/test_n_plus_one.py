@@ -0,0 +1,107 @@
+import datetime
+import logging
+
+import pytest
+from flask import jsonify
+
+from app import db
+from app.models.core_models import Project, ActivityCode
+from app.models.equipment_models import Equipment
+from app.models.subcontractor_models import Subcontractor
+from app.models.workforce_models import Worker
+from app.models.SubcontractorEntry import SubcontractorEntry
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.EquipmentEntry_models import EquipmentEntry
+from app.models.work_orders_models import WorkOrder
+from app.utils.n_plus_one import RepeatedQueryError, allow_repeats, fingerprint
+
+REPORT_DATE = datetime.date(2025, 3, 4)
+ROWS = 8  # above the default threshold of 5
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = 'manager'
+
+
+def _seed():
+    project = Project(name='N1', project_number='NP1', category='Test')
+    db.session.add(project)
+    db.session.flush()
+    for i in range(ROWS):
+        activity = ActivityCode(code=f'AC{i}', description='desc')
+        sub = Subcontractor(name=f'Sub{i}', project=project)
+        worker = Worker(name=f'W{i}', worker_id=f'W{i}', project_id=project.id)
+        equipment = Equipment(name=f'E{i}')
+        db.session.add_all([activity, sub, worker, equipment])
+        db.session.flush()
+        db.session.add_all([
+            SubcontractorEntry(project_id=project.id, subcontractor_id=sub.id,
+                               activity_code_id=activity.id, date=REPORT_DATE, status='pending'),
+            WorkerEntry(project_id=project.id, worker_id=worker.id, activity_id=activity.id,
+                        date_of_report=REPORT_DATE, status='pending'),
+            EquipmentEntry(project_id=project.id, equipment_id=equipment.id,
+                           activity_id=activity.id, date_of_report=REPORT_DATE, status='pending'),
+            WorkOrder(project_id=project.id, sequential_number=f'WO{i}', description='wo',
+                      type='change_order', subcontractor_id=sub.id, activity_code_id=activity.id),
+        ])
+    db.session.commit()
+    db.session.expunge_all()
+    return project
+
+
+def _lazy_subcontractor_names():
+    entries = SubcontractorEntry.query.all()
+    return jsonify(names=[e.subcontractor.name for e in entries])
+
+
+def test_fingerprint_folds_parameters_and_in_lists():
+    assert fingerprint('SELECT a\n  FROM t WHERE id IN (?, ?, ?)') == 'SELECT a FROM t WHERE id IN (?)'
+    assert (fingerprint('SELECT a FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)')
+            == 'SELECT a FROM t WHERE id IN (?)')
+
+
+@pytest.mark.parametrize('url', [
+    '/subcontractors/by-project-date?project_number=NP1&date=2025-03-04',
+    '/labor-equipment/by-project-date?project_id=NP1&date=2025-03-04',
+    '/work-orders/list',
+])
+def test_list_endpoints_do_not_repeat_queries(client, app, url):
+    _seed()
+    _login(client)
+    resp = client.get(url)
+    assert resp.status_code == 200
+    data = resp.get_json()
+    rows = sum(len(v) for v in data.values() if isinstance(v, list))
+    assert rows >= ROWS
+
+
+def test_lazy_loading_in_a_loop_raises(client, app):
+    app.add_url_rule('/_n_plus_one', view_func=_lazy_subcontractor_names)
+    _seed()
+    _login(client)
+    with pytest.raises(RepeatedQueryError, match='subcontractors'):
+        client.get('/_n_plus_one')
+
+
+def test_warn_mode_logs_and_allow_repeats_opts_out(client, app, caplog):
+    def paused():
+        with allow_repeats():
+            return _lazy_subcontractor_names()
+
+    app.add_url_rule('/_n_plus_one', view_func=_lazy_subcontractor_names)
+    app.add_url_rule('/_n_plus_one_allowed', view_func=paused)
+    app.config['N_PLUS_ONE_MODE'] = 'warn'
+    _seed()
+    _login(client)
+
+    with caplog.at_level(logging.WARNING):
+        assert client.get('/_n_plus_one').status_code == 200
+    assert 'Possible N+1 queries' in caplog.text
+
+    caplog.clear()
+    app.config['N_PLUS_ONE_MODE'] = 'raise'
+    with caplog.at_level(logging.WARNING):
+        assert client.get('/_n_plus_one_allowed').status_code == 200
+    assert 'Possible N+1 queries' not in caplog.text
@@ -0,0 +1,57 @@
+import io
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+from PIL import ExifTags, Image
+
+from app import db
+from app.models.core_models import Project
+from app.models.daily_models import DailyPicture
+
+
+def _jpeg_with_exif(gps=True):
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = 'Apple'
+    exif[ExifTags.Base.Model] = 'iPhone 12'
+    exif[ExifTags.IFD.Exif] = {ExifTags.Base.DateTimeOriginal: '2025:05:03 07:45:10'}
+    if gps:
+        exif[ExifTags.IFD.GPSInfo] = {
+            ExifTags.GPS.GPSLatitudeRef: 'N',
+            ExifTags.GPS.GPSLatitude: (45.0, 30.0, 36.0),
+            ExifTags.GPS.GPSLongitudeRef: 'W',
+            ExifTags.GPS.GPSLongitude: (73.0, 34.0, 12.0),
+        }
+    buf = io.BytesIO()
+    Image.new('RGB', (64, 48), 'gray').save(buf, format='JPEG', exif=exif)
+    return buf.getvalue()
+
+
+def test_upload_fills_empty_metadata_columns(client, app):
+    with TemporaryDirectory() as tmp_dir:
+        with client.session_transaction() as sess:
+            sess['user_id'] = 1
+        project = Project(name='Exif', project_number='EX1', category='Test')
+        db.session.add(project)
+        db.session.commit()
+        app.config['UPLOAD_FOLDER'] = tmp_dir
+
+        resp = client.post('/media/upload', content_type='multipart/form-data', data={
+            'project_id': project.id,
+            'files': [(io.BytesIO(_jpeg_with_exif()), 'gps.jpg'),
+                      (io.BytesIO(_jpeg_with_exif(gps=False)), 'no_gps.jpg'),
+                      (io.BytesIO(b'\xff\xd8not really a jpeg'), 'broken.jpg')],
+        })
+        assert resp.status_code == 201
+
+        db.session.expire_all()
+        tagged, no_gps, broken = DailyPicture.query.order_by(DailyPicture.id).all()
+        assert tagged.taken_at == datetime(2025, 5, 3, 7, 45, 10)
+        assert tagged.coordinates['latitude'] == 45.51
+        assert tagged.coordinates['longitude'] == -73.57
+        assert tagged.captured_by == 'Apple iPhone 12'
+        assert tagged.size > 0
+        assert broken.taken_at is None and broken.coordinates is None
+
+        # Written back, but without GPS the column must stay SQL NULL (not JSON 'null')
+        assert no_gps.captured_by == 'Apple iPhone 12'
+        assert DailyPicture.query.filter(DailyPicture.coordinates.is_(None)).count() == 2
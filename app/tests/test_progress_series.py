@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models.core_models import Project
+from app.models.project_progress import ProjectProgress
+from app.models.WorkerEntry_models import WorkerEntry
+from app.utils.progress_series import record_snapshot, rebuild_progress_series
+
+
+def _setup(client, app):
+    project = Project(name="Progress", project_number="PS1", category="Test")
+    db.session.add(project)
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['project_id'] = "PS1"
+    return project
+
+
+def _commit_hours(project, day, hours, rate=10):
+    db.session.add(WorkerEntry(project_id=project.id, date_of_report=day, hours_worked=hours,
+                               taux_horaire=rate, status='committed'))
+    db.session.commit()
+
+
+def _cumulative_hours(project):
+    rows = db.session.execute(
+        db.select(ProjectProgress.report_date, ProjectProgress.actual_hours,
+                  ProjectProgress.cumulative_actual_hours)
+        .where(ProjectProgress.project_id == project.id)
+        .order_by(ProjectProgress.report_date)
+    ).all()
+    return [(d.day, h, c) for d, h, c in rows]
+
+
+def test_committing_a_past_day_shifts_later_running_totals(client, app):
+    project = _setup(client, app)
+    _commit_hours(project, date(2025, 5, 1), 8)
+    _commit_hours(project, date(2025, 5, 5), 4)
+    _commit_hours(project, date(2025, 5, 3), 2)
+    assert _cumulative_hours(project) == [(1, 8, 8), (3, 2, 10), (5, 4, 14)]
+
+    # Rejecting a committed entry takes its hours back out
+    entry = WorkerEntry.query.filter_by(project_id=project.id, date_of_report=date(2025, 5, 3)).one()
+    entry.status = 'rejected'
+    db.session.commit()
+    assert _cumulative_hours(project) == [(1, 8, 8), (3, 0, 8), (5, 4, 12)]
+
+
+def test_snapshots_keep_later_values_and_rebuild_is_consistent(client, app):
+    project = _setup(client, app)
+    _commit_hours(project, date(2025, 5, 1), 8)
+    _commit_hours(project, date(2025, 5, 5), 4)
+    record_snapshot(db.session, project.id, date(2025, 5, 5), earned_value=100.0)
+    record_snapshot(db.session, project.id, date(2025, 5, 2), earned_value=40.0)
+    db.session.commit()
+
+    points = {p['date']: p for p in client.get(
+        "/progress/s-curve?start=2025-05-01&end=2025-05-31").get_json()['points']}
+    assert points['2025-05-02']['cumulative_earned_value'] == 40
+    assert points['2025-05-05']['cumulative_earned_value'] == 100
+    assert points['2025-05-05']['cumulative_cost'] == 120
+    assert points['2025-05-05']['cpi'] == pytest.approx(100 / 120)
+
+    before = _cumulative_hours(project)
+    db.session.execute(db.update(ProjectProgress).values(cumulative_actual_hours=0))
+    assert rebuild_progress_series(project.id) == 3
+    db.session.commit()
+    assert _cumulative_hours(project) == before
+
+
+def test_trend_reports_changes_per_bucket(client, app):
+    project = _setup(client, app)
+    _commit_hours(project, date(2025, 4, 30), 5)
+    _commit_hours(project, date(2025, 5, 1), 8)
+    _commit_hours(project, date(2025, 5, 20), 4)
+    _commit_hours(project, date(2025, 6, 2), 1)
+
+    resp = client.get("/progress/trend?start=2025-05-01&end=2025-06-30&bucket=month")
+    periods = resp.get_json()['periods']
+    assert [(p['period'], p['actual_hours']) for p in periods] == [('2025-05-01', 12), ('2025-06-01', 1)]
+
+    assert client.get("/progress/trend?start=2025-05-01&end=2025-06-30&bucket=year").status_code == 400
+    assert client.get("/progress/s-curve?start=2025-05-01").status_code == 400
@@ -0,0 +1,48 @@
+from app import db
+from app.models.core_models import Project
+from app.utils.project_resolver import project_by_number, resolve_project
+
+
+def test_warm_cache_needs_no_query(app, count_queries):
+    with app.app_context():
+        project = Project(name="Cached", project_number="24-401", category="Test")
+        db.session.add(project)
+        db.session.commit()
+
+        with count_queries() as cold:
+            first = project_by_number("24-401")
+        with count_queries() as warm:
+            second = project_by_number("24-401")
+        with count_queries() as warm_id:
+            by_id = resolve_project(str(project.id))
+
+        assert len(cold) == 1
+        assert warm == []
+        assert warm_id == []
+        assert first == second == by_id
+        assert first.id == project.id
+
+
+def test_commit_on_project_invalidates_cache(app):
+    with app.app_context():
+        project = Project(name="Old", project_number="24-404", category="Test")
+        db.session.add(project)
+        db.session.commit()
+        assert project_by_number("24-404").name == "Old"
+
+        project.name = "New"
+        db.session.commit()
+        assert project_by_number("24-404").name == "New"
+
+        project.project_number = "24-405"
+        db.session.commit()
+        assert project_by_number("24-404") is None
+        assert resolve_project("24-405").id == project.id
+
+
+def test_resolve_project_unknown_values(app):
+    with app.app_context():
+        assert resolve_project(None) is None
+        assert resolve_project("") is None
+        assert resolve_project("999") is None
+        assert resolve_project("NOPE") is None
@@ -0,0 +1,185 @@
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models.report_draft import ReportDraft
+from app.utils import report_drafts
+from app.utils.report_drafts import DraftKey, StaleDraftRevision
+
+
+def _select_day(client, day="2025-03-04", project="RD1"):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 7
+        sess['project_id'] = project
+    resp = client.post("/data-entry/initialize-day", json={"dateStamp": day})
+    assert resp.status_code == 200
+
+
+def test_initialize_day_creates_tab_drafts_not_session_data(client, app):
+    _select_day(client)
+    _select_day(client)  # idempotent
+
+    with app.app_context():
+        drafts = ReportDraft.query.filter_by(user_id='7', report_date=date(2025, 3, 4)).all()
+        assert len(drafts) == 7
+        assert {d.status for d in drafts} == {'incomplete'}
+        assert {d.project_number for d in drafts} == {'RD1'}
+
+    with client.session_transaction() as sess:
+        assert 'daily_data' not in sess
+
+
+def test_save_draft_is_a_partial_upsert(client, app):
+    _select_day(client)
+    client.post("/update-progress/update-progress", json={"tab": "Materials"})
+
+    resp = client.post("/data-entry/save_draft", json={"tab": "Materials", "entries": [{"q": 1}]})
+    assert resp.status_code == 200
+    resp = client.post("/data-entry/save_draft", json={"tab": "Materials", "entries": [{"q": 1}, {"q": 2}]})
+    assert resp.get_json()["entries"] == 2
+
+    with app.app_context():
+        draft = ReportDraft.query.filter_by(user_id='7', tab='Materials').one()
+        assert draft.entries == [{"q": 1}, {"q": 2}]
+        # Saving entries leaves the tab status written earlier untouched
+        assert draft.status == 'completed'
+
+
+def test_days_status_and_progress_come_from_drafts(client, app):
+    _select_day(client, "2025-03-04")
+    for tab in ['Workers', 'Materials', 'Equipment', 'Subcontractors', 'DailyNoteEntry', 'WorkOrders', 'Pictures']:
+        client.post("/update-progress/update-progress", json={"tab": tab})
+    _select_day(client, "2025-03-05")
+    client.post("/update-progress/update-progress", json={"tab": "Workers"})
+
+    days = client.get("/data-entry/days-status").get_json()
+    assert days == {"completedDays": ["2025-03-04"], "incompleteDays": ["2025-03-05"]}
+
+    progress = client.get("/update-progress/get-progress").get_json()
+    assert progress["completedTabs"] == ["Workers"]
+    assert client.get("/update-progress/check-all-tabs-completed").get_json() == {"allTabsCompleted": False}
+
+
+def test_legacy_session_drafts_are_moved_to_the_table(client, app):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 7
+        sess['project_id'] = "RD1"
+        sess['role'] = 'admin'
+        sess['report_date'] = "2025-03-06"
+        sess['daily_data'] = {
+            "2025-03-06": {
+                "tab_statuses": {"workers": "completed"},
+                "entries": {"workers": [{"workerName": "Ann", "laborHours": 8, "activityCode": "A1"}]},
+            }
+        }
+
+    workers = client.get("/workers/session-list").get_json()["workers"]
+    assert workers[0]["workerName"] == "Ann"
+
+    with client.session_transaction() as sess:
+        assert 'daily_data' not in sess
+    with app.app_context():
+        draft = ReportDraft.query.filter_by(user_id='7', tab='workers').one()
+        assert draft.status == 'completed'
+
+
+def test_save_draft_applies_json_patch_against_revision(client, app):
+    _select_day(client)
+    resp = client.post("/data-entry/save_draft", json={"tab": "Materials", "entries": [{"q": 1}, {"q": 2}]})
+    assert resp.get_json()["revision"] == 1
+
+    resp = client.post("/data-entry/save_draft", json={
+        "tab": "Materials",
+        "base_revision": 1,
+        "patch": [
+            {"op": "replace", "path": "/0/q", "value": 10},
+            {"op": "add", "path": "/-", "value": {"q": 3}},
+        ],
+    })
+    assert resp.status_code == 200
+    assert resp.get_json() == {"message": "Draft saved", "entries": 3, "revision": 2}
+
+    draft = client.get("/data-entry/draft?tab=Materials").get_json()
+    assert draft["entries"] == [{"q": 10}, {"q": 2}, {"q": 3}]
+    assert draft["revision"] == 2
+
+
+def test_save_draft_rejects_stale_revision_and_accepts_snapshot(client, app):
+    _select_day(client)
+    client.post("/data-entry/save_draft", json={"tab": "Materials", "entries": [{"q": 1}]})
+    client.post("/data-entry/save_draft", json={"tab": "Materials", "base_revision": 1,
+                                                "patch": [{"op": "remove", "path": "/0"}]})
+
+    stale = client.post("/data-entry/save_draft", json={"tab": "Materials", "base_revision": 1,
+                                                        "patch": [{"op": "add", "path": "/-", "value": {}}]})
+    assert stale.status_code == 409
+    assert stale.get_json()["revision"] == 2
+
+    snapshot = client.post("/data-entry/save_draft", json={"tab": "Materials", "entries": [{"q": 5}]})
+    assert snapshot.get_json()["revision"] == 3
+    assert client.get("/data-entry/draft?tab=Materials").get_json()["entries"] == [{"q": 5}]
+
+
+def test_concurrent_saves_on_one_revision_only_let_one_win(app, monkeypatch):
+    key = DraftKey('7', 'RD1', date(2025, 3, 4))
+    with app.app_context():
+        # Two first patches: the loser read "no draft" before the winner inserted
+        assert report_drafts.patch_entries(key, 'Materials', 0, [{"op": "add", "path": "/-", "value": {"q": 1}}])[0] == 1
+        with monkeypatch.context() as m:
+            m.setattr(report_drafts, 'get_tab', lambda *args: None)
+            with pytest.raises(StaleDraftRevision) as exc:
+                report_drafts.patch_entries(key, 'Materials', 0, [{"op": "add", "path": "/-", "value": {"q": 2}}])
+        assert exc.value.current_revision == 1
+
+        # Two snapshots on the same base revision
+        assert report_drafts.save_snapshot(key, 'Materials', [{"q": 3}], base_revision=1) == 2
+        with pytest.raises(StaleDraftRevision) as exc:
+            report_drafts.save_snapshot(key, 'Materials', [{"q": 4}], base_revision=1)
+        assert exc.value.current_revision == 2
+        with pytest.raises(StaleDraftRevision):
+            report_drafts.save_snapshot(key, 'Workers', [{"q": 5}], base_revision=3)
+        db.session.commit()
+
+        assert report_drafts.tab_entries(key, 'Materials') == [{"q": 3}]
+        assert report_drafts.get_tab(key, 'Workers') is None
+
+
+def test_save_draft_rejects_invalid_patch_without_writing(client, app):
+    _select_day(client)
+    client.post("/data-entry/save_draft", json={"tab": "Materials", "entries": [{"q": 1}]})
+
+    resp = client.post("/data-entry/save_draft", json={
+        "tab": "Materials", "base_revision": 1,
+        "patch": [{"op": "add", "path": "/-", "value": {"q": 2}},
+                  {"op": "test", "path": "/0/q", "value": 99}],
+    })
+    assert resp.status_code == 400
+    draft = client.get("/data-entry/draft?tab=Materials").get_json()
+    assert draft == {**draft, "entries": [{"q": 1}], "revision": 1}
+
+
+def test_json_patch_operations():
+    from app.utils.json_patch import apply_patch, JsonPatchError
+    import pytest
+
+    doc = {"a/b": [1, 2], "m~n": {"x": 1}}
+    patched = apply_patch(doc, [
+        {"op": "add", "path": "/a~1b/1", "value": 9},
+        {"op": "copy", "from": "/m~0n/x", "path": "/c"},
+        {"op": "move", "from": "/c", "path": "/d"},
+        {"op": "test", "path": "/d", "value": 1},
+        {"op": "replace", "path": "/m~0n", "value": None},
+    ])
+    assert patched == {"a/b": [1, 9, 2], "m~n": None, "d": 1}
+    assert doc == {"a/b": [1, 2], "m~n": {"x": 1}}
+
+    for bad in (
+        [{"op": "remove", "path": "/missing"}],
+        [{"op": "replace", "path": "/a~1b/5", "value": 0}],
+        [{"op": "add", "path": "/a~1b/01", "value": 0}],
+        [{"op": "bogus", "path": ""}],
+        {"op": "add"},
+    ):
+        with pytest.raises(JsonPatchError):
+            apply_patch(doc, bad)
@@ -0,0 +1,53 @@
+import re
+
+from app.models.core_models import Project
+from app import db
+from app.utils import request_metrics
+
+
+def _login(client, role):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = role
+
+
+def test_requests_are_timed_and_exposed(client, app):
+    request_metrics.reset()
+    db.session.add(Project(name='Metrics', project_number='MT1', category='Test'))
+    db.session.commit()
+    _login(client, 'admin')
+
+    for _ in range(3):
+        resp = client.get('/projects/list')
+        assert resp.status_code == 200
+    header = resp.headers['Server-Timing']
+    match = re.fullmatch(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries"', header)
+    assert match and int(match.group(1)) >= 1
+
+    stats = request_metrics.snapshot()['projects_bp.get_project_numbers']
+    assert stats['count'] == 3
+    assert stats['sql_count'][0.5] >= 1
+    assert stats['duration'][0.99] >= stats['duration'][0.5] > 0
+
+    resp = client.get('/admin/metrics')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/plain'
+    body = resp.get_data(as_text=True)
+    assert '# TYPE tcc_request_duration_seconds summary' in body
+    assert ('tcc_request_sql_queries_count{endpoint="projects_bp.get_project_numbers"} 3'
+            in body)
+    assert re.search(r'tcc_request_duration_seconds\{endpoint="projects_bp\.get_project_numbers",'
+                     r'quantile="0\.95"\} \S+', body)
+
+
+def test_metrics_are_admin_only(client):
+    _login(client, 'manager')
+    assert client.get('/admin/metrics').status_code == 403
+
+
+def test_quantile_nearest_rank():
+    values = list(range(1, 101))
+    assert request_metrics.quantile(values, 0.5) == 50
+    assert request_metrics.quantile(values, 0.95) == 95
+    assert request_metrics.quantile(values, 0.99) == 99
+    assert request_metrics.quantile([], 0.5) is None
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+# Cumulative import time allowed for ``from app import create_app;
+# create_app()`` in a fresh interpreter; override for slow CI machines.
+IMPORT_BUDGET_MS = int(os.getenv('CREATE_APP_IMPORT_BUDGET_MS', '2000'))
+
+# Loaded on first use by the routes/commands that need them
+DEFERRED_MODULES = ('pandas', 'numpy', 'openpyxl', 'requests', 'PIL')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _importtime():
+    env = {**os.environ, 'FLASK_ENV': 'testing'}
+    env.pop('PYTEST_CURRENT_TEST', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         "from app import create_app; create_app('testing')"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports have a single space of indentation
+        modules[name.strip()] = (int(cumulative), not name[1:].startswith(' '))
+    return modules
+
+
+def test_create_app_cold_start_within_budget():
+    modules = _importtime()
+    eager = set(modules) & set(DEFERRED_MODULES)
+    assert not eager, f"imported at startup: {sorted(eager)}"
+    total_ms = sum(us for us, top_level in modules.values() if top_level) / 1000
+    assert total_ms < IMPORT_BUDGET_MS, f"create_app imports took {total_ms:.0f} ms"
@@ -88,3 +88,28 @@ def test_confirm_entries_with_manual_name(client, app):
     entries = resp.get_json()['entries']
     assert len(entries) == 1
     assert entries[0]['subcontractor_name'] == 'ManualSub'
+
+
+def test_confirm_entries_reuses_manual_subcontractor(client, app):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = 'manager'
+    project, activity, sub = setup_project_and_sub(app)
+    payload = {
+        "project_number": project.project_number,
+        "date": "2025-03-04",
+        "usage": [
+            {"subcontractor_id": None, "manual_name": "Sub1", "hours": 2, "activity_code_id": activity.id},
+            {"subcontractor_id": None, "manual_name": "NewSub", "hours": 3, "activity_code_id": activity.id},
+            {"subcontractor_id": None, "manual_name": "NewSub", "hours": 4, "activity_code_id": activity.id},
+        ]
+    }
+    resp = client.post('/subcontractors/confirm-entries', json=payload)
+    assert resp.status_code == 200
+    assert len(resp.get_json()['records']) == 3
+
+    with app.app_context():
+        assert Subcontractor.query.filter_by(project_id=project.id).count() == 2
+        entries = SubcontractorEntry.query.order_by(SubcontractorEntry.id).all()
+        assert entries[0].subcontractor_id == sub.id
+        assert entries[1].subcontractor_id == entries[2].subcontractor_id != sub.id
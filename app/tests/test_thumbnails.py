@@ -0,0 +1,57 @@
+import io
+import os
+from tempfile import TemporaryDirectory
+
+from PIL import Image
+
+from app import db
+from app.models.core_models import Project
+from app.models.daily_models import DailyPicture
+from app.utils.thumbnails import rendition_path, source_path
+
+
+def _jpeg(width=1600, height=1200):
+    buf = io.BytesIO()
+    Image.radial_gradient('L').resize((width, height)).convert('RGB').save(buf, format='JPEG')
+    return buf.getvalue()
+
+
+def test_upload_renders_webp_thumbnails(client, app):
+    with TemporaryDirectory() as tmp_dir:
+        with client.session_transaction() as sess:
+            sess['user_id'] = 1
+        project = Project(name='Thumbs', project_number='TH1', category='Test')
+        db.session.add(project)
+        db.session.commit()
+        app.config['UPLOAD_FOLDER'] = tmp_dir
+
+        photo = _jpeg()
+        resp = client.post('/media/upload', content_type='multipart/form-data', data={
+            'project_id': project.id,
+            'files': (io.BytesIO(photo), 'site.jpg'),
+        })
+        assert resp.status_code == 201
+        picture = DailyPicture.query.one()
+
+        # Rendered on commit (THUMBNAIL_WORKERS = 0 in testing)
+        source = source_path(picture)
+        assert os.path.exists(rendition_path(source, 'thumb'))
+        assert os.path.exists(rendition_path(source, 'medium'))
+
+        resp = client.get(f'/media/thumb/{picture.id}/thumb')
+        assert resp.status_code == 200
+        assert resp.mimetype == 'image/webp'
+        with Image.open(io.BytesIO(resp.data)) as thumb:
+            assert thumb.format == 'WEBP'
+            assert thumb.size == (256, 192)
+        assert len(resp.data) < len(photo) / 10
+
+        # Missing renditions are rebuilt on request
+        os.remove(rendition_path(source, 'medium'))
+        resp = client.get(f'/media/thumb/{picture.id}/medium')
+        assert resp.status_code == 200
+        with Image.open(io.BytesIO(resp.data)) as medium:
+            assert medium.size == (1024, 768)
+
+        assert client.get(f'/media/thumb/{picture.id}/huge').status_code == 400
+        assert client.get('/media/thumb/999/thumb').status_code == 404
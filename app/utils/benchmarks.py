@@ -0,0 +1,297 @@
+"""Endpoint benchmarks over synthetic data.
+
+:func:`run_benchmarks` drives the hot endpoints through the Flask test
+client against a database filled by :func:`app.utils.synthetic_data.generate`:
+- the calendar
+- bootstrap and the dropdown lists
+- the pending-entries GETs
+- the confirm batches
+- the notes list, the media list and the exports
+
+Each scenario runs ``repeat`` times after one warm-up request.  The results
+(min/median/p95/max wall time and the number of SQL statements, counted
+until a streamed body has been read) form a JSON document.  Save it as a baseline and
+diff a later run against it with :func:`compare`.
+
+GET scenarios run before the confirm batches, so they see the generated
+data only.  Every confirm request adds one batch of pending rows.
+"""
+
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timedelta
+from importlib.metadata import version
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+
+from .. import db
+from ..models import (ActivityCode, DailyReportStatus, Equipment, Material, PaymentItem, Project,
+                      Subcontractor, Worker)
+from .synthetic_data import PROJECT_PREFIX, project_number
+
+DEFAULT_REPEAT = 5
+# Median slowdown (as a fraction) reported as a regression by compare()
+DEFAULT_THRESHOLD = 0.25
+
+
+def _context(batch_size):
+    """Ids and dates the scenarios need, read back from the synthetic data."""
+    number = project_number(0)
+    project = db.session.scalar(select(Project).where(Project.project_number == number))
+    if project is None:
+        raise ValueError(f"No synthetic project {number}; run the generator first")
+    first, last = db.session.execute(
+        select(func.min(DailyReportStatus.report_date), func.max(DailyReportStatus.report_date))
+        .where(DailyReportStatus.project_id == project.id)).one()
+
+    def ids(model, *where):
+        return db.session.scalars(select(model.id).where(*where).order_by(model.id).limit(batch_size)).all()
+
+    return {
+        'project': number,
+        'project_id': project.id,
+        'first_day': first,
+        'pending_day': last,
+        'activities': ids(ActivityCode, ActivityCode.code.like(f'{PROJECT_PREFIX}-%')),
+        'workers': ids(Worker, Worker.worker_id.like(f'{PROJECT_PREFIX}-%')),
+        'equipment': ids(Equipment, Equipment.equipment_id.like(f'{PROJECT_PREFIX}-%')),
+        'materials': ids(Material, Material.material_id.like(f'{PROJECT_PREFIX}-%')),
+        'subcontractors': ids(Subcontractor, Subcontractor.project_id == project.id),
+        'payment_items': ids(PaymentItem, PaymentItem.project_id == project.id),
+        'batch_size': batch_size,
+    }
+
+
+def _pick(values, i):
+    return values[i % len(values)]
+
+
+def _labor_equipment_batch(ctx):
+    usage = []
+    for i in range(ctx['batch_size']):
+        worker = i % 2 == 0
+        usage.append({
+            'employee_id': _pick(ctx['workers'], i) if worker else None,
+            'equipment_id': None if worker else _pick(ctx['equipment'], i),
+            'hours': 8, 'activity_code_id': _pick(ctx['activities'], i),
+            'payment_item_id': _pick(ctx['payment_items'], i), 'cwp_id': None,
+        })
+    return {'project_id': ctx['project'], 'date_of_report': ctx['pending_day'].isoformat(), 'usage': usage}
+
+
+def _materials_batch(ctx):
+    return {'project_id': ctx['project'], 'date_of_report': ctx['pending_day'].isoformat(), 'usage': [
+        {'entityId': _pick(ctx['materials'], i), 'quantity': 3.5,
+         'activity_code_id': _pick(ctx['activities'], i)}
+        for i in range(ctx['batch_size'])
+    ]}
+
+
+def _subcontractors_batch(ctx):
+    return {'project_number': ctx['project'], 'date': ctx['pending_day'].isoformat(), 'usage': [
+        {'subcontractor_id': _pick(ctx['subcontractors'], i), 'num_employees': 4, 'hours': 8,
+         'activity_code_id': _pick(ctx['activities'], i)}
+        for i in range(ctx['batch_size'])
+    ]}
+
+
+def _notes_batch(ctx):
+    at = datetime.combine(ctx['pending_day'], datetime.min.time()) + timedelta(hours=15)
+    return {'notes': [
+        {'project_id': ctx['project_id'], 'content': f'Benchmark note {i}',
+         'note_datetime': (at + timedelta(minutes=i)).isoformat(),
+         'activity_code_id': _pick(ctx['activities'], i)}
+        for i in range(ctx['batch_size'])
+    ]}
+
+
+def _export(fmt):
+    def build(ctx):
+        return 'GET', (f"/exports/entries?project_id={ctx['project']}&start={ctx['first_day']}"
+                       f"&end={ctx['pending_day']}&format={fmt}"), None
+    return build
+
+
+def _get(path):
+    def build(ctx):
+        return 'GET', path.format(**ctx), None
+    return build
+
+
+def _post(path, payload):
+    def build(ctx):
+        return 'POST', path, payload(ctx)
+    return build
+
+
+# (name, request builder) in run order; builders return (method, url, json body)
+SCENARIOS = (
+    ('calendar_data', _get('/calendar/calendar-data?year={pending_day.year}&month={pending_day.month}')),
+    ('bootstrap', _get('/data-entry/bootstrap')),
+    ('dropdown_workers', _get('/workers/list')),
+    ('dropdown_equipment', _get('/equipment/list')),
+    ('dropdown_materials', _get('/materials/list')),
+    ('dropdown_activity_codes', _get('/activity-codes/get_activity_codes')),
+    ('dropdown_payment_items', _get('/payment-items/list')),
+    ('pending_labor_equipment', _get('/labor-equipment/by-project-date?project_id={project}&date={pending_day}')),
+    ('pending_materials', _get('/materials/by-project-date?project_id={project}&date={pending_day}')),
+    ('pending_subcontractors', _get('/subcontractors/by-project-date?project_number={project}&date={pending_day}')),
+    ('notes_list', _get('/entries_daily_notes/list')),
+    ('media_list', _get('/media/media/list?project_id={project}')),
+    ('export_csv', _export('csv')),
+    ('export_ndjson', _export('ndjson')),
+    ('confirm_labor_equipment', _post('/labor-equipment/confirm-labor-equipment', _labor_equipment_batch)),
+    ('confirm_materials', _post('/materials/confirm-materials', _materials_batch)),
+    ('confirm_subcontractors', _post('/subcontractors/confirm-entries', _subcontractors_batch)),
+    ('confirm_notes', _post('/entries_daily_notes/confirm', _notes_batch)),
+)
+
+
+def benchmark_app(database_uri):
+    """Create an app on ``database_uri`` with the schema created and the N+1 guard off."""
+    from .. import create_app
+    from ..config import TestingConfig
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        N_PLUS_ONE_MODE = 'off'
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def _timed(client, method, url, payload):
+    # Count statements ourselves: Server-Timing is written before a
+    # streamed body (the exports) runs its queries.
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(Engine, 'after_cursor_execute', count)
+    try:
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=payload)
+        response.get_data()  # drain streamed bodies (exports)
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        event.remove(Engine, 'after_cursor_execute', count)
+    return elapsed, response.status_code, statements
+
+
+def run_benchmarks(app, repeat=DEFAULT_REPEAT, batch_size=20, scenarios=None, meta=None):
+    """Run the scenarios against ``app``'s database; return the results document.
+
+    ``scenarios`` optionally limits the run to those names.  ``meta`` is
+    merged into the document's ``meta`` (e.g. the generator scale).
+    """
+    with app.app_context():
+        ctx = _context(batch_size)
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+        sess['role'] = 'admin'
+        sess['project_id'] = ctx['project']
+        sess['report_date'] = ctx['pending_day'].isoformat()
+
+    results = {}
+    for name, build in SCENARIOS:
+        if scenarios and name not in scenarios:
+            continue
+        method, url, payload = build(ctx)
+        _timed(client, method, url, payload)  # warm-up
+        timings, statuses, queries = [], set(), []
+        for _ in range(repeat):
+            elapsed, status, count = _timed(client, method, url, payload)
+            timings.append(elapsed)
+            statuses.add(status)
+            queries.append(count)
+        results[name] = {
+            'method': method,
+            'path': url.split('?')[0],
+            'status': sorted(statuses),
+            'runs': repeat,
+            'min_ms': round(min(timings), 3),
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(_percentile(timings, 0.95), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': max(queries),
+        }
+
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': platform.python_version(),
+            'flask': version('flask'),
+            'sqlalchemy': version('sqlalchemy'),
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'repeat': repeat,
+            'batch_size': batch_size,
+            **(meta or {}),
+        },
+        'scenarios': results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Diff two results documents scenario by scenario on the median time.
+
+    Returns a list of dicts with ``name``, ``baseline_ms``, ``current_ms``,
+    ``ratio``, the query counts of both sides and ``regression``
+    (``ratio > 1 + threshold`` or more queries than before).  Scenarios missing from either side get
+    ``None`` for that side.
+    """
+    old, new = baseline.get('scenarios', {}), current.get('scenarios', {})
+    rows = []
+    for name in list(old) + [n for n in new if n not in old]:
+        before, after = old.get(name), new.get(name)
+        base_ms = before['median_ms'] if before else None
+        cur_ms = after['median_ms'] if after else None
+        ratio = round(cur_ms / base_ms, 3) if base_ms and cur_ms is not None else None
+        more_queries = bool(before and after and before.get('queries') is not None
+                            and after.get('queries') is not None
+                            and after['queries'] > before['queries'])
+        rows.append({
+            'name': name,
+            'baseline_ms': base_ms,
+            'current_ms': cur_ms,
+            'ratio': ratio,
+            'baseline_queries': (before or {}).get('queries'),
+            'current_queries': (after or {}).get('queries'),
+            'regression': bool(ratio and ratio > 1 + threshold) or more_queries,
+        })
+    return rows
+
+
+def load_results(path):
+    """Read a results document written by :func:`save_results`."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    """Write ``results`` as indented JSON (stable key order, diff friendly)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True, default=str)
+        f.write('\n')
+
+
+__all__ = [
+    "SCENARIOS",
+    "benchmark_app",
+    "run_benchmarks",
+    "compare",
+    "load_results",
+    "save_results",
+]
@@ -0,0 +1,122 @@
+"""Content-addressed storage for uploaded files.
+
+Uploads are streamed through a SHA-256 hasher in fixed-size chunks into a
+temporary file inside ``UPLOAD_FOLDER`` and then moved to a sharded path
+derived from the digest::
+
+    <UPLOAD_FOLDER>/blobs/ab/cd/abcd1234…
+
+Two different files with the same name never collide, and re-uploading an
+identical file only adds another ``Document``/``DailyPicture`` row pointing
+at the blob that is already on disk.  Rows keep the original name in
+``file_name`` and the digest/size in ``sha256``/``file_size``.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from flask import current_app
+
+CHUNK_SIZE = 1024 * 1024
+BLOB_DIR = 'blobs'
+TMP_DIR = 'tmp'
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Result of storing one upload."""
+    sha256: str
+    size: int
+    path: str        # absolute path of the blob
+    created: bool    # False when an identical blob was already stored
+
+    @property
+    def file_url(self):
+        """Path relative to the app root, as stored in ``file_url`` columns."""
+        return os.path.relpath(self.path, start=current_app.root_path)
+
+    @property
+    def upload_path(self):
+        """Path relative to ``UPLOAD_FOLDER`` (what ``/documents/files/`` serves)."""
+        return os.path.relpath(self.path, start=_upload_folder())
+
+
+def _upload_folder():
+    return current_app.config.get('UPLOAD_FOLDER', 'uploads')
+
+
+def blob_path(sha256, upload_folder=None):
+    """Return the absolute path of the blob with digest ``sha256``."""
+    folder = upload_folder or _upload_folder()
+    return os.path.join(folder, BLOB_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def store_stream(stream, upload_folder=None):
+    """Hash and store the binary ``stream``; return a :class:`StoredBlob`."""
+    folder = upload_folder or _upload_folder()
+    tmp_dir = os.path.join(folder, TMP_DIR)
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    hasher = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                tmp.write(chunk)
+                size += len(chunk)
+
+        digest = hasher.hexdigest()
+        final_path = blob_path(digest, folder)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            return StoredBlob(digest, size, final_path, created=False)
+
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        # Atomic; a concurrent upload of the same content writes identical bytes
+        os.replace(tmp_path, final_path)
+        return StoredBlob(digest, size, final_path, created=True)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_upload(file_storage, upload_folder=None):
+    """Store a werkzeug ``FileStorage`` upload."""
+    return store_stream(file_storage.stream, upload_folder)
+
+
+def is_referenced(sha256):
+    """True if any document or picture row still points at the blob."""
+    from ..models import Document, DailyPicture
+
+    return (Document.query.filter_by(sha256=sha256).first() is not None
+            or DailyPicture.query.filter_by(sha256=sha256).first() is not None)
+
+
+def discard_new_blobs(blobs):
+    """Remove blobs created by a failed request that nothing references."""
+    for blob in blobs:
+        if blob.created and not is_referenced(blob.sha256):
+            try:
+                os.remove(blob.path)
+            except OSError:
+                pass
+
+
+__all__ = [
+    "CHUNK_SIZE",
+    "StoredBlob",
+    "blob_path",
+    "store_stream",
+    "store_upload",
+    "is_referenced",
+    "discard_new_blobs",
+]
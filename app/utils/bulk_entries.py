@@ -0,0 +1,59 @@
+"""Set-based helpers for the confirm-* endpoints.
+
+The confirm routes validate a whole batch of staged lines before writing
+anything.  Foreign keys are resolved with one ``IN (...)`` query per
+referenced table, and rows are written with a single multi-row
+``INSERT ... RETURNING`` per table (SQLAlchemy's ``insertmanyvalues``),
+so confirming a few hundred lines costs a handful of statements.
+"""
+
+from sqlalchemy import insert
+
+from app import db
+
+
+def existing_ids(model, ids):
+    """Return the subset of ``ids`` that exist in ``model``'s table.
+
+    ``None`` values are ignored; an empty input issues no query.
+    """
+    wanted = {i for i in ids if i is not None}
+    if not wanted:
+        return set()
+    rows = db.session.execute(
+        db.select(model.id).where(model.id.in_(wanted))
+    ).scalars()
+    return set(rows)
+
+
+def first_missing(ids, found):
+    """Return the first id (in input order) absent from ``found``, else ``None``."""
+    for i in ids:
+        if i is not None and i not in found:
+            return i
+    return None
+
+
+def bulk_insert(model, rows):
+    """Insert ``rows`` (a list of column dicts) and return their new ids.
+
+    All rows go through one ``INSERT ... RETURNING`` statement batch, with
+    ids returned in the same order as ``rows``.  Column defaults declared on
+    the model (``created_at``, ``status``…) are applied as usual.
+    """
+    if not rows:
+        return []
+    # SQLAlchemy can only honour sort_by_parameter_order on SQLite by falling
+    # back to one statement per row.  SQLite hands out rowids in VALUES order
+    # within a statement, so sorting the returned ids restores input order.
+    ordered = db.session.get_bind().dialect.name != 'sqlite'
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=ordered)
+    ids = list(db.session.scalars(stmt, rows))
+    return ids if ordered else sorted(ids)
+
+
+__all__ = [
+    "existing_ids",
+    "first_missing",
+    "bulk_insert",
+]
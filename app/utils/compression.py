@@ -0,0 +1,34 @@
+"""gzip compression for large JSON responses.
+
+There is no compression middleware in front of the app, so endpoints
+returning big payloads (``/data-entry/bootstrap``…) compress their body
+themselves when the client advertises ``Accept-Encoding: gzip``.
+"""
+
+import gzip
+
+from flask import current_app, request, make_response
+
+# Bodies smaller than this are sent as-is: the gzip header overhead and CPU
+# cost outweigh the savings.
+MIN_COMPRESS_SIZE = 1024
+COMPRESS_LEVEL = 6
+
+
+def compressed_json(payload, status=200):
+    """Return ``payload`` as a JSON response, gzip-encoded when worthwhile."""
+    body = current_app.json.dumps(payload).encode('utf-8')
+    response = make_response(body, status)
+    response.mimetype = 'application/json'
+    response.vary.add('Accept-Encoding')
+
+    if len(body) >= MIN_COMPRESS_SIZE and request.accept_encodings['gzip'] > 0:
+        response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+__all__ = [
+    "compressed_json",
+    "MIN_COMPRESS_SIZE",
+]
@@ -0,0 +1,273 @@
+"""Incremental maintenance of the ``daily_cost_summaries`` table.
+
+Every flush that inserts, updates or deletes a worker, equipment, material
+or subcontractor entry is inspected before it is written: the cost the
+entry contributed *before* the change (if it was committed) is subtracted
+and the cost it contributes *after* the change (if it is committed now) is
+added to its (project, date, activity code) summary row and to the project's
+progress time series.  Both writes happen in the same flush, so they commit
+or roll back with the entries.
+
+Rates are read at the time of the change (``Equipment.hourly_rate``,
+``Material.cost_per_unit``); bulk ``UPDATE``/``DELETE`` statements and rate
+edits are not tracked row by row.  ``rebuild_cost_summaries`` recomputes the
+table set-wise from the committed entries for backfills and repairs.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import event, func, inspect, select, update, delete, insert, union_all, literal, DateTime
+from sqlalchemy.orm import Session
+
+from .. import db
+from . import progress_series
+from ..models.daily_cost_summary import DailyCostSummary
+from ..models.WorkerEntry_models import WorkerEntry
+from ..models.EquipmentEntry_models import EquipmentEntry
+from ..models.MaterialEntry import MaterialEntry
+from ..models.SubcontractorEntry import SubcontractorEntry
+from ..models.equipment_models import Equipment
+from ..models.material_models import Material
+
+AMOUNT_COLUMNS = (
+    'labor_hours', 'labor_cost',
+    'equipment_hours', 'equipment_cost',
+    'material_cost',
+    'subcontractor_hours', 'subcontractor_cost',
+)
+COST_COLUMNS = ('labor_cost', 'equipment_cost', 'material_cost', 'subcontractor_cost')
+
+
+# ─── Incremental updates ───────────────────────────────────────────────────────
+
+def _rate(session, model, column, pk, cache):
+    if pk is None:
+        return 0.0
+    key = (model, pk)
+    if key not in cache:
+        with session.no_autoflush:
+            obj = session.get(model, pk)
+        cache[key] = (getattr(obj, column) or 0.0) if obj is not None else 0.0
+    return cache[key]
+
+
+def _worker_amounts(get, session, cache):
+    hours = get('hours_worked') or 0.0
+    return {'labor_hours': hours, 'labor_cost': hours * (get('taux_horaire') or 0.0)}
+
+
+def _equipment_amounts(get, session, cache):
+    hours = get('hours_used') or 0.0
+    rate = _rate(session, Equipment, 'hourly_rate', get('equipment_id'), cache)
+    return {'equipment_hours': hours, 'equipment_cost': hours * rate}
+
+
+def _material_amounts(get, session, cache):
+    price = _rate(session, Material, 'cost_per_unit', get('material_id'), cache)
+    return {'material_cost': (get('quantity_used') or 0.0) * price}
+
+
+def _subcontractor_amounts(get, session, cache):
+    return {'subcontractor_hours': get('labor_hours') or 0.0,
+            'subcontractor_cost': get('total_cost') or 0.0}
+
+
+# model -> (date attribute, activity code attribute, amounts function)
+TRACKED_ENTRIES = {
+    WorkerEntry: ('date_of_report', 'activity_id', _worker_amounts),
+    EquipmentEntry: ('date_of_report', 'activity_id', _equipment_amounts),
+    MaterialEntry: ('date_of_report', 'activity_code_id', _material_amounts),
+    SubcontractorEntry: ('date', 'activity_code_id', _subcontractor_amounts),
+}
+
+
+def _old_value(state, attr):
+    values = state.attrs[attr].history.non_added()
+    return values[0] if values else None
+
+
+def _new_value(state, attr):
+    values = state.attrs[attr].history.non_deleted()
+    return values[0] if values else None
+
+
+def _contribution(model, get, session, cache):
+    """Return ``(key, amounts)`` of an entry state, or ``None`` if it adds nothing."""
+    date_attr, activity_attr, amounts = TRACKED_ENTRIES[model]
+    if get('status') != 'committed' or get(date_attr) is None or get('project_id') is None:
+        return None
+    key = (get('project_id'), get(date_attr), get(activity_attr))
+    return key, amounts(get, session, cache)
+
+
+def _collect_deltas(session):
+    deltas = defaultdict(lambda: dict.fromkeys(AMOUNT_COLUMNS, 0.0))
+    cache = {}
+
+    def apply(model, get, sign):
+        found = _contribution(model, get, session, cache)
+        if found:
+            key, amounts = found
+            for column, value in amounts.items():
+                deltas[key][column] += sign * value
+
+    for obj in session.new:
+        if type(obj) in TRACKED_ENTRIES:
+            state = inspect(obj)
+            apply(type(obj), lambda a, s=state: _new_value(s, a), +1)
+
+    for obj in session.dirty:
+        if type(obj) in TRACKED_ENTRIES and session.is_modified(obj):
+            state = inspect(obj)
+            apply(type(obj), lambda a, s=state: _old_value(s, a), -1)
+            apply(type(obj), lambda a, s=state: _new_value(s, a), +1)
+
+    for obj in session.deleted:
+        if type(obj) in TRACKED_ENTRIES:
+            state = inspect(obj)
+            apply(type(obj), lambda a, s=state: _old_value(s, a), -1)
+
+    return {key: amounts for key, amounts in deltas.items() if any(amounts.values())}
+
+
+def _key_filter(table, key):
+    project_id, report_date, activity_code_id = key
+    return (
+        table.c.project_id == project_id,
+        table.c.report_date == report_date,
+        table.c.activity_code_id.is_(None) if activity_code_id is None
+        else table.c.activity_code_id == activity_code_id,
+    )
+
+
+def apply_deltas(session, deltas):
+    """Add ``deltas`` (key -> amounts) to the summary rows, creating missing ones."""
+    table = DailyCostSummary.__table__
+    now = datetime.utcnow()
+    for key, amounts in deltas.items():
+        values = {column: table.c[column] + amount for column, amount in amounts.items()}
+        values['total_cost'] = table.c.total_cost + sum(amounts[c] for c in COST_COLUMNS)
+        values['updated_at'] = now
+        result = session.execute(update(table).where(*_key_filter(table, key)).values(**values))
+        if result.rowcount == 0:
+            project_id, report_date, activity_code_id = key
+            session.execute(insert(table).values(
+                project_id=project_id, report_date=report_date, activity_code_id=activity_code_id,
+                total_cost=sum(amounts[c] for c in COST_COLUMNS), updated_at=now, **amounts,
+            ))
+
+
+def _day_totals(deltas):
+    """Collapse summary deltas to ``{(project_id, day): (hours, cost)}``."""
+    days = defaultdict(lambda: [0.0, 0.0])
+    for (project_id, report_date, _), amounts in deltas.items():
+        days[project_id, report_date][0] += amounts['labor_hours']
+        days[project_id, report_date][1] += sum(amounts[c] for c in COST_COLUMNS)
+    return {key: tuple(values) for key, values in days.items()}
+
+
+def _update_summaries(session, flush_context, instances):
+    deltas = _collect_deltas(session)
+    if deltas:
+        apply_deltas(session, deltas)
+        progress_series.add_daily_actuals(session, _day_totals(deltas))
+
+
+# ─── Set-wise rebuild ──────────────────────────────────────────────────────────
+
+def _zero():
+    return literal(0.0)
+
+
+def _source_selects():
+    w, e, m, s = WorkerEntry, EquipmentEntry, MaterialEntry, SubcontractorEntry
+    workers = select(
+        w.project_id, w.date_of_report.label('report_date'), w.activity_id.label('activity_code_id'),
+        w.hours_worked.label('labor_hours'),
+        (w.hours_worked * func.coalesce(w.taux_horaire, 0.0)).label('labor_cost'),
+        _zero().label('equipment_hours'), _zero().label('equipment_cost'), _zero().label('material_cost'),
+        _zero().label('subcontractor_hours'), _zero().label('subcontractor_cost'),
+    ).where(w.status == 'committed')
+    equipment = select(
+        e.project_id, e.date_of_report, e.activity_id,
+        _zero(), _zero(),
+        e.hours_used, e.hours_used * func.coalesce(Equipment.hourly_rate, 0.0), _zero(),
+        _zero(), _zero(),
+    ).outerjoin(Equipment, Equipment.id == e.equipment_id).where(e.status == 'committed')
+    materials = select(
+        m.project_id, m.date_of_report, m.activity_code_id,
+        _zero(), _zero(), _zero(), _zero(),
+        func.coalesce(m.quantity_used, 0.0) * func.coalesce(Material.cost_per_unit, 0.0),
+        _zero(), _zero(),
+    ).outerjoin(Material, Material.id == m.material_id).where(m.status == 'committed')
+    subcontractors = select(
+        s.project_id, s.date, s.activity_code_id,
+        _zero(), _zero(), _zero(), _zero(), _zero(),
+        func.coalesce(s.labor_hours, 0.0), func.coalesce(s.total_cost, 0.0),
+    ).where(s.status == 'committed', s.date.isnot(None))
+    return [
+        (workers, w.project_id, w.date_of_report),
+        (equipment, e.project_id, e.date_of_report),
+        (materials, m.project_id, m.date_of_report),
+        (subcontractors, s.project_id, s.date),
+    ]
+
+
+def _scope(project_col, date_col, project_id, start, end):
+    conditions = []
+    if project_id is not None:
+        conditions.append(project_col == project_id)
+    if start is not None:
+        conditions.append(date_col >= start)
+    if end is not None:
+        conditions.append(date_col <= end)
+    return conditions
+
+
+def rebuild_cost_summaries(project_id=None, start=None, end=None):
+    """Recompute the summaries (optionally of one project / date range).
+
+    Deletes the matching summary rows and re-inserts them with a single
+    ``INSERT … SELECT`` aggregating all entry tables.  Returns the number of
+    summary rows written.  Does not commit.
+    """
+    table = DailyCostSummary.__table__
+
+    entries = union_all(*(
+        stmt.where(*_scope(project_col, date_col, project_id, start, end))
+        for stmt, project_col, date_col in _source_selects()
+    )).subquery('entries')
+
+    sums = {column: func.coalesce(func.sum(entries.c[column]), 0.0) for column in AMOUNT_COLUMNS}
+    aggregate = (
+        select(entries.c.project_id, entries.c.report_date, entries.c.activity_code_id,
+               *sums.values(), sum(sums[c] for c in COST_COLUMNS),
+               literal(datetime.utcnow(), DateTime()))
+        .group_by(entries.c.project_id, entries.c.report_date, entries.c.activity_code_id)
+    )
+
+    scope = _scope(table.c.project_id, table.c.report_date, project_id, start, end)
+    db.session.execute(delete(table).where(*scope))
+    columns = ['project_id', 'report_date', 'activity_code_id', *AMOUNT_COLUMNS, 'total_cost', 'updated_at']
+    db.session.execute(insert(table).from_select(columns, aggregate))
+    return db.session.execute(select(func.count()).select_from(table).where(*scope)).scalar()
+
+
+_listeners_installed = False
+
+
+def init_app(app):
+    """Install the flush listener that keeps the summaries in sync (once)."""
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Session, 'before_flush', _update_summaries)
+        _listeners_installed = True
+
+
+__all__ = [
+    "TRACKED_ENTRIES",
+    "apply_deltas",
+    "rebuild_cost_summaries",
+    "init_app",
+]
@@ -1,60 +1,117 @@
-import pandas as pd
 import csv
 import logging
+import os
+import threading
+from collections import OrderedDict
 from flask import current_app
 
-# Configure logger
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
 #DATA_FILE_PATH = "C:/Users/patri/OneDrive/Bureau/TCC_V2.0/data/daily_report_data.csv"
 #DATA_FILE_PATH = current_app.config.get('DAILY_REPORT_DATA_FILE', 'default_fallback_path')
 
-def load_data(file_path, columns=None, delimiter=None):
+CANDIDATE_DELIMITERS = ',;\t'
+SNIFF_BYTES = 16 * 1024
+# Parsed frames kept in memory, least recently used evicted first
+CSV_CACHE_SIZE = 32
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def sniff_delimiter(file_path, default=','):
+    """Guess the delimiter from the first few KB of ``file_path``."""
+    with open(file_path, newline='', encoding='utf-8-sig', errors='replace') as f:
+        sample = f.read(SNIFF_BYTES)
+    if not sample:
+        return default
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=CANDIDATE_DELIMITERS).delimiter
+    except csv.Error:
+        # Single-column files give the sniffer nothing to go on
+        header = sample.splitlines()[0]
+        counts = {d: header.count(d) for d in CANDIDATE_DELIMITERS}
+        best = max(counts, key=counts.get)
+        return best if counts[best] else default
+
+
+def _read_csv(file_path, delimiter, dtype):
+    import pandas as pd
+
+    data = pd.read_csv(file_path, delimiter=delimiter, dtype=dtype,
+                       encoding='utf-8-sig', low_memory=False)
+    data.columns = data.columns.str.strip()  # Strip whitespace from column names
+    return data
+
+
+def clear_cache():
+    """Forget every parsed file (mostly for tests)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def load_data(file_path, columns=None, delimiter=None, dtype=None):
     """
     Load data from a CSV file and return a DataFrame.
     Supports optional column selection and delimiter detection.
 
+    The delimiter is sniffed once from the start of the file and the parsed
+    frame is cached per (path, mtime, size), so repeated calls against an
+    unchanged file only cost a ``stat``. Callers get their own copy.
+
     Parameters:
     - file_path (str): Path to the CSV file.
     - columns (list): List of columns to load (optional).
     - delimiter (str): Specific delimiter to use (optional).
+    - dtype (dict): Column dtypes passed to ``pd.read_csv`` (optional).
 
     Returns:
     - pd.DataFrame: Loaded data as a DataFrame, or an empty DataFrame on failure.
     """
+    # pandas is only paid for by code paths that read CSVs, not at app import
+    import pandas as pd
+
     # If no file path is passed in, read from current_app.config
     if file_path is None:
         file_path = current_app.config.get("DATA_FILE_PATH", "default_fallback.csv")
 
-    delimiters = [',', ';', '\t'] if delimiter is None else [delimiter]
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        logger.warning(f"Error: File {file_path} not found.")
+        return pd.DataFrame()
+
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, delimiter,
+           tuple(sorted(dtype.items())) if isinstance(dtype, dict) else dtype)
+    with _cache_lock:
+        data = _cache.get(key)
+        if data is not None:
+            _cache.move_to_end(key)
 
-    for delim in delimiters:
+    if data is None:
         try:
-            # Read the CSV into a DataFrame
-            data = pd.read_csv(file_path, delimiter=delim)
-            logger.debug(f"Data loaded successfully from {file_path} with delimiter '{delim}'")
-            
-            data.columns = data.columns.str.strip()  # Strip whitespace from column names
-            if columns:
-                data = data[columns]
-            #print(f"Data loaded successfully from {file_path} with delimiter '{delim}'")
-            logger.info(f"Data loaded successfully from {file_path} with delimiter '{delim}'")
-            return data
-        except ValueError as ve:
-            #print(f"ValueError with delimiter '{delim}': {ve}")
-            logger.debug(f"ValueError with delimiter '{delim}': {ve}")   
-        except FileNotFoundError:
-            #print(f"Error: File {file_path} not found.")
-            logger.warning(f"Error: File {file_path} not found.")
-            break
+            delim = delimiter or sniff_delimiter(file_path)
+            data = _read_csv(file_path, delim, dtype)
         except Exception as e:
-            #print(f"Error reading file {file_path} with delimiter '{delim}': {e}")
-            logger.warning(f"Failed to read file {file_path} with any delimiter.") 
-        #print(f"Failed to read file {file_path} with any delimiter.")
-        logger.warning(f"Failed to read file {file_path} with any delimiter.") 
-    return pd.DataFrame()  # Return an empty DataFrame if all attempts fail
+            logger.warning(f"Failed to read file {file_path}: {e}")
+            return pd.DataFrame()  # Return an empty DataFrame if parsing fails
+        logger.info(f"Data loaded from {file_path} with delimiter '{delim}'")
+        with _cache_lock:
+            # Older versions of the same file can never be hit again
+            for stale in [k for k in _cache if k[0] == key[0] and k[1:3] != key[1:3]]:
+                del _cache[stale]
+            _cache[key] = data
+            while len(_cache) > CSV_CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    if columns:
+        missing = [c for c in columns if c not in data.columns]
+        if missing:
+            logger.warning(f"File {file_path} has no column(s) {missing}.")
+            return pd.DataFrame()
+        return data[columns].copy()
+    return data.copy()
 
 def save_to_csv(session_data, date, file_path=None):
     """
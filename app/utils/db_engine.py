@@ -0,0 +1,100 @@
+"""Dialect-aware database engine settings.
+
+``configure(app)`` runs before ``db.init_app`` and turns the ``DB_POOL_*``
+settings into ``SQLALCHEMY_ENGINE_OPTIONS`` for the configured backend.
+Values already present in ``SQLALCHEMY_ENGINE_OPTIONS`` take precedence.
+``install_pragmas(app, engine)`` then runs ``SQLITE_PRAGMAS`` on every new
+SQLite connection.
+
+With the defaults in :class:`app.config.Config` SQLite runs in WAL mode, so
+readers no longer block the writer.  ``busy_timeout`` makes a writer wait
+for the lock instead of failing at once with ``database is locked``.
+"""
+
+import re
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+_PRAGMA_VALUE = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+
+def is_memory_sqlite(url):
+    """True for ``sqlite://`` / ``sqlite:///:memory:`` style URLs."""
+    url = make_url(url)
+    return (url.get_backend_name() == 'sqlite'
+            and (url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'))
+
+
+def engine_options(config):
+    """Return ``SQLALCHEMY_ENGINE_OPTIONS`` for ``config``'s database URI."""
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    backend = make_url(uri).get_backend_name()
+    options = {}
+    if backend == 'sqlite':
+        if not is_memory_sqlite(uri):
+            # Flask-SQLAlchemy uses a StaticPool for in-memory databases; keep it
+            busy_ms = int(config.get('SQLITE_PRAGMAS', {}).get('busy_timeout', 5000))
+            options.update(
+                pool_size=config.get('DB_POOL_SIZE', 5),
+                max_overflow=config.get('DB_MAX_OVERFLOW', 10),
+                pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+                connect_args={'timeout': busy_ms / 1000, 'check_same_thread': False},
+            )
+    else:
+        options.update(
+            pool_size=config.get('DB_POOL_SIZE', 5),
+            max_overflow=config.get('DB_MAX_OVERFLOW', 10),
+            pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+            pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+            pool_pre_ping=True,
+        )
+    explicit = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if 'connect_args' in explicit and 'connect_args' in options:
+        explicit['connect_args'] = {**options['connect_args'], **explicit['connect_args']}
+    options.update(explicit)
+    return options
+
+
+def _pragma_statements(pragmas):
+    statements = []
+    for name, value in pragmas.items():
+        value = str(value)
+        if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(value):
+            raise ValueError(f"Invalid SQLite pragma {name}={value}")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def install_pragmas(app, engine):
+    """Run ``SQLITE_PRAGMAS`` on each new connection of a SQLite ``engine``."""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    if is_memory_sqlite(engine.url):
+        # WAL and mmap do not apply to in-memory databases
+        pragmas = {k: v for k, v in pragmas.items() if k not in ('journal_mode', 'mmap_size')}
+    statements = _pragma_statements(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def configure(app):
+    """Fill ``SQLALCHEMY_ENGINE_OPTIONS``; call before ``db.init_app(app)``."""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+__all__ = [
+    "is_memory_sqlite",
+    "engine_options",
+    "install_pragmas",
+    "configure",
+]
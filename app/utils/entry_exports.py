@@ -0,0 +1,207 @@
+"""Streaming export of committed daily-report entries.
+
+Rows are read with ``yield_per`` (server-side cursor on PostgreSQL, chunked
+fetches on SQLite) and turned into output chunks by generators, so an export
+of a whole year never holds more than one batch of rows in memory.  CSV and
+NDJSON start producing bytes with the first batch; XLSX goes through
+openpyxl's write-only mode, which spools rows to disk and is streamed once
+the workbook is closed.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
+
+from sqlalchemy import func, select, literal, null
+
+from .. import db
+from ..models.WorkerEntry_models import WorkerEntry
+from ..models.EquipmentEntry_models import EquipmentEntry
+from ..models.MaterialEntry import MaterialEntry
+from ..models.SubcontractorEntry import SubcontractorEntry
+from ..models.subcontractor_models import Subcontractor
+from ..models.workforce_models import Worker
+from ..models.equipment_models import Equipment
+from ..models.material_models import Material
+from ..models.daily_models import DailyNoteEntry
+
+# Rows fetched per round-trip and buffered per output chunk
+YIELD_PER = 1000
+CHUNK_SIZE = 64 * 1024
+
+COLUMNS = [
+    'entry_type', 'id', 'report_date', 'name', 'quantity', 'unit',
+    'unit_price', 'cost', 'activity_code_id', 'payment_item_id', 'cwp',
+    'description',
+]
+
+
+def _workers():
+    e = WorkerEntry
+    return select(
+        literal('workers').label('entry_type'), e.id, e.date_of_report.label('report_date'),
+        func.coalesce(Worker.name, e.worker_name).label('name'), e.hours_worked.label('quantity'), literal('h').label('unit'),
+        e.taux_horaire.label('unit_price'), (e.hours_worked * e.taux_horaire).label('cost'),
+        e.activity_id.label('activity_code_id'), e.payment_item_id, e.cwp,
+        e.metier.label('description'),
+    ).outerjoin(Worker, Worker.id == e.worker_id), e.date_of_report
+
+
+def _equipment():
+    e = EquipmentEntry
+    return select(
+        literal('equipment').label('entry_type'), e.id, e.date_of_report.label('report_date'),
+        func.coalesce(Equipment.name, e.equipment_name).label('name'), e.hours_used.label('quantity'), literal('h').label('unit'),
+        null().label('unit_price'), null().label('cost'),
+        e.activity_id.label('activity_code_id'), e.payment_item_id, e.cwp,
+        e.usage_description.label('description'),
+    ).outerjoin(Equipment, Equipment.id == e.equipment_id), e.date_of_report
+
+
+def _materials():
+    e = MaterialEntry
+    return select(
+        literal('materials').label('entry_type'), e.id, e.date_of_report.label('report_date'),
+        func.coalesce(Material.name, e.material_name).label('name'), e.quantity_used.label('quantity'), e.unit,
+        e.unit_price, e.cost, e.activity_code_id, e.payment_item_id, e.cwp,
+        e.supplier_name.label('description'),
+    ).outerjoin(Material, Material.id == e.material_id), e.date_of_report
+
+
+def _subcontractors():
+    e = SubcontractorEntry
+    return select(
+        literal('subcontractors').label('entry_type'), e.id, e.date.label('report_date'),
+        Subcontractor.name.label('name'), e.labor_hours.label('quantity'), literal('h').label('unit'),
+        null().label('unit_price'), e.total_cost.label('cost'),
+        e.activity_code_id, null().label('payment_item_id'), null().label('cwp'),
+        e.description,
+    ).outerjoin(Subcontractor, Subcontractor.id == e.subcontractor_id), e.date
+
+
+def _notes():
+    e = DailyNoteEntry
+    return select(
+        literal('notes').label('entry_type'), e.id, e.date_of_report.label('report_date'),
+        e.author.label('name'), null().label('quantity'), null().label('unit'),
+        null().label('unit_price'), null().label('cost'),
+        e.activity_code_id, e.payment_item_id, e.cwp, e.content.label('description'),
+    ), e.date_of_report
+
+
+# entry type -> (query builder, model); order is the export order
+ENTRY_SOURCES = {
+    'workers': (_workers, WorkerEntry),
+    'equipment': (_equipment, EquipmentEntry),
+    'materials': (_materials, MaterialEntry),
+    'subcontractors': (_subcontractors, SubcontractorEntry),
+    'notes': (_notes, DailyNoteEntry),
+}
+
+
+def iter_rows(entry_type, project_id, start, end):
+    """Yield committed rows of ``entry_type`` for ``[start, end]`` as tuples."""
+    build, model = ENTRY_SOURCES[entry_type]
+    stmt, date_column = build()
+    stmt = (
+        stmt.where(model.project_id == project_id,
+                   model.status == 'committed',
+                   date_column >= start,
+                   date_column <= end)
+        .order_by(date_column, model.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    result = db.session.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+def _cell(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def csv_chunks(entry_types, project_id, start, end):
+    """Yield the export as CSV text chunks (header first)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for entry_type in entry_types:
+        for row in iter_rows(entry_type, project_id, start, end):
+            writer.writerow([_cell(v) for v in row])
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        # Flush at least once per entry type so bytes flow early
+        if buffer.tell():
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+def ndjson_chunks(entry_types, project_id, start, end):
+    """Yield the export as newline-delimited JSON, one object per row."""
+    parts, size = [], 0
+    for entry_type in entry_types:
+        for row in iter_rows(entry_type, project_id, start, end):
+            line = json.dumps(dict(zip(COLUMNS, (_cell(v) for v in row)))) + '\n'
+            parts.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield ''.join(parts)
+                parts, size = [], 0
+        if parts:
+            yield ''.join(parts)
+            parts, size = [], 0
+
+
+def xlsx_chunks(entry_types, project_id, start, end):
+    """Yield an XLSX workbook (one sheet per entry type) in binary chunks.
+
+    The workbook is built with openpyxl's write-only mode, which writes
+    rows straight to temporary files instead of keeping cell objects, and
+    saved to a temporary file that is then streamed.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for entry_type in entry_types:
+        sheet = workbook.create_sheet(title=entry_type)
+        sheet.append(COLUMNS[1:])
+        for row in iter_rows(entry_type, project_id, start, end):
+            sheet.append(list(row[1:]))
+
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+# format -> (chunk generator, mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': (csv_chunks, 'text/csv', 'csv'),
+    'ndjson': (ndjson_chunks, 'application/x-ndjson', 'ndjson'),
+    'xlsx': (xlsx_chunks, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+
+__all__ = [
+    "COLUMNS",
+    "ENTRY_SOURCES",
+    "EXPORT_FORMATS",
+    "iter_rows",
+    "csv_chunks",
+    "ndjson_chunks",
+    "xlsx_chunks",
+]
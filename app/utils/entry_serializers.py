@@ -0,0 +1,213 @@
+"""Batch loading and serialization of daily entry rows.
+
+The pending-entries endpoints used to lazy-load ``activity``, ``worker``,
+``equipment`` and ``subcontractor`` and look up the payment item once per
+row.  The helpers below load a whole project/date result set with its
+relationships eagerly and resolve payment items with a single ``IN`` query,
+so each GET runs a fixed number of statements regardless of row count.
+"""
+
+import os
+from datetime import datetime
+
+from flask import current_app, url_for
+from sqlalchemy.orm import joinedload
+
+from app.models.core_models import PaymentItem
+from app.models.models import Document
+from app.models.workforce_models import Worker
+from app.models.equipment_models import Equipment
+from app.models.WorkerEntry_models import WorkerEntry
+from app.models.EquipmentEntry_models import EquipmentEntry
+from app.models.MaterialEntry import MaterialEntry
+from app.models.SubcontractorEntry import SubcontractorEntry
+
+
+# Per-model: (date column name, relationship loader options)
+_ENTRY_LOADERS = {
+    WorkerEntry: (
+        'date_of_report',
+        lambda: (
+            joinedload(WorkerEntry.activity),
+            # Worker.equipment is lazy='subquery'; the tab never needs it.
+            joinedload(WorkerEntry.worker).lazyload(Worker.equipment),
+        ),
+    ),
+    EquipmentEntry: (
+        'date_of_report',
+        lambda: (
+            joinedload(EquipmentEntry.activity),
+            joinedload(EquipmentEntry.equipment).lazyload(Equipment.workers),
+        ),
+    ),
+    MaterialEntry: (
+        'date_of_report',
+        lambda: (
+            joinedload(MaterialEntry.activity_code),
+            joinedload(MaterialEntry.material),
+        ),
+    ),
+    SubcontractorEntry: (
+        'date',
+        lambda: (
+            joinedload(SubcontractorEntry.activity_code),
+            joinedload(SubcontractorEntry.subcontractor),
+        ),
+    ),
+}
+
+
+def load_entries(model, project_id, report_date, status=None):
+    """Return ``model`` rows for a project/date with relationships preloaded.
+
+    ``status`` optionally restricts the rows (e.g. ``'pending'``).
+    Rows are ordered by ``id`` so the UI table keeps insertion order.
+    """
+    if model not in _ENTRY_LOADERS:
+        raise ValueError(f"Unsupported entry model: {model.__name__}")
+    date_attr, options = _ENTRY_LOADERS[model]
+
+    query = (
+        model.query
+        .options(*options())
+        .filter(model.project_id == project_id)
+        .filter(getattr(model, date_attr) == report_date)
+    )
+    if status:
+        query = query.filter(model.status == status)
+    return query.order_by(model.id).all()
+
+
+def load_documents(project_id, report_date=None):
+    """Return pending/committed documents of a project, uploaded on ``report_date``."""
+    query = Document.query.filter_by(project_id=project_id)
+    if report_date:
+        start = datetime.combine(report_date, datetime.min.time())
+        end = datetime.combine(report_date, datetime.max.time())
+        query = query.filter(Document.uploaded_at >= start, Document.uploaded_at <= end)
+    return query.filter(Document.status.in_(["pending", "committed"])).all()
+
+
+def payment_items_by_id(*entry_lists):
+    """Resolve every ``payment_item_id`` referenced in ``entry_lists``.
+
+    Returns ``{id: PaymentItem}`` built from one ``IN (...)`` query, or an
+    empty dict without touching the database when nothing is referenced.
+    """
+    ids = {
+        e.payment_item_id
+        for entries in entry_lists
+        for e in entries
+        if getattr(e, 'payment_item_id', None) is not None
+    }
+    if not ids:
+        return {}
+    items = PaymentItem.query.filter(PaymentItem.id.in_(ids)).all()
+    return {pi.id: pi for pi in items}
+
+
+def _activity_fields(activity):
+    return {
+        "activity_code": activity.code if activity else None,
+        "activity_description": activity.description if activity else None,
+    }
+
+
+def _payment_fields(payment_item_id, payment_items):
+    pi = payment_items.get(payment_item_id) if payment_item_id is not None else None
+    return {
+        "payment_item_id": payment_item_id,
+        "payment_item_code": pi.payment_code if pi else None,
+        "payment_item_name": pi.item_name if pi else None,
+    }
+
+
+def serialize_worker_entry(entry, payment_items):
+    """Serialize a ``WorkerEntry`` for the labour/equipment table."""
+    return {
+        "id": entry.id,
+        "worker_id": entry.worker_id,
+        "worker_name": entry.worker.name if entry.worker else entry.worker_name,
+        "hours": entry.hours_worked,
+        "activity_id": entry.activity_id,
+        **_activity_fields(entry.activity),
+        **_payment_fields(entry.payment_item_id, payment_items),
+        "cwp": entry.cwp,
+    }
+
+
+def serialize_equipment_entry(entry, payment_items):
+    """Serialize an ``EquipmentEntry`` for the labour/equipment table."""
+    return {
+        "id": entry.id,
+        "equipment_id": entry.equipment_id,
+        "equipment_name": entry.equipment.name if entry.equipment else entry.equipment_name,
+        "hours": entry.hours_used,
+        "activity_id": entry.activity_id,
+        **_activity_fields(entry.activity),
+        **_payment_fields(entry.payment_item_id, payment_items),
+        "cwp": entry.cwp,
+    }
+
+
+def serialize_material_entry(entry, payment_items):
+    """Serialize a ``MaterialEntry`` for the materials table."""
+    return {
+        "id": entry.id,
+        "material_id": entry.material_id,
+        "material_name": entry.material.name if entry.material else entry.material_name,
+        "quantity": entry.quantity_used,
+        "activity_id": entry.activity_code_id,
+        **_activity_fields(entry.activity_code),
+        **_payment_fields(entry.payment_item_id, payment_items),
+        "cwp": entry.cwp,
+    }
+
+
+def serialize_subcontractor_entry(entry):
+    """Serialize a ``SubcontractorEntry`` for the subcontractors table."""
+    return {
+        "id": entry.id,
+        "subcontractor_id": entry.subcontractor_id,
+        "subcontractor_name": entry.subcontractor.name if entry.subcontractor else None,
+        "num_employees": entry.num_employees,
+        "labor_hours": entry.labor_hours,
+        "activity_code_id": entry.activity_code_id,
+        "activity_code": entry.activity_code.code if entry.activity_code else None,
+    }
+
+
+def upload_relative_path(file_url):
+    """Return a ``file_url`` (relative to the app root) relative to ``UPLOAD_FOLDER``."""
+    path = os.path.relpath(os.path.join(current_app.root_path, file_url),
+                           start=current_app.config["UPLOAD_FOLDER"])
+    return os.path.basename(file_url) if path.startswith("..") else path
+
+
+def serialize_document(d):
+    """Serialize a ``Document`` for the documents tab."""
+    return {
+        "id": d.id,
+        "file_name": d.file_name,
+        "file_url": url_for("documents_bp.download_document", filename=upload_relative_path(d.file_url)),
+        "document_type": d.document_type,
+        "status": d.status,
+        "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None,
+        "doc_notes": d.doc_notes,
+        "activity_code_id": d.activity_code_id,
+        "payment_item_id": d.payment_item_id,
+        "cwp_code": d.cwp_code,
+    }
+
+
+__all__ = [
+    "load_entries",
+    "load_documents",
+    "payment_items_by_id",
+    "serialize_worker_entry",
+    "serialize_equipment_entry",
+    "serialize_material_entry",
+    "serialize_subcontractor_entry",
+    "serialize_document",
+    "upload_relative_path",
+]
@@ -0,0 +1,210 @@
+"""Earned-value (EVM) engine for ``ProjectTask``.
+
+Tasks, project budgets and actual costs are loaded into pandas frames and
+every index is computed column-wise in one pass; the results are written
+back with a single executemany ``UPDATE``.
+
+Definitions, per task and as of a given date:
+
+* BAC  – the project budget (``revised_budget``, else ``budget``) split over
+  its tasks pro rata ``man_hour_budget``; projects without a budget use
+  ``man_hour_budget`` × the project's blended labor rate instead.
+* PV   – BAC × the elapsed share of ``start_date``..``end_date``.
+* EV   – BAC × ``progress`` / 100.
+* AC   – committed costs from ``daily_cost_summaries`` for the task's
+  activity code, split pro rata ``man_hour_budget`` when several tasks of
+  the project share that code.  ``man_hours`` receives the labor hours.
+* CV, SV, CPI, SPI, EAC (BAC / CPI, else AC + BAC − EV), ETC, VAC, TCPI
+  follow the usual formulas; undefined ratios are stored as NULL.
+
+In incremental mode only projects with something new since their last run
+are recomputed: a task never computed or edited since, new or changed cost
+summaries, a project edit, or a task whose planned window is still open.
+Each run also records the projects' total EV/PV in ``project_progress``.
+"""
+
+from datetime import datetime, date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, update, func, bindparam
+
+from .. import db
+from . import progress_series
+from ..models.core_models import Project, ProjectTask
+from ..models.daily_cost_summary import DailyCostSummary
+
+RESULT_COLUMNS = ['PV', 'EV', 'AC', 'CV', 'SV', 'VAC', 'CPI', 'SPI', 'EAC', 'ETC', 'TCPI', 'man_hours']
+
+
+def _frame(stmt, columns, numeric=(), dates=()):
+    df = pd.DataFrame.from_records(db.session.execute(stmt).all(), columns=columns)
+    for column in numeric:
+        df[column] = pd.to_numeric(df[column]).astype(float)
+    for column in dates:
+        df[column] = pd.to_datetime(df[column])
+    return df
+
+
+def _load_tasks(project_ids):
+    t = ProjectTask
+    stmt = select(t.id, t.project_id, t.activity_code_id, t.start_date, t.end_date,
+                  t.progress, t.man_hour_budget, t.updated_at, t.evm_computed_at)
+    if project_ids is not None:
+        stmt = stmt.where(t.project_id.in_(project_ids))
+    return _frame(stmt, ['id', 'project_id', 'activity_code_id', 'start_date', 'end_date',
+                         'progress', 'man_hour_budget', 'updated_at', 'evm_computed_at'],
+                  numeric=['progress', 'man_hour_budget'],
+                  dates=['start_date', 'end_date', 'updated_at', 'evm_computed_at'])
+
+
+def _load_projects(project_ids):
+    p = Project
+    return _frame(
+        select(p.id, func.coalesce(p.revised_budget, p.budget), p.updated_at).where(p.id.in_(project_ids)),
+        ['project_id', 'budget', 'project_updated_at'],
+        numeric=['budget'], dates=['project_updated_at'],
+    )
+
+
+def _load_actuals(project_ids, as_of):
+    s = DailyCostSummary
+    return _frame(
+        select(s.project_id, s.activity_code_id,
+               func.sum(s.labor_hours), func.sum(s.labor_cost), func.sum(s.total_cost),
+               func.max(s.updated_at))
+        .where(s.project_id.in_(project_ids), s.report_date <= as_of)
+        .group_by(s.project_id, s.activity_code_id),
+        ['project_id', 'activity_code_id', 'labor_hours', 'labor_cost', 'actual_cost', 'summary_updated_at'],
+        numeric=['labor_hours', 'labor_cost', 'actual_cost'], dates=['summary_updated_at'],
+    )
+
+
+def _stale_projects(tasks, projects, actuals, as_of):
+    """Return the ids of projects whose tasks need recomputing."""
+    last_run = tasks['evm_computed_at']
+    last_day = last_run.dt.normalize()
+    as_of = pd.Timestamp(as_of)
+    task_stale = (
+        last_run.isna()
+        | (tasks['updated_at'] > last_run)
+        # Planned value moves every day while the window is open
+        | ((last_day < as_of) & (tasks['start_date'] <= as_of) & (tasks['end_date'] >= last_day))
+    )
+    stale = set(tasks.loc[task_stale, 'project_id'])
+
+    first_run = tasks.groupby('project_id')['evm_computed_at'].min().rename('last_run')
+    projects = projects.join(first_run, on='project_id')
+    stale |= set(projects.loc[projects['project_updated_at'] > projects['last_run'], 'project_id'])
+
+    actuals = actuals.join(first_run, on='project_id')
+    stale |= set(actuals.loc[actuals['summary_updated_at'] > actuals['last_run'], 'project_id'])
+    return stale
+
+
+def compute_indices(tasks, projects, actuals, as_of):
+    """Return ``tasks`` with the EVM result columns, computed column-wise."""
+    df = tasks.merge(projects[['project_id', 'budget']], on='project_id', how='left')
+    mhb = df['man_hour_budget'].fillna(0.0).clip(lower=0.0)
+    df['mhb'] = mhb
+
+    # Actuals of an activity code are shared by the project's tasks on that code
+    key = ['project_id', 'activity_code_id']
+    group_mhb = df.groupby(key)['mhb'].transform('sum')
+    group_size = df.groupby(key)['mhb'].transform('size')
+    share = np.where(group_mhb > 0, mhb / group_mhb.replace(0, np.nan), 1.0 / group_size)
+    df = df.merge(actuals[key + ['labor_hours', 'labor_cost', 'actual_cost']], on=key, how='left')
+    df[['labor_hours', 'labor_cost', 'actual_cost']] = df[['labor_hours', 'labor_cost', 'actual_cost']].fillna(0.0)
+    ac = df['actual_cost'].to_numpy() * share
+    man_hours = df['labor_hours'].to_numpy() * share
+
+    # Budget at completion
+    project_mhb = df.groupby('project_id')['mhb'].transform('sum')
+    labor = actuals.groupby('project_id')[['labor_hours', 'labor_cost']].sum()
+    blended_rate = (labor['labor_cost'] / labor['labor_hours'].replace(0, np.nan)).rename('rate')
+    rate = df['project_id'].map(blended_rate).fillna(0.0)
+    bac = np.where(df['budget'].notna() & (project_mhb > 0),
+                   df['budget'] * mhb / project_mhb.replace(0, np.nan),
+                   mhb * rate)
+
+    # Planned share of the schedule elapsed at as_of (both ends inclusive)
+    start, end = df['start_date'], df['end_date']
+    duration = (end - start).dt.days + 1
+    elapsed = (pd.Timestamp(as_of) - start).dt.days + 1
+    planned = (elapsed / duration.where(duration > 0)).clip(0.0, 1.0)
+
+    pv = bac * planned.to_numpy()
+    ev = bac * df['progress'].fillna(0.0).clip(0.0, 100.0).to_numpy() / 100.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cpi = np.where(ac > 0, ev / ac, np.nan)
+        spi = np.where(pv > 0, ev / pv, np.nan)
+        eac = np.where(cpi > 0, bac / cpi, ac + bac - ev)
+        tcpi = np.where(bac - ac > 0, (bac - ev) / (bac - ac), np.nan)
+
+    df['PV'], df['EV'], df['AC'] = pv, ev, ac
+    df['CV'], df['SV'] = ev - ac, ev - pv
+    df['CPI'], df['SPI'], df['EAC'], df['TCPI'] = cpi, spi, eac, tcpi
+    df['ETC'] = eac - ac
+    df['VAC'] = bac - eac
+    df['man_hours'] = man_hours
+    return df
+
+
+def _write_results(df, computed_at):
+    table = ProjectTask.__table__
+    values = {column: bindparam(f'v_{column}') for column in RESULT_COLUMNS}
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam('task_id'))
+        # EVM results are derived data: leave the user-facing updated_at alone
+        .values(**values, evm_computed_at=computed_at, updated_at=table.c.updated_at)
+    )
+    results = df[RESULT_COLUMNS].astype(object).where(df[RESULT_COLUMNS].notna(), None)
+    params = [
+        {'task_id': int(task_id), **{f'v_{c}': v for c, v in zip(RESULT_COLUMNS, row)}}
+        for task_id, row in zip(df['id'], results.itertuples(index=False, name=None))
+    ]
+    db.session.connection().execute(stmt, params)
+
+
+def run_evm(project_ids=None, incremental=False, as_of=None):
+    """Recompute the EVM fields of ``ProjectTask`` and return the number of tasks written.
+
+    ``project_ids`` limits the run to some projects; ``incremental`` skips
+    projects with nothing new since their last run.  Does not commit.
+    """
+    as_of = as_of or date.today()
+    computed_at = datetime.utcnow()
+
+    tasks = _load_tasks(project_ids)
+    if tasks.empty:
+        return 0
+
+    ids = [int(i) for i in tasks['project_id'].unique()]
+    projects = _load_projects(ids)
+    actuals = _load_actuals(ids, as_of)
+
+    if incremental:
+        stale = _stale_projects(tasks, projects, actuals, as_of)
+        tasks = tasks[tasks['project_id'].isin(stale)]
+        actuals = actuals[actuals['project_id'].isin(stale)]
+        if tasks.empty:
+            return 0
+
+    results = compute_indices(tasks, projects, actuals, as_of)
+    _write_results(results, computed_at)
+
+    # Project-level earned/planned value feed the progress time series
+    totals = results.groupby('project_id')[['EV', 'PV']].sum()
+    for project_id, row in totals.iterrows():
+        progress_series.record_snapshot(db.session, int(project_id), as_of,
+                                        earned_value=float(row['EV']), planned_value=float(row['PV']))
+    return len(results)
+
+
+__all__ = [
+    "RESULT_COLUMNS",
+    "compute_indices",
+    "run_evm",
+]
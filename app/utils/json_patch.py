@@ -0,0 +1,129 @@
+"""Minimal RFC 6902 (JSON Patch) / RFC 6901 (JSON Pointer) implementation.
+
+Used by the draft autosave endpoint to apply small deltas to a tab's entry
+list instead of receiving the whole list on every save.  Supports all six
+operations (``add``, ``remove``, ``replace``, ``move``, ``copy``, ``test``).
+Patches are applied to a deep copy, so a failing operation leaves the
+original document untouched.
+"""
+
+import copy
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch is malformed or cannot be applied."""
+
+
+def _parse_pointer(pointer):
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"JSON pointer must start with '/': {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _array_index(container, token, allow_end=False):
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(doc, tokens):
+    """Return the value at ``tokens`` inside ``doc``."""
+    node = doc
+    for token in tokens:
+        if isinstance(node, list):
+            node = node[_array_index(node, token)]
+        elif isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        else:
+            raise JsonPatchError(f"Cannot traverse into scalar at: /{'/'.join(tokens)}")
+    return node
+
+
+def _add(doc, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    last = tokens[-1]
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, last, allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[last] = value
+    else:
+        raise JsonPatchError("Cannot add to a scalar value")
+    return doc
+
+
+def _remove(doc, tokens):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve(doc, tokens[:-1])
+    last = tokens[-1]
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, last))
+    if isinstance(parent, dict):
+        if last not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(last)
+    raise JsonPatchError("Cannot remove from a scalar value")
+
+
+def apply_patch(document, patch):
+    """Return a new document with the RFC 6902 ``patch`` applied.
+
+    Raises :class:`JsonPatchError` on a malformed operation, a missing path
+    or a failed ``test``.
+    """
+    if not isinstance(patch, list):
+        raise JsonPatchError("Patch must be a list of operations")
+
+    doc = copy.deepcopy(document)
+    for op in patch:
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise JsonPatchError(f"Invalid patch operation: {op!r}")
+        kind = op["op"]
+        tokens = _parse_pointer(op["path"])
+
+        if kind in ("add", "replace", "test") and "value" not in op:
+            raise JsonPatchError(f"'{kind}' operation requires a value")
+
+        if kind == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            _remove(doc, tokens)
+        elif kind == "replace":
+            _resolve(doc, tokens)  # target must exist
+            if tokens:
+                _remove(doc, tokens)
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif kind in ("move", "copy"):
+            source = _parse_pointer(op.get("from"))
+            if kind == "move" and tokens[:len(source)] == source and tokens != source:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            value = copy.deepcopy(_resolve(doc, source))
+            if kind == "move":
+                _remove(doc, source)
+            doc = _add(doc, tokens, value)
+        elif kind == "test":
+            if _resolve(doc, tokens) != op["value"]:
+                raise JsonPatchError(f"Test failed at {op['path']}")
+        else:
+            raise JsonPatchError(f"Unknown patch operation: {kind!r}")
+    return doc
+
+
+__all__ = [
+    "JsonPatchError",
+    "apply_patch",
+]
@@ -0,0 +1,179 @@
+"""Versioned in-memory cache for master-data dropdown payloads.
+
+Every master table (workers, equipment, activity codes…) has a version
+counter that is bumped after a commit that inserted, updated or deleted
+rows of that table.  :func:`cached_json` keeps the serialized JSON body of
+each dropdown endpoint together with the table versions it was built from
+and a strong ETag (SHA-256 of the body).  While the versions are unchanged
+the body is served from memory, and a client sending a matching
+``If-None-Match`` gets ``304 Not Modified`` without any database access.
+
+Versions are per process.  Entries also expire after
+``MASTER_DATA_CACHE_TTL`` seconds so that writes made by another worker
+process are picked up eventually.
+"""
+
+import hashlib
+import threading
+import time
+
+from flask import current_app, request, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_lock = threading.Lock()
+_versions = {}
+_entries = {}
+
+_CHANGED_KEY = 'master_cache_changed_tables'
+
+
+def table_version(table_name):
+    """Return the current version counter of ``table_name``."""
+    return _versions.get(table_name, 0)
+
+
+def bump_tables(*table_names):
+    """Invalidate every cached payload built from ``table_names``."""
+    with _lock:
+        for name in table_names:
+            _versions[name] = _versions.get(name, 0) + 1
+
+
+def clear_master_cache():
+    """Forget every cached payload (versions are kept)."""
+    with _lock:
+        _entries.clear()
+
+
+def _table_names(models):
+    return tuple(m.__table__.name for m in models)
+
+
+def _cached_entry(name, models, build, scope):
+    """Return the cache entry for ``(name, scope)``, rebuilding it if stale.
+
+    Returns ``(entry, None)`` on success or ``(None, (payload, status))``
+    when ``build`` reported a non-200 status (such payloads are not cached).
+    """
+    tables = _table_names(models)
+    key = (name, scope)
+    ttl = current_app.config.get('MASTER_DATA_CACHE_TTL', 300)
+
+    with _lock:
+        versions = tuple(_versions.get(t, 0) for t in tables)
+        entry = _entries.get(key)
+    if entry and (entry['versions'] != versions or time.monotonic() - entry['built_at'] > ttl):
+        entry = None
+    if entry is not None:
+        return entry, None
+
+    payload, status = build()
+    if status != 200:
+        return None, (payload, status)
+    body = current_app.json.dumps(payload).encode('utf-8')
+    entry = {
+        'versions': versions,
+        'payload': payload,
+        'body': body,
+        'etag': hashlib.sha256(body).hexdigest(),
+        'built_at': time.monotonic(),
+    }
+    with _lock:
+        # Don't store a payload that a concurrent commit already outdated.
+        if tuple(_versions.get(t, 0) for t in tables) == versions:
+            _entries[key] = entry
+    return entry, None
+
+
+def cached_payload(name, models, build, scope=None):
+    """Return ``(payload, status)`` for a master-data payload, from cache if fresh.
+
+    Same arguments as :func:`cached_json`; used when several payloads are
+    combined into one response.  The returned payload must not be mutated.
+    """
+    entry, failed = _cached_entry(name, models, build, scope)
+    if failed:
+        return failed
+    return entry['payload'], 200
+
+
+def cached_json(name, models, build, scope=None):
+    """Return a JSON response for a master-data endpoint, served from cache.
+
+    ``models`` are the mapped classes the payload is derived from and
+    ``build`` is a zero-argument callable returning ``(payload, status)``.
+    ``scope`` distinguishes payloads of the same endpoint that depend on
+    request state, e.g. the active project.  Only ``200`` payloads are
+    cached and tagged.
+    """
+    entry, failed = _cached_entry(name, models, build, scope)
+    if failed:
+        payload, status = failed
+        return make_response(current_app.json.response(payload), status)
+
+    if request.if_none_match.contains(entry['etag']):
+        response = make_response('', 304)
+    else:
+        response = make_response(entry['body'], 200)
+        response.mimetype = 'application/json'
+    response.set_etag(entry['etag'])
+    # Clients may keep the copy but must revalidate it on every use.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# ─── Invalidation ──────────────────────────────────────────────────────────────
+
+def _changed(session):
+    return session.info.setdefault(_CHANGED_KEY, set())
+
+
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, '__table__', None)
+        if table is not None:
+            _changed(session).add(table.name)
+
+
+def _track_bulk_statement(orm_execute_state):
+    # insert()/update()/delete() executed through the session bypass flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _changed(orm_execute_state.session).add(mapper.local_table.name)
+
+
+def _bump_on_commit(session):
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        bump_tables(*changed)
+
+
+def _forget_on_rollback(session, previous_transaction):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+_listeners_installed = False
+
+
+def init_app(app):
+    """Install the commit listeners (once) and start from an empty cache."""
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Session, 'after_flush', _track_flush)
+        event.listen(Session, 'do_orm_execute', _track_bulk_statement)
+        event.listen(Session, 'after_commit', _bump_on_commit)
+        event.listen(Session, 'after_soft_rollback', _forget_on_rollback)
+        _listeners_installed = True
+    clear_master_cache()
+
+
+__all__ = [
+    "cached_json",
+    "cached_payload",
+    "table_version",
+    "bump_tables",
+    "clear_master_cache",
+    "init_app",
+]
@@ -0,0 +1,121 @@
+"""JSON payload builders for the master-data dropdowns.
+
+Each builder returns ``(payload, status)`` as expected by
+:func:`app.utils.master_cache.cached_json`.  They are shared by the
+individual ``/…/list`` endpoints and by ``/data-entry/bootstrap`` so that
+both serve identical shapes from the same cache entries.
+"""
+
+from flask import current_app
+
+from app.models.workforce_models import Worker
+from app.models.equipment_models import Equipment
+from app.models.core_models import ActivityCode, PaymentItem, CWPackage
+from app.models.material_models import Material
+from app.models.subcontractor_models import Subcontractor
+
+_EQUIPMENT_STATUSES = ['operational', 'under_maintenance', 'out_of_service']
+
+
+def workers_payload():
+    workers = Worker.query.all()
+    current_app.logger.info(f"Fetched {len(workers)} workers from the database.")
+
+    # Validate and filter only workers with valid fields
+    valid_workers = [
+        {'id': worker.id, 'name': worker.name}
+        for worker in workers if worker.id and worker.name
+    ]
+    return {'workers': valid_workers}, 200
+
+
+def equipment_payload():
+    equipment = Equipment.query.all()
+    current_app.logger.info(f"Fetched {len(equipment)} equipment items from database.")
+
+    # ✅ Check if the database has no equipment records
+    if not equipment:
+        return {'message': "No equipment found in the database.", 'equipment': []}, 200
+
+    # ✅ Filter out invalid rows (skip NULL names or statuses)
+    equipment_list = [
+        {
+            'id': equip.id,
+            'name': equip.name if equip.name else "Unnamed Equipment",
+            'serial_number': equip.serial_number if equip.serial_number else "Unknown Serial",
+            'maintenance_status': equip.maintenance_status if equip.maintenance_status in _EQUIPMENT_STATUSES else "operational"
+        }
+        for equip in equipment if equip.name and equip.maintenance_status
+    ]
+
+    # ✅ If all records were invalid, return an empty response with a warning message
+    if not equipment_list:
+        return {'message': "All equipment records are invalid or missing required fields.", 'equipment': []}, 200
+
+    return {'equipment': equipment_list}, 200
+
+
+def activity_codes_payload():
+    activity_codes = ActivityCode.query.all()
+
+    if not activity_codes:
+        return {'status': 'error', 'message': 'No activity codes found'}, 404
+
+    # Return both the activity code and description
+    activity_codes_list = [{
+        "id": ac.id,
+        "code": ac.code,
+        "description": ac.description
+    } for ac in activity_codes]
+
+    return {'status': 'success', 'activity_codes': activity_codes_list}, 200
+
+
+def payment_items_payload():
+    # Query all payment items, ordered by the item name
+    items = PaymentItem.query.order_by(PaymentItem.item_name).all()
+    return {
+        'payment_items': [
+            {
+                'id': item.id,
+                'payment_code': item.payment_code,
+                'item_name': item.item_name
+            }
+            for item in items
+        ]
+    }, 200
+
+
+def materials_payload():
+    materials = Material.query.all()
+    material_list = [
+        {"id": m.id, "name": m.name, "cost_per_unit": m.cost_per_unit, "unit": m.unit}
+        for m in materials
+    ]
+    return {"materials": material_list}, 200
+
+
+def cwps_payload(project_number):
+    cwps = CWPackage.query.filter_by(project_id=project_number).all()
+    return {
+        'cwps': [
+            {'code': c.code, 'name': c.name}
+            for c in cwps
+        ]
+    }, 200
+
+
+def subcontractors_payload(project_id):
+    subcontractors = Subcontractor.query.filter_by(project_id=project_id).all()
+    return {"subcontractors": [sub.to_dict() for sub in subcontractors]}, 200
+
+
+__all__ = [
+    "workers_payload",
+    "equipment_payload",
+    "activity_codes_payload",
+    "payment_items_payload",
+    "materials_payload",
+    "cwps_payload",
+    "subcontractors_payload",
+]
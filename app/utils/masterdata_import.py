@@ -0,0 +1,519 @@
+"""Bulk import of the master-data CSV set (``ZVelix/``).
+
+Each file is read once as strings and normalised column by column with
+pandas (currency such as ``"$4,200,000.00"`` or ``" $120.00 "``, dates,
+yes/no flags, enum spellings like ``"not started"``).  Foreign keys --
+project numbers, activity codes, task row ids -- are resolved through
+dictionaries loaded with one query per table.
+
+Rows are matched to existing records on their natural key (project number,
+activity code, worker id…).  New rows are written with one bulk INSERT and
+existing ones with one bulk UPDATE by primary key, table by table in
+dependency order.  A row that cannot be imported is rejected with its CSV
+line number and the reason; a bad optional value only clears that field
+and is reported as a warning.
+
+Helpers do not commit; callers do.
+"""
+
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, select, update
+
+from .. import db
+from ..models import (ActivityCode, Equipment, Material, PaymentItem, Project, ProjectTask,
+                      PurchaseOrder, WorkOrder, Worker)
+from .project_resolver import clear_project_cache
+
+ENCODINGS = ('utf-8-sig', 'cp1252')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'oui', 'o', 'x'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'non'}
+
+
+class MasterDataError(Exception):
+    """Raised when a file cannot be imported at all (unreadable, key column missing)."""
+
+
+@dataclass
+class TableReport:
+    """Outcome of importing one file."""
+    table: str
+    inserted: int = 0
+    updated: int = 0
+    rejects: list = field(default_factory=list)    # [(csv line, reason)]
+    warnings: list = field(default_factory=list)   # [(csv line, message)]
+
+
+def read_csv(path):
+    """Read ``path`` as strings, trying UTF-8 then Windows-1252."""
+    for encoding in ENCODINGS:
+        try:
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding=encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise MasterDataError(f"{os.path.basename(path)}: unsupported text encoding")
+    frame.columns = frame.columns.str.strip()
+    # Spreadsheet exports often end with rows of empty cells
+    blank = frame.apply(lambda col: col.str.strip().eq('')).all(axis=1)
+    return frame[~blank]
+
+
+def _choice_key(series):
+    return series.str.strip().str.lower().str.replace(r'[\s\-]+', '_', regex=True)
+
+
+class _Batch:
+    """Normalised values of one CSV file plus its reject/warning bookkeeping."""
+
+    def __init__(self, frame, report, filename):
+        self.frame = frame
+        self.report = report
+        self.filename = filename
+        self.values = pd.DataFrame(index=frame.index)
+        self.rejected = pd.Series(False, index=frame.index)
+
+    @staticmethod
+    def line(index):
+        return int(index) + 2  # header is line 1
+
+    def _raw(self, src, required):
+        if src not in self.frame:
+            if required:
+                raise MasterDataError(f"{self.filename}: missing column '{src}'")
+            return None
+        return self.frame[src].str.strip()
+
+    def _flag(self, mask, message, src, reject):
+        mask = mask & ~self.rejected
+        target = self.report.rejects if reject else self.report.warnings
+        for index in mask[mask].index:
+            target.append((self.line(index), message.format(
+                column=src, value=self.frame.at[index, src] if src in self.frame else '')))
+        if reject:
+            self.rejected |= mask
+
+    def reject(self, mask, message, src=''):
+        self._flag(mask, message, src, reject=True)
+
+    def warn(self, mask, message, src=''):
+        self._flag(mask, message, src, reject=False)
+
+    def _missing(self, col, src, required):
+        if required:
+            self.reject(self.values[col].isna(), "{column} is required", src)
+
+    def text(self, col, src, required=False, max_length=None):
+        raw = self._raw(src, required)
+        if raw is None:
+            return
+        if max_length:
+            self.warn(raw.str.len() > max_length, f"{{column}} truncated to {max_length} characters", src)
+            raw = raw.str.slice(0, max_length)
+        self.values[col] = raw.where(raw.ne(''), None)
+        self._missing(col, src, required)
+
+    def number(self, col, src, required=False, integer=False):
+        """Parse plain numbers and currency (``$``, thousands separators, ``(neg)``)."""
+        raw = self._raw(src, required)
+        if raw is None:
+            return
+        cleaned = (raw.str.replace(r'[\s$,]', '', regex=True)
+                      .str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+                      .str.rstrip('%'))
+        parsed = pd.to_numeric(cleaned.where(cleaned.ne('')), errors='coerce')
+        bad = cleaned.ne('') & parsed.isna()
+        if integer:
+            bad |= parsed.notna() & (parsed % 1 != 0)
+        (self.reject if required else self.warn)(bad, "{column} '{value}' is not a number", src)
+        parsed = parsed.where(~bad)
+        self.values[col] = parsed.astype('Int64') if integer else parsed
+        self._missing(col, src, required)
+
+    def date(self, col, src, required=False, with_time=False):
+        raw = self._raw(src, required)
+        if raw is None:
+            return
+        parsed = pd.to_datetime(raw.where(raw.ne('')), errors='coerce', format='mixed')
+        bad = raw.ne('') & parsed.isna()
+        (self.reject if required else self.warn)(bad, "{column} '{value}' is not a date", src)
+        self.values[col] = parsed if with_time else parsed.dt.date.where(parsed.notna())
+        self._missing(col, src, required)
+
+    def boolean(self, col, src):
+        raw = self._raw(src, False)
+        if raw is None:
+            return
+        key = raw.str.lower()
+        parsed = pd.Series(None, index=raw.index, dtype=object)
+        parsed[key.isin(TRUE_VALUES)] = True
+        parsed[key.isin(FALSE_VALUES)] = False
+        self.warn(key.ne('') & parsed.isna(), "{column} '{value}' is not yes/no", src)
+        self.values[col] = parsed
+
+    def choice(self, col, src, choices, aliases=None, required=False):
+        raw = self._raw(src, required)
+        if raw is None:
+            return
+        key = _choice_key(raw).replace(aliases or {})
+        valid = key.isin(choices)
+        message = f"{{column}} '{{value}}' is not one of {', '.join(choices)}"
+        (self.reject if required else self.warn)(raw.ne('') & ~valid, message, src)
+        self.values[col] = key.where(valid, None)
+        self._missing(col, src, required)
+
+    def tags(self, col, src):
+        raw = self._raw(src, False)
+        if raw is None:
+            return
+        self.values[col] = raw.map(
+            lambda v: [t.strip() for t in v.split(',') if t.strip()] or None)
+
+    def lookup(self, col, src, mapping, label, required=False):
+        """Resolve ``src`` through ``mapping`` (e.g. project number -> id)."""
+        raw = self._raw(src, required)
+        if raw is None:
+            return
+        resolved = raw.map(mapping)
+        message = f"unknown {label} '{{value}}'"
+        (self.reject if required else self.warn)(raw.ne('') & resolved.isna(), message, src)
+        self.values[col] = resolved.astype('Int64')
+        self._missing(col, src, required)
+
+    def unique_in_file(self, cols, label):
+        """Reject every repeat of an already seen key (first one wins)."""
+        keys = self.values[cols]
+        repeated = keys.notna().all(axis=1) & keys.duplicated(keep='first')
+        self.reject(repeated & ~self.rejected, f"duplicate {label} in file")
+
+    def clear_conflicts(self, col, model, key_col, label, reject=False):
+        """Handle a secondary unique column (``col``) shared with another row.
+
+        Repeats within the file and values already owned by a record with a
+        different natural key are either rejected or cleared with a warning.
+        """
+        if col not in self.values:
+            return
+        owners = dict(db.session.execute(
+            select(model.__table__.c[col], model.__table__.c[key_col])
+            .where(model.__table__.c[col].in_(self.values[col].dropna().unique().tolist()))
+        ).all())
+        values = self.values[col].where(~self.rejected)
+        taken = values.map(owners).notna() & values.map(owners).ne(self.values[key_col])
+        conflict = values.notna() & (values.duplicated(keep='first') | taken)
+        if reject:
+            self.reject(conflict, f"{label} already used by another row")
+        else:
+            self.warn(conflict, f"{label} already used by another row; left empty")
+            self.values.loc[conflict, col] = None
+
+    def records(self):
+        """Rows that were not rejected, as plain-Python dicts."""
+        kept = self.values[~self.rejected].astype(object)
+        kept = kept.where(kept.notna(), None)
+        return [
+            {k: (v.item() if isinstance(v, np.generic) else v) for k, v in row.items()}
+            for row in kept.to_dict('records')
+        ]
+
+
+def _upsert(model, key_cols, rows, report):
+    """Insert new rows and update existing ones (matched on ``key_cols``) in bulk."""
+    table = model.__table__
+    existing = {
+        tuple(row[:-1]): row[-1]
+        for row in db.session.execute(select(*(table.c[k] for k in key_cols), table.c.id))
+    }
+    inserts, updates = [], []
+    for row in rows:
+        row_id = existing.get(tuple(row[k] for k in key_cols))
+        if row_id is None:
+            inserts.append(row)
+        else:
+            updates.append({'id': row_id, **row})
+    if inserts:
+        db.session.execute(insert(model), inserts)
+    if updates:
+        db.session.execute(update(model), updates)
+    report.inserted += len(inserts)
+    report.updated += len(updates)
+
+
+def _key_map(*columns):
+    return {row[0]: row[1] for row in db.session.execute(select(*columns))}
+
+
+# ─── One importer per file ─────────────────────────────────────────────────────
+
+def _enum_values(column):
+    return tuple(column.type.enums)
+
+
+def import_projects(batch, context):
+    batch.text('project_number', 'project_number', required=True, max_length=50)
+    batch.text('name', 'name', required=True, max_length=255)
+    batch.text('description', 'description', max_length=500)
+    batch.text('category', 'category', required=True, max_length=100)
+    batch.choice('status', 'status', _enum_values(Project.status))
+    for col in ('client_name', 'project_manager', 'address'):
+        batch.text(col, col, max_length=255)
+    for col in ('budget', 'original_budget', 'revised_budget', 'contingency_fund',
+                'latitude', 'longitude'):
+        batch.number(col, col)
+    batch.warn(batch.values.get('latitude', pd.Series(dtype=float)).abs() > 90,
+               "latitude out of range", 'latitude')
+    batch.warn(batch.values.get('longitude', pd.Series(dtype=float)).abs() > 180,
+               "longitude out of range", 'longitude')
+    batch.choice('risk_level', 'risk_level', _enum_values(Project.risk_level))
+    batch.text('risk_notes', 'risk_notes')
+    batch.text('map_url', 'map_url')
+    batch.text('picture_url', 'pictures_url')
+    batch.text('video_capture_url', 'videos_capture_url')
+    batch.date('start_date', 'start_date')
+    batch.date('end_date', 'end_date')
+    batch.text('notes', 'notes')
+    batch.text('plan_repository_url', 'Bleubam_plan_repository_url')
+    batch.text('collaboration_url', 'Sharepoint link')
+    batch.tags('tags', 'tags(mots-cles)')
+    batch.number('critical_path_duration', 'critical_path_duration', integer=True)
+    batch.text('bim_file_url', 'bim_file_url')
+    batch.text('bim_model_id', 'bim_model_id', max_length=255)
+
+    batch.unique_in_file(['project_number'], 'project_number')
+    batch.clear_conflicts('name', Project, 'project_number', 'project name', reject=True)
+    _upsert(Project, ['project_number'], batch.records(), batch.report)
+    clear_project_cache()
+    context['projects'] = _key_map(Project.project_number, Project.id)
+
+
+def import_activity_codes(batch, context):
+    batch.text('code', 'activity_code', required=True, max_length=50)
+    batch.text('description', 'description', required=True, max_length=255)
+    batch.text('unit', 'unit', max_length=50)
+    batch.number('std_man_hours_per_unit', 'st_man-hours_per-unit')
+    batch.unique_in_file(['code'], 'activity code')
+    _upsert(ActivityCode, ['code'], batch.records(), batch.report)
+    context['activity_codes'] = _key_map(ActivityCode.code, ActivityCode.id)
+
+
+def import_materials(batch, context):
+    batch.text('material_id', 'material_id', required=True, max_length=100)
+    batch.text('name', 'name', required=True, max_length=255)
+    batch.text('unit', 'unit', max_length=50)
+    batch.number('cost_per_unit', 'std_cost_per_unit')
+    batch.text('description', 'description')
+    batch.unique_in_file(['material_id'], 'material_id')
+    _upsert(Material, ['material_id'], batch.records(), batch.report)
+
+
+def import_equipment(batch, context):
+    batch.text('equipment_id', 'equipment_id', required=True, max_length=100)
+    batch.text('name', 'name', required=True, max_length=255)
+    batch.text('serial_number', 'serial_number', max_length=100)
+    batch.text('assigned_to', 'assigned_to', max_length=100)
+    batch.choice('maintenance_status', 'maintenance_status',
+                 _enum_values(Equipment.maintenance_status))
+    batch.number('hourly_rate', 'hourly_rate')
+    batch.date('last_maintenance_date', 'last_maintenance_date', with_time=True)
+    batch.date('next_maintenance_date', 'next_maintenance_date', with_time=True)
+    batch.unique_in_file(['equipment_id'], 'equipment_id')
+    batch.clear_conflicts('serial_number', Equipment, 'equipment_id', 'serial number', reject=True)
+    _upsert(Equipment, ['equipment_id'], batch.records(), batch.report)
+
+
+def import_workers(batch, context):
+    batch.text('worker_id', 'worker_id', required=True, max_length=50)
+    batch.text('name', 'worker_name', required=True, max_length=255)
+    batch.choice('genre', 'genre', _enum_values(Worker.genre))
+    batch.text('code_postal', 'code_postal', max_length=10)
+    batch.text('num_cell', 'num_cell', max_length=15)
+    batch.text('courriel', 'courriel', max_length=255)
+    batch.tags('certifications', 'certifications')
+    batch.number('experience_years', 'experience_years', integer=True)
+    batch.text('metier', 'metier', max_length=100)
+    batch.text('convention', 'convention', max_length=100)
+    for col in ('taux_horaire', 'taux_over', 'Gite_couvert', 'transp_1', 'transp_2'):
+        batch.number(col, col)
+    batch.text('equip_asso', 'equip_asso', max_length=255)
+    batch.text('departement', 'departement', max_length=100)
+    batch.choice('role', 'role', _enum_values(Worker.role),
+                 aliases={'employe': 'worker', 'employee': 'worker', 'contremaitre': 'foreman'})
+    batch.unique_in_file(['worker_id'], 'worker_id')
+    # Email is the login: a shared address cannot belong to several workers
+    batch.clear_conflicts('courriel', Worker, 'worker_id', 'courriel')
+    _upsert(Worker, ['worker_id'], batch.records(), batch.report)
+
+
+def _task_key(values):
+    return list(zip(values['project_id'], values['activity_code_id'], values['name']))
+
+
+def import_project_tasks(batch, context):
+    batch.lookup('project_id', 'project_id', context['projects'], 'project', required=True)
+    batch.text('name', 'name', required=True, max_length=255)
+    batch.lookup('activity_code_id', 'activity_code_id', context['activity_codes'],
+                 'activity code', required=True)
+    batch.date('start_date', 'start_date')
+    batch.date('end_date', 'end_date')
+    batch.choice('status', 'status', _enum_values(ProjectTask.status))
+    batch.number('progress', 'progress %')
+    batch.number('man_hour_budget', 'man_hour_budget')
+    batch.text('unit', 'unit', max_length=50)
+    batch.number('qte', 'qte')
+    batch.number('PV', 'PV(Planned value)')
+    batch.unique_in_file(['project_id', 'activity_code_id', 'name'], 'task')
+    key = ['project_id', 'activity_code_id', 'name']
+    _upsert(ProjectTask, key, batch.records(), batch.report)
+
+    # Payment items and purchase orders refer to tasks by their row id in this file
+    db_ids = {
+        (p, a, n): (task_id, p)
+        for task_id, p, a, n in db.session.execute(
+            select(ProjectTask.id, ProjectTask.project_id, ProjectTask.activity_code_id, ProjectTask.name))
+    }
+    kept = batch.values[~batch.rejected]
+    file_ids = batch.frame.loc[kept.index, 'id'].str.strip() if 'id' in batch.frame else pd.Series(dtype=str)
+    context['tasks'] = {
+        file_id: db_ids.get(k)
+        for file_id, k in zip(file_ids, _task_key(kept.astype(object)))
+        if file_id
+    }
+
+
+def _lookup_task(batch, context):
+    """Resolve ``task_id`` (row id in project_tasks.csv) to a task of the same project."""
+    raw = batch._raw('task_id', False)
+    if raw is None or 'tasks' not in context:
+        return
+    resolved = raw.map(context['tasks'])
+    batch.warn(raw.ne('') & resolved.isna(), "unknown task '{value}'", 'task_id')
+    task_ids = resolved.map(lambda t: t[0] if isinstance(t, tuple) else None)
+    task_projects = resolved.map(lambda t: t[1] if isinstance(t, tuple) else None)
+    other_project = task_ids.notna() & task_projects.ne(batch.values['project_id'])
+    batch.warn(other_project, "task '{value}' belongs to another project; left empty", 'task_id')
+    batch.values['task_id'] = task_ids.where(~other_project).astype('Int64')
+
+
+def import_payment_items(batch, context):
+    batch.lookup('project_id', 'project_id', context['projects'], 'project', required=True)
+    batch.text('payment_code', 'payment_code', required=True, max_length=50)
+    batch.lookup('activity_code_id', 'activity_code_id', context['activity_codes'],
+                 'activity code', required=True)
+    _lookup_task(batch, context)
+    batch.text('item_name', 'item_name', required=True, max_length=255)
+    batch.text('unit', 'unit', max_length=50)
+    batch.number('rate_per_unit', 'rate_per_unit')
+    batch.date('created_at', 'created_at', with_time=True)
+    batch.unique_in_file(['payment_code'], 'payment_code')
+    _upsert(PaymentItem, ['payment_code'], batch.records(), batch.report)
+
+
+def _vendor_contacts(context):
+    contacts = context.get('contacts')
+    if contacts is None or 'name' not in contacts:
+        return pd.DataFrame()
+    columns = {
+        'Address': 'vendor_address',
+        'Contact': 'vendor_contact_name',
+        'Contact phone number': 'vendor_contact_phone',
+        'Contact email': 'vendor_contact_email',
+    }
+    found = [c for c in columns if c in contacts]
+    frame = contacts[['name', *found]].rename(columns=columns)
+    frame['name'] = frame['name'].str.strip().str.lower()
+    return frame.drop_duplicates('name').set_index('name')
+
+
+def import_purchase_orders(batch, context):
+    batch.text('order_number', 'order_number', required=True, max_length=50)
+    batch.text('vendor', 'vendor', required=True, max_length=255)
+    batch.lookup('project_id', 'project_id', context['projects'], 'project')
+    batch.lookup('activity_code_id', 'activity_code_id', context['activity_codes'], 'activity code')
+    _lookup_task(batch, context)
+    for col in ('quantity_purchased', 'unit_price', 'total_cost'):
+        batch.number(col, col)
+    batch.choice('procurement_group', 'procurement_group', _enum_values(PurchaseOrder.procurement_group))
+    batch.choice('procurement_type', 'procurement_type', _enum_values(PurchaseOrder.procurement_type),
+                 aliases={'materials': 'material'})
+    batch.date('delivery_date', 'delivery_date')
+    batch.text('delivery_location', 'delivery_location', max_length=255)
+    batch.text('link_to_supplier_quote', 'link_to_supplier_quote')
+    batch.boolean('is_change_order', 'is_change_order')
+
+    contacts = _vendor_contacts(context)
+    if not contacts.empty:
+        matched = contacts.reindex(batch.values['vendor'].str.lower())
+        for col in contacts.columns:
+            details = pd.Series(matched[col].str.strip().to_numpy(), index=batch.values.index)
+            batch.values[col] = details.where(details.notna() & details.ne(''), None)
+
+    batch.unique_in_file(['order_number'], 'order_number')
+    _upsert(PurchaseOrder, ['order_number'], batch.records(), batch.report)
+
+
+def import_work_orders(batch, context):
+    batch.lookup('project_id', 'project_id', context['projects'], 'project', required=True)
+    batch.text('sequential_number', 'sequential_number', required=True, max_length=10)
+    batch.text('description', 'description', required=True, max_length=255)
+    batch.choice('type', 'type', _enum_values(WorkOrder.type), required=True)
+    batch.choice('status', 'status', _enum_values(WorkOrder.status), aliases={'debuter': 'open'})
+    batch.number('estimated_cost', 'estimated_cost')
+    batch.lookup('activity_code_id', 'activity_code_id', context['activity_codes'], 'activity code')
+    batch.date('start_date', 'start_date')
+    batch.date('expected_completion_date', 'expected_completion_date')
+    batch.unique_in_file(['sequential_number'], 'sequential_number')
+    _upsert(WorkOrder, ['sequential_number'], batch.records(), batch.report)
+
+
+# (table, file name, importer) in dependency order
+IMPORTERS = [
+    ('projects', 'projects.csv', import_projects),
+    ('activity_codes', 'activity_codes.csv', import_activity_codes),
+    ('materials', 'materials.csv', import_materials),
+    ('equipment', 'equipment.csv', import_equipment),
+    ('workers', 'workers.csv', import_workers),
+    ('project_tasks', 'project_tasks.csv', import_project_tasks),
+    ('payment_items', 'payment_items.csv', import_payment_items),
+    ('purchase_orders', 'purchase_orders.csv', import_purchase_orders),
+    ('work_orders', 'work_orders.csv', import_work_orders),
+]
+CONTACTS_FILE = 'Contacts.csv'
+
+
+def import_masterdata(directory, tables=None):
+    """Import every known CSV found in ``directory``; return ``[TableReport]``.
+
+    ``tables`` restricts the run to some table names.  Projects and activity
+    codes already in the database are always available for lookups.
+    """
+    context = {
+        'projects': _key_map(Project.project_number, Project.id),
+        'activity_codes': _key_map(ActivityCode.code, ActivityCode.id),
+    }
+    contacts_path = os.path.join(directory, CONTACTS_FILE)
+    if os.path.exists(contacts_path):
+        context['contacts'] = read_csv(contacts_path)
+
+    reports = []
+    for table, filename, importer in IMPORTERS:
+        path = os.path.join(directory, filename)
+        if (tables and table not in tables) or not os.path.exists(path):
+            continue
+        report = TableReport(table)
+        importer(_Batch(read_csv(path), report, filename), context)
+        db.session.flush()
+        reports.append(report)
+    return reports
+
+
+__all__ = [
+    "IMPORTERS",
+    "MasterDataError",
+    "TableReport",
+    "read_csv",
+    "import_masterdata",
+]
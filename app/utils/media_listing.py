@@ -0,0 +1,175 @@
+"""Keyset-paginated listing of pictures and documents.
+
+Rows are read newest first, ordered by ``(uploaded_at DESC, id DESC)``, and
+each page resumes strictly after the last row of the previous one instead
+of using ``OFFSET``.  The position is returned to clients as an opaque
+``cursor`` string.  When pictures and documents are listed together each
+table is paged on its own and the two pages are merged, so the cursor
+stores one position per table.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+
+from flask import url_for
+from sqlalchemy import and_, or_, select
+
+from .. import db
+from ..models import Document, DailyPicture
+from .entry_serializers import upload_relative_path
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_STATUSES = ('pending', 'committed')
+
+MEDIA_MODELS = {
+    'picture': DailyPicture,
+    'document': Document,
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a ``cursor`` query value cannot be decoded."""
+
+
+def parse_args(args):
+    """Read ``start``/``end`` (or ``date``), ``status`` and ``limit`` from a query string.
+
+    Returns ``(options, error)`` where ``options`` holds keyword arguments
+    for :func:`list_media` and ``error`` is a message for a 400 response.
+    """
+    try:
+        if args.get('date'):
+            start = end = date.fromisoformat(args['date'])
+        else:
+            start = date.fromisoformat(args['start']) if args.get('start') else None
+            end = date.fromisoformat(args['end']) if args.get('end') else None
+    except ValueError:
+        return None, "Dates must be in YYYY-MM-DD format"
+
+    statuses = tuple(s for s in args.get('status', '').split(',') if s) or DEFAULT_STATUSES
+    if not set(statuses) <= set(DEFAULT_STATUSES):
+        return None, f"status must be one of {', '.join(DEFAULT_STATUSES)}"
+
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return None, "limit must be an integer"
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return None, f"limit must be between 1 and {MAX_PAGE_SIZE}"
+
+    return {'start': start, 'end': end, 'statuses': statuses, 'limit': limit,
+            'cursor': args.get('cursor')}, None
+
+
+def encode_cursor(positions):
+    """Encode ``{kind: (uploaded_at, id)}`` as an opaque cursor string."""
+    payload = {
+        kind: [uploaded_at.isoformat() if uploaded_at else None, row_id]
+        for kind, (uploaded_at, row_id) in positions.items()
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of :func:`encode_cursor`; raise :class:`InvalidCursor` if malformed."""
+    if not cursor:
+        return {}
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return {
+            kind: (datetime.fromisoformat(ts) if ts else None, int(row_id))
+            for kind, (ts, row_id) in payload.items()
+            if kind in MEDIA_MODELS
+        }
+    except (binascii.Error, ValueError, TypeError, AttributeError) as exc:
+        raise InvalidCursor(str(exc)) from exc
+
+
+def _after(model, position):
+    """Rows strictly after ``position`` in ``(uploaded_at DESC NULLS LAST, id DESC)`` order."""
+    uploaded_at, row_id = position
+    if uploaded_at is None:
+        return and_(model.uploaded_at.is_(None), model.id < row_id)
+    return or_(
+        model.uploaded_at < uploaded_at,
+        and_(model.uploaded_at == uploaded_at, model.id < row_id),
+        model.uploaded_at.is_(None),
+    )
+
+
+def _page(model, project_id, start, end, statuses, position, limit):
+    stmt = select(model).where(model.project_id == project_id, model.status.in_(statuses))
+    if start:
+        stmt = stmt.where(model.uploaded_at >= datetime.combine(start, time.min))
+    if end:
+        stmt = stmt.where(model.uploaded_at <= datetime.combine(end, time.max))
+    if position:
+        stmt = stmt.where(_after(model, position))
+    stmt = stmt.order_by(model.uploaded_at.desc().nulls_last(), model.id.desc()).limit(limit + 1)
+    return db.session.execute(stmt).scalars().all()
+
+
+def _sort_key(kind_and_row):
+    _, row = kind_and_row
+    return (row.uploaded_at is not None, row.uploaded_at or datetime.min, row.id)
+
+
+def list_media(project_id, kinds=tuple(MEDIA_MODELS), start=None, end=None,
+               statuses=DEFAULT_STATUSES, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return ``(rows, next_cursor)``; ``rows`` is a list of ``(kind, record)``.
+
+    ``next_cursor`` is ``None`` on the last page.
+    """
+    positions = decode_cursor(cursor)
+    candidates = []
+    exhausted = {}
+    for kind in kinds:
+        rows = _page(MEDIA_MODELS[kind], project_id, start, end, statuses,
+                     positions.get(kind), limit)
+        exhausted[kind] = len(rows) <= limit
+        candidates.extend((kind, row) for row in rows[:limit])
+
+    candidates.sort(key=_sort_key, reverse=True)
+    page = candidates[:limit]
+
+    for kind, row in page:
+        positions[kind] = (row.uploaded_at, row.id)
+    remaining = len(candidates) > len(page) or not all(exhausted.values())
+    return page, (encode_cursor(positions) if remaining and page else None)
+
+
+def serialize_media(kind, record):
+    """Serialize a picture or document row for the media lists."""
+    item = {
+        'id': record.id,
+        'type': kind,
+        'filename': record.file_name,
+        'description': record.description if kind == 'picture' else (record.doc_notes or ''),
+        'url': url_for('documents_bp.download_document', filename=upload_relative_path(record.file_url)),
+        'status': record.status,
+        'uploaded_at': record.uploaded_at.isoformat() if record.uploaded_at else None,
+    }
+    if kind == 'picture':
+        item['thumbnail_url'] = url_for('media_bp.picture_thumbnail', picture_id=record.id, size='thumb')
+        item['taken_at'] = record.taken_at.isoformat() if record.taken_at else None
+    elif record.file_name.lower().endswith('.pdf'):
+        item['type'] = 'pdf'
+    return item
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "MEDIA_MODELS",
+    "InvalidCursor",
+    "parse_args",
+    "encode_cursor",
+    "decode_cursor",
+    "list_media",
+    "serialize_media",
+]
@@ -0,0 +1,115 @@
+"""Flag repeated SQL statements within one request (N+1 query patterns).
+
+Every parameterised statement a request runs is reduced to a fingerprint:
+the SQL text with whitespace collapsed and expanded ``IN`` lists folded to
+a single placeholder.  Running the same fingerprint more than
+``N_PLUS_ONE_THRESHOLD`` times in one request usually means a relationship
+is lazy-loaded inside a loop.  What happens then depends on
+``N_PLUS_ONE_MODE``:
+
+``'off'``
+    nothing is tracked.
+``'warn'``
+    a warning naming the endpoint and the statement is logged (development).
+``'raise'``
+    :class:`RepeatedQueryError` is raised once the view has returned, so the
+    test client sees it (the testing config).
+
+Code that repeats a statement on purpose can run inside :func:`allow_repeats`.
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MODES = ('off', 'warn', 'raise')
+
+_PLACEHOLDER = r'(?:\?|%\(\w+\)s|%s|:\w+)'
+_IN_LIST = re.compile(rf'\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_listeners_installed = False
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in ``'raise'`` mode when a request repeats a statement too often."""
+
+
+def fingerprint(statement):
+    """Normalise ``statement`` so executions differing only in parameters match."""
+    text = _WHITESPACE.sub(' ', statement).strip()
+    return _IN_LIST.sub('(?)', text)
+
+
+@contextmanager
+def allow_repeats():
+    """Do not count statements run inside this block."""
+    previous = g.get('n_plus_one_paused', False)
+    g.n_plus_one_paused = True
+    try:
+        yield
+    finally:
+        g.n_plus_one_paused = previous
+
+
+def repeated_statements(counts, threshold):
+    """Return ``[(fingerprint, count)]`` for entries of ``counts`` over ``threshold``."""
+    return sorted(((sql, n) for sql, n in counts.items() if n > threshold),
+                  key=lambda item: -item[1])
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if not parameters or not has_request_context():
+        return
+    counts = g.get('n_plus_one_counts')
+    if counts is None or g.get('n_plus_one_paused'):
+        return
+    counts[fingerprint(statement)] += 1
+
+
+def _start_request():
+    if current_app.config.get('N_PLUS_ONE_MODE', 'off') != 'off':
+        g.n_plus_one_counts = Counter()
+
+
+def _check_request(response):
+    counts = g.pop('n_plus_one_counts', None)
+    if not counts:
+        return response
+    threshold = current_app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+    repeated = repeated_statements(counts, threshold)
+    if not repeated:
+        return response
+    details = '; '.join(f"{n}x {sql[:200]}" for sql, n in repeated)
+    message = (f"{request.method} {request.path} ({request.endpoint}) repeated "
+               f"statements more than {threshold} times: {details}")
+    if current_app.config.get('N_PLUS_ONE_MODE') == 'raise':
+        raise RepeatedQueryError(message)
+    current_app.logger.warning("Possible N+1 queries: %s", message)
+    return response
+
+
+def init_app(app):
+    """Install the statement counter (once) and check every request of ``app``."""
+    mode = app.config.get('N_PLUS_ONE_MODE', 'off')
+    if mode not in MODES:
+        raise ValueError(f"N_PLUS_ONE_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Engine, 'after_cursor_execute', _count_statement)
+        _listeners_installed = True
+    app.before_request(_start_request)
+    app.after_request(_check_request)
+
+
+__all__ = [
+    "RepeatedQueryError",
+    "fingerprint",
+    "allow_repeats",
+    "repeated_statements",
+    "init_app",
+]
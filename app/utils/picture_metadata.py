@@ -0,0 +1,241 @@
+"""EXIF/GPS metadata of uploaded pictures.
+
+New ``DailyPicture`` and ``DailyNoteAttachment`` rows are collected when the
+session flushes.  After commit their files are parsed in the picture worker
+pool (see :func:`app.utils.thumbnails.worker_pool`), so the upload request
+does not wait for them.  A background thread then writes every result back
+with one executemany UPDATE per table.
+
+Only empty columns are filled, so values typed in by users are kept:
+
+* ``taken_at``    – ``DateTimeOriginal`` (falls back to ``DateTime``)
+* ``coordinates`` – ``{"latitude", "longitude", "altitude"}`` from the GPS IFD
+* ``captured_by`` – ``Artist``, or the camera ``Make Model``
+* ``size``        – file size in MB
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import wait
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from sqlalchemy import JSON, bindparam, event, func, update
+from sqlalchemy.orm import Session
+
+from .. import db
+from . import thumbnails
+
+logger = logging.getLogger(__name__)
+
+METADATA_COLUMNS = ('taken_at', 'coordinates', 'captured_by', 'size')
+
+_EXIF_DATE_FORMAT = '%Y:%m:%d %H:%M:%S'
+
+
+def _rational(value):
+    return float(value) if value is not None else None
+
+
+def _degrees(dms, ref):
+    """Convert an EXIF (degrees, minutes, seconds) triple to signed decimal degrees."""
+    if not dms or len(dms) != 3:
+        return None
+    degrees, minutes, seconds = (_rational(v) for v in dms)
+    value = degrees + minutes / 60 + seconds / 3600
+    return -value if ref in ('S', 'W') else value
+
+
+def _exif_datetime(value):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value).strip('\x00 '), _EXIF_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', 'ignore')
+    value = (value or '').strip('\x00 ')
+    return value or None
+
+
+def extract_metadata(path):
+    """Return ``{column: value}`` for the metadata found in the picture at ``path``.
+
+    Runs in worker processes, so it only takes and returns plain values.
+    Columns without a value are left out.
+    """
+    from PIL import ExifTags, Image
+
+    values = {'size': round(os.path.getsize(path) / (1024 * 1024), 3)}
+    with Image.open(path) as image:
+        exif = image.getexif()
+    if not exif:
+        return values
+
+    details = exif.get_ifd(ExifTags.IFD.Exif)
+    taken_at = (_exif_datetime(details.get(ExifTags.Base.DateTimeOriginal))
+                or _exif_datetime(exif.get(ExifTags.Base.DateTime)))
+    if taken_at:
+        values['taken_at'] = taken_at
+
+    gps = exif.get_ifd(ExifTags.IFD.GPSInfo)
+    latitude = _degrees(gps.get(ExifTags.GPS.GPSLatitude), gps.get(ExifTags.GPS.GPSLatitudeRef))
+    longitude = _degrees(gps.get(ExifTags.GPS.GPSLongitude), gps.get(ExifTags.GPS.GPSLongitudeRef))
+    if latitude is not None and longitude is not None:
+        altitude = _rational(gps.get(ExifTags.GPS.GPSAltitude))
+        if altitude is not None and gps.get(ExifTags.GPS.GPSAltitudeRef) in (1, b'\x01'):
+            altitude = -altitude
+        values['coordinates'] = {
+            'latitude': round(latitude, 7),
+            'longitude': round(longitude, 7),
+            'altitude': altitude,
+        }
+
+    device = ' '.join(filter(None, (_text(exif.get(ExifTags.Base.Make)),
+                                    _text(exif.get(ExifTags.Base.Model)))))
+    captured_by = _text(exif.get(ExifTags.Base.Artist)) or device
+    if captured_by:
+        values['captured_by'] = captured_by[:255]
+    return values
+
+
+def _safe_extract(path):
+    try:
+        return extract_metadata(path)
+    except Exception as exc:
+        logger.warning("EXIF extraction failed for %s: %s", path, exc)
+        return None
+
+
+# ─── Bulk write-back ───────────────────────────────────────────────────────────
+
+def _tracked_models():
+    from ..models.daily_models import DailyPicture
+    from ..models.DailyNoteAttachment import DailyNoteAttachment
+
+    return {model.__tablename__: model for model in (DailyPicture, DailyNoteAttachment)}
+
+
+def _bind_type(column):
+    # The JSON type would bind Python None as the JSON text 'null'; keep it SQL NULL
+    if isinstance(column.type, JSON):
+        return JSON(none_as_null=True)
+    return column.type
+
+
+def write_metadata(results):
+    """Write ``[(table_name, row_id, values)]`` back with one UPDATE per table.
+
+    Returns the number of rows sent.
+    """
+    models = _tracked_models()
+    by_table = {}
+    for table_name, row_id, values in results:
+        if values:
+            params = {'b_id': row_id}
+            params.update({f'v_{col}': values.get(col) for col in METADATA_COLUMNS})
+            by_table.setdefault(table_name, []).append(params)
+
+    with db.engine.begin() as conn:
+        for table_name, rows in by_table.items():
+            table = models[table_name].__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam('b_id'))
+                .values({
+                    col: func.coalesce(table.c[col], bindparam(f'v_{col}', type_=_bind_type(table.c[col])))
+                    for col in METADATA_COLUMNS
+                })
+            )
+            conn.execute(stmt, rows)
+    return sum(len(rows) for rows in by_table.values())
+
+
+def _collect(app, jobs, futures):
+    wait(futures)
+    results = []
+    for (table_name, row_id, path), future in zip(jobs, futures):
+        exc = future.exception()
+        if exc is not None:
+            logger.warning("EXIF extraction failed for %s: %s", path, exc)
+            continue
+        results.append((table_name, row_id, future.result()))
+    with app.app_context():
+        try:
+            write_metadata(results)
+        except Exception:
+            logger.exception("Writing picture metadata failed")
+
+
+def schedule(jobs, workers=None):
+    """Extract and store metadata for ``[(table_name, row_id, path)]``.
+
+    With ``workers`` at 0 this happens inline; otherwise the files are parsed
+    in the worker pool and written back from a background thread.
+    """
+    if workers is None:
+        workers = current_app.config.get('THUMBNAIL_WORKERS', 2)
+    if workers <= 0:
+        return write_metadata([(table, row_id, _safe_extract(path)) for table, row_id, path in jobs])
+
+    pool = thumbnails.worker_pool(workers)
+    futures = [pool.submit(extract_metadata, path) for _, _, path in jobs]
+    threading.Thread(
+        target=_collect,
+        args=(current_app._get_current_object(), jobs, futures),
+        name='picture-metadata',
+        daemon=True,
+    ).start()
+    return len(jobs)
+
+
+# ─── Commit hook ───────────────────────────────────────────────────────────────
+
+def _track_new_pictures(session, flush_context):
+    if not has_app_context():
+        return
+    models = tuple(_tracked_models().values())
+    for obj in session.new:
+        if isinstance(obj, models) and obj.file_url and thumbnails.is_image(obj.file_name or obj.file_url):
+            session.info.setdefault('new_picture_metadata', []).append(
+                (obj.__tablename__, obj.id, thumbnails.source_path(obj)))
+
+
+def _extract_on_commit(session):
+    jobs = session.info.pop('new_picture_metadata', None)
+    if jobs:
+        try:
+            schedule(jobs)
+        except Exception:
+            logger.exception("Scheduling picture metadata extraction failed")
+
+
+def _forget_on_rollback(session, previous_transaction):
+    session.info.pop('new_picture_metadata', None)
+
+
+_listeners_installed = False
+
+
+def init_app(app):
+    """Install the commit listeners that queue metadata extraction (once)."""
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Session, 'after_flush', _track_new_pictures)
+        event.listen(Session, 'after_commit', _extract_on_commit)
+        event.listen(Session, 'after_soft_rollback', _forget_on_rollback)
+        _listeners_installed = True
+
+
+__all__ = [
+    "METADATA_COLUMNS",
+    "extract_metadata",
+    "write_metadata",
+    "schedule",
+    "init_app",
+]
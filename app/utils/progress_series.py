@@ -0,0 +1,225 @@
+"""Prefix-sum maintenance and range reads of ``project_progress``.
+
+Every point stores the day's deltas and the running totals up to that day.
+Adding a delta to a day touches that day's row and shifts the cumulative
+columns of all later rows of the project in one ``UPDATE``; reading an
+S-curve or the change over a period is then a range scan of the requested
+days (plus at most one row before it).
+
+Actual hours/cost follow the committed entries through
+``app.utils.cost_summaries``; earned and planned value are snapshots
+recorded by the EVM engine (``record_snapshot``).
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, insert, func, case, and_, exists
+
+from .. import db
+from ..models.project_progress import ProjectProgress
+from ..models.daily_cost_summary import DailyCostSummary
+
+# daily delta column -> prefix-sum column
+CUMULATIVE = {
+    'actual_hours': 'cumulative_actual_hours',
+    'actual_cost': 'cumulative_cost',
+    'earned_value': 'cumulative_earned_value',
+    'planned_value': 'cumulative_planned_value',
+}
+
+
+# ─── Writes ────────────────────────────────────────────────────────────────────
+
+def _point_before(session, project_id, day, inclusive=False):
+    table = ProjectProgress.__table__
+    bound = table.c.report_date <= day if inclusive else table.c.report_date < day
+    return session.execute(
+        select(*(table.c[c] for c in CUMULATIVE.values()))
+        .where(table.c.project_id == project_id, bound)
+        .order_by(table.c.report_date.desc())
+        .limit(1)
+    ).first()
+
+
+def _ensure_point(session, project_id, day, now):
+    """Create the row of ``day`` (carrying the previous running totals) if missing."""
+    table = ProjectProgress.__table__
+    found = session.execute(
+        select(table.c.id).where(table.c.project_id == project_id, table.c.report_date == day)
+    ).first()
+    if found:
+        return
+    previous = _point_before(session, project_id, day)
+    carried = dict(zip(CUMULATIVE.values(), previous)) if previous else dict.fromkeys(CUMULATIVE.values(), 0.0)
+    session.execute(insert(table).values(
+        project_id=project_id, report_date=day, updated_at=now,
+        **dict.fromkeys(CUMULATIVE, 0.0), **carried,
+    ))
+
+
+def add_deltas(session, project_id, day, **deltas):
+    """Add ``deltas`` (daily column -> amount) to ``day`` and shift later running totals."""
+    deltas = {column: amount for column, amount in deltas.items() if amount}
+    if not deltas:
+        return
+    table = ProjectProgress.__table__
+    now = datetime.utcnow()
+    _ensure_point(session, project_id, day, now)
+
+    is_day = table.c.report_date == day
+    values = {'updated_at': now}
+    for column, amount in deltas.items():
+        values[column] = table.c[column] + case((is_day, amount), else_=0.0)
+        values[CUMULATIVE[column]] = table.c[CUMULATIVE[column]] + amount
+    session.execute(
+        update(table)
+        .where(table.c.project_id == project_id, table.c.report_date >= day)
+        .values(**values)
+    )
+
+
+def add_daily_actuals(session, day_deltas):
+    """Apply ``{(project_id, day): (hours, cost)}`` actual deltas."""
+    for (project_id, day), (hours, cost) in day_deltas.items():
+        add_deltas(session, project_id, day, actual_hours=hours, actual_cost=cost)
+
+
+def record_snapshot(session, project_id, day, **totals):
+    """Set the running totals of snapshot series (earned/planned value) at ``day``.
+
+    The difference to the current total is added on ``day`` and taken back
+    on the next recorded day, so later snapshots keep their values.
+    """
+    current = _point_before(session, project_id, day, inclusive=True)
+    current = dict(zip(CUMULATIVE.values(), current)) if current else {}
+    deltas = {column: value - current.get(CUMULATIVE[column], 0.0) for column, value in totals.items()}
+    if not any(deltas.values()):
+        return
+
+    add_deltas(session, project_id, day, **deltas)
+    table = ProjectProgress.__table__
+    following = session.execute(
+        select(func.min(table.c.report_date))
+        .where(table.c.project_id == project_id, table.c.report_date > day)
+    ).scalar()
+    if following is not None:
+        add_deltas(session, project_id, following, **{c: -v for c, v in deltas.items()})
+
+
+def rebuild_progress_series(project_id=None):
+    """Resync actual hours/cost from ``daily_cost_summaries`` and recompute every prefix sum.
+
+    Earned/planned value deltas are kept as recorded.  Returns the number of
+    points of the rebuilt series.  Does not commit.
+    """
+    table = ProjectProgress.__table__
+    summaries = DailyCostSummary.__table__
+    now = datetime.utcnow()
+    scope = [table.c.project_id == project_id] if project_id is not None else []
+
+    # Days with costs but no point yet
+    days = select(summaries.c.project_id, summaries.c.report_date).distinct().where(~exists().where(and_(
+        table.c.project_id == summaries.c.project_id, table.c.report_date == summaries.c.report_date,
+    )))
+    if project_id is not None:
+        days = days.where(summaries.c.project_id == project_id)
+    # Deltas and running totals take their column defaults (0) until recomputed below
+    db.session.execute(insert(table).from_select(['project_id', 'report_date'], days))
+
+    same_day = and_(summaries.c.project_id == table.c.project_id,
+                    summaries.c.report_date == table.c.report_date)
+    db.session.execute(update(table).where(*scope).values(
+        actual_hours=func.coalesce(select(func.sum(summaries.c.labor_hours)).where(same_day).scalar_subquery(), 0.0),
+        actual_cost=func.coalesce(select(func.sum(summaries.c.total_cost)).where(same_day).scalar_subquery(), 0.0),
+    ))
+
+    window = dict(partition_by=table.c.project_id, order_by=table.c.report_date)
+    running = (
+        select(table.c.id, *(func.sum(table.c[d]).over(**window).label(c) for d, c in CUMULATIVE.items()))
+        .where(*scope)
+        .subquery()
+    )
+    db.session.execute(
+        update(table)
+        .where(table.c.id == running.c.id)
+        .values(updated_at=now, **{c: running.c[c] for c in CUMULATIVE.values()})
+    )
+    return db.session.execute(select(func.count()).select_from(table).where(*scope)).scalar()
+
+
+# ─── Reads ─────────────────────────────────────────────────────────────────────
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else None
+
+
+def s_curve(project_id, start, end):
+    """Return the recorded points of ``[start, end]`` with cumulative CPI/SPI."""
+    table = ProjectProgress.__table__
+    columns = [*CUMULATIVE, *CUMULATIVE.values()]
+    rows = db.session.execute(
+        select(table.c.report_date, *(table.c[c] for c in columns))
+        .where(table.c.project_id == project_id, table.c.report_date >= start, table.c.report_date <= end)
+        .order_by(table.c.report_date)
+    ).all()
+
+    points = []
+    for row in rows:
+        point = {'date': row[0].isoformat(), **dict(zip(columns, row[1:]))}
+        point['cpi'] = _ratio(point['cumulative_earned_value'], point['cumulative_cost'])
+        point['spi'] = _ratio(point['cumulative_earned_value'], point['cumulative_planned_value'])
+        points.append(point)
+    return points
+
+
+def _period_start(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def trend(project_id, start, end, bucket='week'):
+    """Return per-period changes (day, week or month buckets) over ``[start, end]``.
+
+    Each period's change is its last running total minus the previous one,
+    so only the rows of the range and the row before it are read.
+    """
+    table = ProjectProgress.__table__
+    baseline = _point_before(db.session, project_id, start)
+    previous = dict(zip(CUMULATIVE.values(), baseline)) if baseline else dict.fromkeys(CUMULATIVE.values(), 0.0)
+
+    rows = db.session.execute(
+        select(table.c.report_date, *(table.c[c] for c in CUMULATIVE.values()))
+        .where(table.c.project_id == project_id, table.c.report_date >= start, table.c.report_date <= end)
+        .order_by(table.c.report_date)
+    ).all()
+
+    # Last running totals of every period
+    closing = {}
+    for row in rows:
+        closing[_period_start(row[0], bucket)] = dict(zip(CUMULATIVE.values(), row[1:]))
+
+    periods = []
+    for period, totals in closing.items():
+        change = {daily: totals[cumulative] - previous[cumulative] for daily, cumulative in CUMULATIVE.items()}
+        periods.append({
+            'period': period.isoformat(),
+            **change,
+            'cpi': _ratio(change['earned_value'], change['actual_cost']),
+            'spi': _ratio(change['earned_value'], change['planned_value']),
+        })
+        previous = totals
+    return periods
+
+
+__all__ = [
+    "CUMULATIVE",
+    "add_deltas",
+    "add_daily_actuals",
+    "record_snapshot",
+    "rebuild_progress_series",
+    "s_curve",
+    "trend",
+]
@@ -0,0 +1,174 @@
+"""Process-wide resolution of project identifiers.
+
+Nearly every request starts by turning a project number (``"24-401"``) or a
+numeric ``projects.id`` taken from the session or the payload into a
+project.  This module keeps two small LRU maps -- number -> id and
+id -> :class:`ProjectSummary` -- so a warm cache answers without a query.
+
+The maps are filled on first use and emptied whenever a session commits a
+change to a ``Project`` row (tracked in ``after_flush`` and applied in
+``after_commit``).  Misses are never cached, so a newly created project is
+found on the next request.  Changes made by another process are not seen
+until that process' own cache is invalidated; bulk Core statements against
+``projects`` should call :func:`clear_project_cache` explicitly.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.core_models import Project
+
+
+@dataclass(frozen=True)
+class ProjectSummary:
+    """Immutable, session-independent view of a ``Project`` row."""
+    id: int
+    project_number: str
+    name: str
+    status: str | None = None
+
+
+class _LRU:
+    """Tiny thread-safe LRU map."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+CACHE_SIZE = 512
+
+_number_to_id = _LRU(CACHE_SIZE)
+_id_to_summary = _LRU(CACHE_SIZE)
+
+_CHANGED_KEY = 'project_resolver_changed'
+
+
+def clear_project_cache():
+    """Drop every cached project mapping."""
+    _number_to_id.clear()
+    _id_to_summary.clear()
+
+
+def _remember(project):
+    summary = ProjectSummary(
+        id=project.id,
+        project_number=project.project_number,
+        name=project.name,
+        status=project.status,
+    )
+    _id_to_summary.put(summary.id, summary)
+    _number_to_id.put(summary.project_number, summary.id)
+    return summary
+
+
+def project_by_id(project_id):
+    """Return the :class:`ProjectSummary` for ``projects.id`` or ``None``."""
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        return None
+
+    summary = _id_to_summary.get(project_id)
+    if summary is not None:
+        return summary
+
+    project = Project.query.get(project_id)
+    return _remember(project) if project else None
+
+
+def project_by_number(project_number):
+    """Return the :class:`ProjectSummary` for a project number or ``None``."""
+    if not project_number:
+        return None
+    project_number = str(project_number)
+
+    project_id = _number_to_id.get(project_number)
+    if project_id is not None:
+        summary = _id_to_summary.get(project_id)
+        if summary is not None:
+            return summary
+
+    project = Project.query.filter_by(project_number=project_number).first()
+    return _remember(project) if project else None
+
+
+def resolve_project(value):
+    """Resolve a session/payload project value to a :class:`ProjectSummary`.
+
+    Integers and all-digit strings are treated as ``projects.id``; anything
+    else is treated as a project number.  Returns ``None`` if nothing matches.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return project_by_id(value)
+    return project_by_number(value)
+
+
+# ─── Invalidation ──────────────────────────────────────────────────────────────
+
+def _track_project_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Project):
+            session.info[_CHANGED_KEY] = True
+            return
+
+
+def _invalidate_on_commit(session):
+    if session.info.pop(_CHANGED_KEY, False):
+        clear_project_cache()
+
+
+def _forget_on_rollback(session, previous_transaction):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+_listeners_installed = False
+
+
+def init_app(app):
+    """Install the commit listeners (once) and start from an empty cache."""
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Session, 'after_flush', _track_project_changes)
+        event.listen(Session, 'after_commit', _invalidate_on_commit)
+        event.listen(Session, 'after_soft_rollback', _forget_on_rollback)
+        _listeners_installed = True
+    clear_project_cache()
+
+
+__all__ = [
+    "ProjectSummary",
+    "project_by_id",
+    "project_by_number",
+    "resolve_project",
+    "clear_project_cache",
+    "init_app",
+]
@@ -0,0 +1,322 @@
+"""Database-backed drafts of the daily report tabs.
+
+Drafts used to live in ``session['daily_data']``: one ever-growing dict of
+every date a user touched, re-pickled and rewritten by the filesystem
+session store on each request.  They are now rows of ``report_drafts``
+keyed by (user, project, report date, tab); the session only holds the
+current project and report date, which together with the user id point to
+the rows.
+
+Writes are single-row partial upserts (``INSERT … ON CONFLICT DO UPDATE``
+of just the given columns), so their cost does not depend on how many days
+or tabs a user has drafted.  Helpers do not commit; callers do.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from flask import session
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models.report_draft import ReportDraft
+from app.utils.json_patch import apply_patch
+
+DEFAULT_TABS = ['Workers', 'Materials', 'Equipment', 'Subcontractors', 'DailyNoteEntry', 'WorkOrders', 'Pictures']
+
+_KEY_COLUMNS = ['user_id', 'project_number', 'report_date', 'tab']
+
+
+class StaleDraftRevision(Exception):
+    """Raised when a patch targets a revision that is no longer current."""
+
+    def __init__(self, current_revision):
+        super().__init__(f"Draft is at revision {current_revision}")
+        self.current_revision = current_revision
+
+
+@dataclass(frozen=True)
+class DraftKey:
+    """Identifies one user's drafts for a project and report date."""
+    user_id: str
+    project_number: str
+    report_date: date
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _session_user():
+    return str(session.get('user_id') or '')
+
+
+def _session_project():
+    return str(session.get('project_id') or session.get('project_number') or '')
+
+
+def current_key():
+    """Return the :class:`DraftKey` of the session's user/project/report date.
+
+    Returns ``None`` when no (valid) report date is selected.  Drafts left
+    in a legacy ``session['daily_data']`` are moved to the table first.
+    """
+    absorb_legacy_session()
+    raw = session.get('report_date') or session.get('current_reporting_date')
+    if not raw:
+        return None
+    try:
+        report_date = _parse_date(raw)
+    except ValueError:
+        return None
+    return DraftKey(_session_user(), _session_project(), report_date)
+
+
+def _key_values(key, tab):
+    return {
+        'user_id': key.user_id,
+        'project_number': key.project_number,
+        'report_date': key.report_date,
+        'tab': tab,
+    }
+
+
+def _dialect_insert():
+    name = db.session.get_bind().dialect.name
+    if name == 'sqlite':
+        return sqlite.insert
+    if name == 'postgresql':
+        return postgresql.insert
+    return None
+
+
+def upsert(key, tab, **values):
+    """Create the draft row of ``tab`` or update only the given columns.
+
+    ``values`` may contain ``entries`` and/or ``status``.  Writing
+    ``entries`` bumps the draft revision.
+    """
+    now = datetime.utcnow()
+    insert = _dialect_insert()
+    if insert is None:
+        # Generic fallback for dialects without ON CONFLICT support.
+        draft = get_tab(key, tab)
+        if draft is None:
+            draft = ReportDraft(**_key_values(key, tab), revision=0)
+            db.session.add(draft)
+        for column, value in values.items():
+            setattr(draft, column, value)
+        if 'entries' in values:
+            draft.revision = (draft.revision or 0) + 1
+        draft.updated_at = now
+        return
+
+    set_ = {**values, 'updated_at': now}
+    if 'entries' in values:
+        set_['revision'] = ReportDraft.__table__.c.revision + 1
+    stmt = insert(ReportDraft).values(
+        **_key_values(key, tab), created_at=now, updated_at=now,
+        revision=1 if 'entries' in values else 0, **values
+    )
+    stmt = stmt.on_conflict_do_update(index_elements=_KEY_COLUMNS, set_=set_)
+    db.session.execute(stmt)
+
+
+def _insert_first_revision(key, tab, entries):
+    """Create the draft row of ``tab`` at revision 1 unless it already exists.
+
+    Returns whether the row was created; an existing row is left untouched.
+    """
+    now = datetime.utcnow()
+    insert = _dialect_insert()
+    if insert is None:
+        try:
+            with db.session.begin_nested():
+                db.session.add(ReportDraft(**_key_values(key, tab), entries=entries, revision=1,
+                                           created_at=now, updated_at=now))
+        except IntegrityError:
+            return False
+        return True
+
+    stmt = insert(ReportDraft).values(
+        **_key_values(key, tab), entries=entries, revision=1, created_at=now, updated_at=now
+    ).on_conflict_do_nothing(index_elements=_KEY_COLUMNS)
+    return db.session.execute(stmt).rowcount == 1
+
+
+def _write_revision(key, tab, base_revision, entries):
+    """Store ``entries`` as revision ``base_revision + 1`` and return it.
+
+    Compare-and-swap: the row is only written while it is still at
+    ``base_revision`` (a missing row counts as 0), so of two concurrent
+    saves on the same base one wins and the other gets
+    :class:`StaleDraftRevision`.
+    """
+    if base_revision == 0 and _insert_first_revision(key, tab, entries):
+        return 1
+    updated = db.session.execute(
+        _key_filter(db.update(ReportDraft), key)
+        .where(ReportDraft.tab == tab, ReportDraft.revision == base_revision)
+        .values(entries=entries, revision=base_revision + 1, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        raise StaleDraftRevision(draft_revision(key, tab))
+    return base_revision + 1
+
+
+def save_snapshot(key, tab, entries, base_revision=None):
+    """Replace the entries of ``tab`` and return the new revision.
+
+    When ``base_revision`` is given the write only happens if the draft is
+    still at that revision, otherwise :class:`StaleDraftRevision` is raised.
+    """
+    if base_revision is not None:
+        return _write_revision(key, tab, base_revision, entries)
+    upsert(key, tab, entries=entries)
+    return draft_revision(key, tab)
+
+
+def patch_entries(key, tab, base_revision, patch):
+    """Apply an RFC 6902 ``patch`` to the entries of ``tab``.
+
+    The patch must be based on ``base_revision``; a missing draft counts as
+    revision 0 with no entries.  Returns ``(revision, entries)``.  Raises
+    :class:`StaleDraftRevision` if the draft moved on, and
+    :class:`~app.utils.json_patch.JsonPatchError` if the patch does not apply.
+    """
+    draft = get_tab(key, tab)
+    current_revision = draft.revision if draft else 0
+    if current_revision != base_revision:
+        raise StaleDraftRevision(current_revision)
+
+    entries = apply_patch(list(draft.entries or []) if draft else [], patch)
+    return _write_revision(key, tab, base_revision, entries), entries
+
+
+def ensure_tabs(key, tabs=DEFAULT_TABS):
+    """Create missing draft rows of ``tabs`` (status ``incomplete``) in one statement."""
+    insert = _dialect_insert()
+    if insert is None:
+        existing = day_drafts(key)
+        for tab in tabs:
+            if tab not in existing:
+                db.session.add(ReportDraft(**_key_values(key, tab), status='incomplete'))
+        return
+
+    now = datetime.utcnow()
+    stmt = insert(ReportDraft).values([
+        {**_key_values(key, tab), 'status': 'incomplete', 'created_at': now, 'updated_at': now}
+        for tab in tabs
+    ]).on_conflict_do_nothing(index_elements=_KEY_COLUMNS)
+    db.session.execute(stmt)
+
+
+def _key_filter(query, key):
+    return query.where(
+        ReportDraft.user_id == key.user_id,
+        ReportDraft.project_number == key.project_number,
+        ReportDraft.report_date == key.report_date,
+    )
+
+
+def get_tab(key, tab):
+    """Return the ``ReportDraft`` of ``tab`` or ``None``."""
+    return _key_filter(ReportDraft.query, key).filter(ReportDraft.tab == tab).first()
+
+
+def draft_revision(key, tab):
+    """Return the stored revision of ``tab`` (0 if there is no draft)."""
+    revision = db.session.scalar(
+        _key_filter(db.select(ReportDraft.revision), key).where(ReportDraft.tab == tab)
+    )
+    return revision or 0
+
+
+def tab_entries(key, tab):
+    """Return a copy of the draft entries of ``tab`` (``[]`` if none)."""
+    draft = get_tab(key, tab)
+    return list(draft.entries or []) if draft else []
+
+
+def day_drafts(key):
+    """Return ``{tab: ReportDraft}`` for the key's day."""
+    return {d.tab: d for d in _key_filter(ReportDraft.query, key).all()}
+
+
+def day_entries(key):
+    """Return ``{tab: entries}`` for the key's day, skipping empty tabs."""
+    return {tab: d.entries for tab, d in day_drafts(key).items() if d.entries}
+
+
+def delete_day(key):
+    """Delete every draft row of the key's day."""
+    _key_filter(ReportDraft.query, key).delete(synchronize_session=False)
+
+
+def days_status(user_id=None):
+    """Split the user's drafted days into completed and in-progress ISO dates.
+
+    A day is completed when every tab drafted for it is ``completed``.
+    """
+    if user_id is None:
+        absorb_legacy_session()
+        user_id = _session_user()
+    completed_col = func.sum(case((ReportDraft.status == 'completed', 1), else_=0))
+    rows = (
+        db.session.query(ReportDraft.report_date, func.count(ReportDraft.id), completed_col)
+        .filter(ReportDraft.user_id == user_id)
+        .group_by(ReportDraft.report_date)
+        .order_by(ReportDraft.report_date)
+        .all()
+    )
+    completed, in_progress = [], []
+    for report_date, total, done in rows:
+        (completed if total and done == total else in_progress).append(report_date.isoformat())
+    return completed, in_progress
+
+
+def absorb_legacy_session():
+    """Move drafts from a pre-``report_drafts`` ``session['daily_data']`` to the table."""
+    daily_data = session.pop('daily_data', None)
+    if not daily_data:
+        return
+    session.modified = True
+
+    user_id, project_number = _session_user(), _session_project()
+    for date_str, info in daily_data.items():
+        try:
+            key = DraftKey(user_id, project_number, _parse_date(date_str))
+        except ValueError:
+            continue
+        for tab, status in (info.get('tab_statuses') or {}).items():
+            upsert(key, tab, status=status)
+        for tab, entries in (info.get('entries') or {}).items():
+            upsert(key, tab, entries=entries)
+    db.session.commit()
+
+
+__all__ = [
+    "DEFAULT_TABS",
+    "DraftKey",
+    "StaleDraftRevision",
+    "current_key",
+    "upsert",
+    "save_snapshot",
+    "patch_entries",
+    "ensure_tabs",
+    "get_tab",
+    "draft_revision",
+    "tab_entries",
+    "day_drafts",
+    "day_entries",
+    "delete_day",
+    "days_status",
+    "absorb_legacy_session",
+]
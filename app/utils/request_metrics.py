@@ -0,0 +1,165 @@
+"""Per-request latency and SQL instrumentation.
+
+:func:`init_app` times every request and counts the SQL statements it runs
+and the time spent in them.  The counts come from the engine's
+``before_cursor_execute``/``after_cursor_execute`` events.  For each
+endpoint the last ``REQUEST_METRICS_WINDOW`` requests are kept, and
+:func:`render_prometheus` reports their p50/p95/p99 as Prometheus
+summaries.  Responses also get a ``Server-Timing`` header (``app``, ``db``)
+that browser devtools show in the network panel.
+
+Numbers are per process.  Under gunicorn each worker reports its own
+requests.  Wall time stops when the response is returned, so the body of
+a streamed response is not included.
+"""
+
+import threading
+import time
+from collections import deque
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUANTILES = (0.5, 0.95, 0.99)
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+# (metric name, help text, per-request sample key)
+METRICS = (
+    ('tcc_request_duration_seconds', 'Request wall time', 'duration'),
+    ('tcc_request_sql_queries', 'SQL statements executed per request', 'sql_count'),
+    ('tcc_request_sql_seconds', 'Time spent in SQL per request', 'sql_time'),
+)
+
+_lock = threading.Lock()
+_stats = {}
+_listeners_installed = False
+
+
+class _EndpointStats:
+    """Rolling window of samples plus running totals for one endpoint."""
+
+    def __init__(self, window):
+        self.samples = {key: deque(maxlen=window) for _, _, key in METRICS}
+        self.sums = {key: 0.0 for _, _, key in METRICS}
+        self.count = 0
+
+    def add(self, sample):
+        self.count += 1
+        for key, value in sample.items():
+            self.samples[key].append(value)
+            self.sums[key] += value
+
+
+def quantile(values, q):
+    """Nearest-rank quantile of ``values`` (``None`` when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+    return ordered[index]
+
+
+def record(endpoint, duration, sql_count, sql_time, window=1024):
+    """Add one request's numbers to ``endpoint``'s window."""
+    with _lock:
+        stats = _stats.get(endpoint)
+        if stats is None:
+            stats = _stats[endpoint] = _EndpointStats(window)
+        stats.add({'duration': duration, 'sql_count': sql_count, 'sql_time': sql_time})
+
+
+def snapshot():
+    """Return ``{endpoint: {key: {quantile: value}, 'count': n, 'sums': {...}}}``."""
+    with _lock:
+        items = [(name, {k: list(v) for k, v in s.samples.items()}, dict(s.sums), s.count)
+                 for name, s in _stats.items()]
+    result = {}
+    for name, samples, sums, count in sorted(items):
+        entry = {key: {q: quantile(values, q) for q in QUANTILES} for key, values in samples.items()}
+        entry['count'] = count
+        entry['sums'] = sums
+        result[name] = entry
+    return result
+
+
+def reset():
+    """Forget every recorded request (mostly for tests)."""
+    with _lock:
+        _stats.clear()
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """Render :func:`snapshot` in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    for metric, help_text, key in METRICS:
+        lines.append(f"# HELP {metric} {help_text} (recent requests per endpoint).")
+        lines.append(f"# TYPE {metric} summary")
+        for endpoint, entry in data.items():
+            label = f'endpoint="{_label(endpoint)}"'
+            for q, value in entry[key].items():
+                lines.append(f'{metric}{{{label},quantile="{q}"}} {value:.6g}')
+            lines.append(f"{metric}_sum{{{label}}} {entry['sums'][key]:.6g}")
+            lines.append(f"{metric}_count{{{label}}} {entry['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is not None and has_request_context() and 'metrics_started' in g:
+        g.metrics_sql_count += 1
+        g.metrics_sql_time += time.perf_counter() - started
+
+
+def _start_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_sql_count = 0
+    g.metrics_sql_time = 0.0
+
+
+def _finish_request(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    duration = time.perf_counter() - started
+    sql_count, sql_time = g.metrics_sql_count, g.metrics_sql_time
+    record(request.endpoint or UNMATCHED_ENDPOINT, duration, sql_count, sql_time,
+           window=current_app.config.get('REQUEST_METRICS_WINDOW', 1024))
+    if current_app.config.get('REQUEST_METRICS_SERVER_TIMING', True):
+        response.headers.add(
+            'Server-Timing',
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={sql_time * 1000:.1f};desc="{sql_count} queries"')
+    return response
+
+
+def init_app(app):
+    """Install the engine listeners (once) and time every request of ``app``."""
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listeners_installed = True
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+__all__ = [
+    "QUANTILES",
+    "quantile",
+    "record",
+    "snapshot",
+    "reset",
+    "render_prometheus",
+    "init_app",
+]
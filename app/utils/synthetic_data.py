@@ -0,0 +1,218 @@
+"""Seeded synthetic data at production-like scale.
+
+:func:`generate` fills the schema with ``projects`` projects, each with
+``days`` consecutive report days, and each day with ``entries`` rows per
+tab (workers, equipment, materials, subcontractors).  Each day also gets
+daily notes, a picture, a document and a daily report status.  Master
+data (activity codes, workers, equipment, materials) is shared between
+projects.  Payment items, CWPs, subcontractors and work orders are created
+per project.
+
+Every day but the last is committed.  The last day is left pending, as
+the data-entry screens would see it.  The same ``seed`` always produces
+the same rows.  Everything is written with bulk INSERTs, and the cost
+summaries and progress series are rebuilt at the end.  Pictures and
+documents only get database rows; no files are written.
+
+Helpers do not commit; callers do.
+"""
+
+import random
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import insert, select
+
+from .. import db
+from ..models import (ActivityCode, CWPackage, DailyNoteEntry, DailyPicture, DailyReportStatus,
+                      Document, Equipment, EquipmentEntry, Material, MaterialEntry, PaymentItem,
+                      Project, Subcontractor, SubcontractorEntry, WorkOrder, Worker, WorkerEntry)
+from .cost_summaries import rebuild_cost_summaries
+from .progress_series import rebuild_progress_series
+from .project_resolver import clear_project_cache
+
+PROJECT_PREFIX = 'SYN'
+DEFAULT_START = date(2025, 1, 6)
+# Rows per shared master table; per-project tables get a fraction of it
+DEFAULT_MASTERS = 50
+CWPS_PER_PROJECT = 10
+INSERT_CHUNK = 5000
+
+TRADES = ('Carpenter', 'Electrician', 'Plumber', 'Labourer', 'Operator', 'Welder', 'Ironworker')
+UNITS = ('m3', 'm2', 'm', 't', 'each', 'kg')
+NOTE_CATEGORIES = ('safety', 'progress', 'quality', 'weather', 'delay')
+REPORT_TABS = ('workers_tab', 'materials_tab', 'equipment_tab', 'notes_tab', 'pictures_tab',
+               'subcontractors_tab', 'workorders_tab')
+
+
+def project_number(index):
+    """Project number of the ``index``-th synthetic project."""
+    return f"{PROJECT_PREFIX}-{index:03d}"
+
+
+def _insert(model, rows, counts, ids=False):
+    """Bulk insert ``rows``; return their new ids (in order) when ``ids`` is set."""
+    new_ids = []
+    for offset in range(0, len(rows), INSERT_CHUNK):
+        chunk = rows[offset:offset + INSERT_CHUNK]
+        if ids:
+            stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+            new_ids.extend(db.session.scalars(stmt, chunk).all())
+        else:
+            db.session.execute(insert(model), chunk)
+    counts[model.__tablename__] += len(rows)
+    return new_ids
+
+
+def _masters(rng, size, counts):
+    activities = _insert(ActivityCode, [
+        {'code': f'{PROJECT_PREFIX}-AC{i:04d}', 'description': f'Activity {i}',
+         'unit': rng.choice(UNITS), 'std_man_hours_per_unit': round(rng.uniform(0.1, 4), 2)}
+        for i in range(size)
+    ], counts, ids=True)
+    workers = _insert(Worker, [
+        {'name': f'Worker {i}', 'worker_id': f'{PROJECT_PREFIX}-W{i:05d}',
+         'metier': rng.choice(TRADES), 'taux_horaire': round(rng.uniform(28, 75), 2),
+         'role': 'worker', 'is_active': True}
+        for i in range(size)
+    ], counts, ids=True)
+    equipment = _insert(Equipment, [
+        {'name': f'Equipment {i}', 'equipment_id': f'{PROJECT_PREFIX}-E{i:05d}',
+         'hourly_rate': round(rng.uniform(40, 250), 2)}
+        for i in range(size)
+    ], counts, ids=True)
+    materials = _insert(Material, [
+        {'name': f'Material {i}', 'material_id': f'{PROJECT_PREFIX}-M{i:05d}',
+         'unit': rng.choice(UNITS), 'cost_per_unit': round(rng.uniform(2, 400), 2)}
+        for i in range(size)
+    ], counts, ids=True)
+    return activities, workers, equipment, materials
+
+
+def _project_masters(rng, index, project_id, activities, size, counts):
+    cwps = [f'CWP{j:02d}' for j in range(CWPS_PER_PROJECT)]
+    _insert(CWPackage, [{'project_id': project_id, 'code': code, 'name': f'Package {code}',
+                         'unit': rng.choice(UNITS)} for code in cwps], counts)
+    payment_items = _insert(PaymentItem, [
+        {'project_id': project_id, 'payment_code': f'{project_number(index)}-PI{j:04d}',
+         'activity_code_id': rng.choice(activities), 'item_name': f'Payment item {j}',
+         'unit': rng.choice(UNITS), 'rate_per_unit': round(rng.uniform(10, 900), 2)}
+        for j in range(max(1, size // 2))
+    ], counts, ids=True)
+    subcontractors = _insert(Subcontractor, [
+        {'project_id': project_id, 'name': f'Subcontractor {index}-{j}'}
+        for j in range(max(1, size // 5))
+    ], counts, ids=True)
+    _insert(WorkOrder, [
+        {'project_id': project_id, 'sequential_number': f'S{index:03d}{j:04d}',
+         'description': f'Work order {j}', 'type': 'change_order',
+         'subcontractor_id': rng.choice(subcontractors), 'activity_code_id': rng.choice(activities),
+         'estimated_cost': round(rng.uniform(1000, 50000), 2)}
+        for j in range(max(1, size // 5))
+    ], counts)
+    return cwps, payment_items, subcontractors
+
+
+def _day_rows(rng, project_id, report_date, entries, status, refs):
+    """Rows of every tab for one project day, keyed by model."""
+    activities, workers, equipment, materials, cwps, payment_items, subcontractors = refs
+    at = datetime.combine(report_date, time(7, 0))
+    rows = {model: [] for model in (WorkerEntry, EquipmentEntry, MaterialEntry,
+                                    SubcontractorEntry, DailyNoteEntry, DailyPicture, Document)}
+    for _ in range(entries):
+        common = {'project_id': project_id, 'status': status, 'cwp': rng.choice(cwps),
+                  'payment_item_id': rng.choice(payment_items)}
+        rows[WorkerEntry].append({
+            **common, 'date_of_report': report_date, 'worker_id': rng.choice(workers),
+            'activity_id': rng.choice(activities), 'hours_worked': rng.choice((4, 6, 8, 8, 10)),
+            'taux_horaire': round(rng.uniform(28, 75), 2)})
+        rows[EquipmentEntry].append({
+            **common, 'date_of_report': report_date, 'equipment_id': rng.choice(equipment),
+            'activity_id': rng.choice(activities), 'hours_used': rng.choice((2, 4, 8))})
+        quantity, price = round(rng.uniform(1, 50), 2), round(rng.uniform(2, 400), 2)
+        rows[MaterialEntry].append({
+            **common, 'date_of_report': report_date, 'material_id': rng.choice(materials),
+            'activity_code_id': rng.choice(activities), 'quantity_used': quantity,
+            'unit': rng.choice(UNITS), 'unit_price': price, 'cost': round(quantity * price, 2)})
+        crew, hours = rng.randint(1, 8), rng.choice((4, 8, 10))
+        rows[SubcontractorEntry].append({
+            'project_id': project_id, 'status': status, 'date': report_date,
+            'subcontractor_id': rng.choice(subcontractors), 'activity_code_id': rng.choice(activities),
+            'num_employees': crew, 'labor_hours': crew * hours,
+            'total_cost': round(crew * hours * rng.uniform(45, 95), 2)})
+    for n in range(max(1, entries // 4)):
+        rows[DailyNoteEntry].append({
+            'project_id': project_id, 'status': status, 'date_of_report': report_date,
+            'note_datetime': at + timedelta(minutes=37 * n), 'author': f'Worker {rng.randrange(100)}',
+            'category': rng.choice(NOTE_CATEGORIES), 'priority': rng.choice(('low', 'medium', 'high')),
+            'content': f'Synthetic note {n} for {report_date.isoformat()}',
+            'activity_code_id': rng.choice(activities), 'cwp': rng.choice(cwps)})
+    media_status = 'committed' if status == 'committed' else 'pending'
+    stamp = report_date.strftime('%Y%m%d')
+    rows[DailyPicture].append({
+        'project_id': project_id, 'status': media_status, 'file_name': f'site_{stamp}.jpg',
+        'file_url': f'uploads/synthetic/{project_id}/site_{stamp}.jpg', 'taken_at': at,
+        'uploaded_at': at + timedelta(hours=9), 'description': 'Site overview',
+        'size': round(rng.uniform(1, 6), 2)})
+    rows[Document].append({
+        'project_id': project_id, 'status': media_status, 'file_name': f'report_{stamp}.pdf',
+        'file_url': f'uploads/synthetic/{project_id}/report_{stamp}.pdf', 'document_type': 'general',
+        'uploaded_at': at + timedelta(hours=10), 'cwp_code': rng.choice(cwps),
+        'file_size': rng.randint(50_000, 5_000_000)})
+    return rows
+
+
+def generate(projects=3, days=30, entries=10, seed=0, start=DEFAULT_START, masters=DEFAULT_MASTERS):
+    """Fill the database with synthetic data; return ``{table: rows inserted}``.
+
+    Raises ``ValueError`` if synthetic projects already exist.
+    """
+    if min(projects, days, entries, masters) < 1:
+        raise ValueError("projects, days, entries and masters must be at least 1")
+    existing = db.session.scalar(
+        select(Project.id).where(Project.project_number.like(f'{PROJECT_PREFIX}-%')).limit(1))
+    if existing is not None:
+        raise ValueError("Synthetic projects already exist; use an empty database")
+
+    rng = random.Random(seed)
+    counts = Counter()
+    activities, workers, equipment, materials = _masters(rng, masters, counts)
+
+    for index in range(projects):
+        project_id = _insert(Project, [{
+            'name': f'Synthetic project {index}', 'project_number': project_number(index),
+            'category': 'Synthetic', 'status': 'in_progress', 'start_date': start,
+            'end_date': start + timedelta(days=days - 1),
+            'budget': round(rng.uniform(1e6, 2e7), 2),
+        }], counts, ids=True)[0]
+        cwps, payment_items, subcontractors = _project_masters(
+            rng, index, project_id, activities, masters, counts)
+        refs = (activities, workers, equipment, materials, cwps, payment_items, subcontractors)
+
+        statuses = []
+        batch = {}
+        for offset in range(days):
+            report_date = start + timedelta(days=offset)
+            last = offset == days - 1
+            for model, rows in _day_rows(rng, project_id, report_date, entries,
+                                         'pending' if last else 'committed', refs).items():
+                batch.setdefault(model, []).extend(rows)
+            state = 'in_progress' if last else 'completed'
+            statuses.append({'project_id': project_id, 'report_date': report_date,
+                             'report_status': state, **{tab: state for tab in REPORT_TABS}})
+        _insert(DailyReportStatus, statuses, counts)
+        for model, rows in batch.items():
+            _insert(model, rows, counts)
+
+    counts['daily_cost_summaries'] = rebuild_cost_summaries()
+    counts['project_progress'] = rebuild_progress_series()
+    clear_project_cache()
+    return dict(counts)
+
+
+__all__ = [
+    "PROJECT_PREFIX",
+    "DEFAULT_START",
+    "project_number",
+    "generate",
+]
@@ -0,0 +1,158 @@
+"""WebP thumbnails and previews of site pictures.
+
+When a ``DailyPicture`` or ``DailyNoteAttachment`` is committed, its source
+file is handed to a process pool that renders one WebP per entry of
+``SIZES`` next to the file (``<blob>.thumb.webp``, ``<blob>.medium.webp``).
+Since uploads are content-addressed, identical photos share their
+renditions too.  ``/media/thumb/…`` serves them and renders synchronously
+if the background job has not run yet.
+
+``THUMBNAIL_WORKERS`` sets the pool size; ``0`` renders inline on commit.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# size name -> longest edge in pixels
+SIZES = {
+    'thumb': 256,
+    'medium': 1024,
+}
+WEBP_QUALITY = 80
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_workers = None
+
+
+def rendition_path(source_path, size):
+    """Return the path of the ``size`` rendition of ``source_path``."""
+    return f"{source_path}.{size}.webp"
+
+
+def render_renditions(source_path):
+    """Render every missing rendition of ``source_path``; return the paths written.
+
+    Runs in worker processes, so it only takes and returns plain values.
+    """
+    from PIL import Image, ImageOps
+
+    missing = {size: edge for size, edge in SIZES.items()
+               if not os.path.exists(rendition_path(source_path, size))}
+    if not missing:
+        return []
+
+    written = []
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        # Largest first so each smaller size is resampled from a smaller image
+        for size, edge in sorted(missing.items(), key=lambda item: -item[1]):
+            image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            target = rendition_path(source_path, size)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            image.save(tmp, format='WEBP', quality=WEBP_QUALITY, method=4)
+            os.replace(tmp, target)
+            written.append(target)
+    return written
+
+
+def worker_pool(workers):
+    """Return the shared process pool for picture jobs, sized to ``workers``."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+def _log_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Thumbnail generation failed: %s", exc)
+
+
+def schedule(source_paths, workers=None):
+    """Queue rendition jobs for ``source_paths`` (inline when ``workers`` is 0)."""
+    if workers is None:
+        workers = current_app.config.get('THUMBNAIL_WORKERS', 2) if has_app_context() else 2
+    for path in source_paths:
+        if workers <= 0:
+            try:
+                render_renditions(path)
+            except Exception as exc:
+                logger.warning("Thumbnail generation failed for %s: %s", path, exc)
+        else:
+            worker_pool(workers).submit(render_renditions, path).add_done_callback(_log_failure)
+
+
+def source_path(record):
+    """Absolute path of the file behind a picture/attachment row."""
+    return os.path.join(current_app.root_path, record.file_url)
+
+
+def is_image(filename):
+    from ..routes.media_routes import IMAGE_EXTENSIONS
+
+    return '.' in (filename or '') and filename.rsplit('.', 1)[1].lower() in IMAGE_EXTENSIONS
+
+
+# ─── Commit hook ───────────────────────────────────────────────────────────────
+
+def _picture_models():
+    from ..models.daily_models import DailyPicture
+    from ..models.DailyNoteAttachment import DailyNoteAttachment
+
+    return DailyPicture, DailyNoteAttachment
+
+
+def _track_new_pictures(session, flush_context):
+    if not has_app_context():
+        return
+    models = _picture_models()
+    for obj in session.new:
+        if isinstance(obj, models) and obj.file_url and is_image(obj.file_name or obj.file_url):
+            session.info.setdefault('new_picture_paths', set()).add(source_path(obj))
+
+
+def _render_on_commit(session):
+    paths = session.info.pop('new_picture_paths', None)
+    if paths:
+        schedule(sorted(paths))
+
+
+def _forget_on_rollback(session, previous_transaction):
+    session.info.pop('new_picture_paths', None)
+
+
+_listeners_installed = False
+
+
+def init_app(app):
+    """Install the commit listeners that queue thumbnail jobs (once)."""
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Session, 'after_flush', _track_new_pictures)
+        event.listen(Session, 'after_commit', _render_on_commit)
+        event.listen(Session, 'after_soft_rollback', _forget_on_rollback)
+        _listeners_installed = True
+
+
+__all__ = [
+    "SIZES",
+    "rendition_path",
+    "render_renditions",
+    "schedule",
+    "worker_pool",
+    "source_path",
+    "init_app",
+]
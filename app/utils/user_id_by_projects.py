@@ -1,4 +1,3 @@
-import pandas as pd
 from flask import current_app
 import os
 from app.utils.data_loader import load_data
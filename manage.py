@@ -39,5 +39,173 @@ def create_user():
     db.session.commit()
     click.echo(f"Created user {name} with role {role}")
 
+
+@cli.command("rebuild-cost-summaries")
+@click.option("--project", "project_number", default=None, help="Only rebuild this project number.")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="First report date (inclusive).")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Last report date (inclusive).")
+def rebuild_cost_summaries_cmd(project_number, start, end):
+    """Recompute daily_cost_summaries and the progress time series from the committed entries."""
+    from app.models.core_models import Project
+    from app.utils.cost_summaries import rebuild_cost_summaries
+    from app.utils.progress_series import rebuild_progress_series
+
+    project_id = None
+    if project_number:
+        project = Project.query.filter_by(project_number=project_number).first()
+        if project is None:
+            raise click.ClickException(f"Unknown project {project_number}")
+        project_id = project.id
+
+    rows = rebuild_cost_summaries(
+        project_id=project_id,
+        start=start.date() if start else None,
+        end=end.date() if end else None,
+    )
+    points = rebuild_progress_series(project_id=project_id)
+    db.session.commit()
+    click.echo(f"Rebuilt {rows} daily cost summary rows and {points} progress points")
+
+
+@cli.command("compute-evm")
+@click.option("--project", "project_numbers", multiple=True, help="Only compute these project numbers.")
+@click.option("--incremental", is_flag=True, help="Skip projects with nothing new since their last run.")
+@click.option("--as-of", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Status date (default: today).")
+def compute_evm_cmd(project_numbers, incremental, as_of):
+    """Recompute the earned-value fields of every project task."""
+    from app.models.core_models import Project
+    from app.utils.evm import run_evm
+
+    project_ids = None
+    if project_numbers:
+        projects = Project.query.filter(Project.project_number.in_(project_numbers)).all()
+        missing = set(project_numbers) - {p.project_number for p in projects}
+        if missing:
+            raise click.ClickException(f"Unknown project(s): {', '.join(sorted(missing))}")
+        project_ids = [p.id for p in projects]
+
+    tasks = run_evm(project_ids=project_ids, incremental=incremental,
+                    as_of=as_of.date() if as_of else None)
+    db.session.commit()
+    click.echo(f"Computed EVM for {tasks} tasks")
+
+
+@cli.command("import-masterdata")
+@click.option("--dir", "directory", default="ZVelix", show_default=True,
+              type=click.Path(exists=True, file_okay=False), help="Folder holding the master-data CSVs.")
+@click.option("--table", "tables", multiple=True, help="Only import these tables (e.g. projects, workers).")
+@click.option("--dry-run", is_flag=True, help="Validate and report without saving anything.")
+def import_masterdata_cmd(directory, tables, dry_run):
+    """Bulk upsert projects, codes, workers, equipment… from the master-data CSVs."""
+    from app.utils.masterdata_import import IMPORTERS, MasterDataError, import_masterdata
+
+    known = {table for table, _, _ in IMPORTERS}
+    unknown = set(tables) - known
+    if unknown:
+        raise click.ClickException(f"Unknown table(s): {', '.join(sorted(unknown))}")
+
+    try:
+        reports = import_masterdata(directory, tables=set(tables) or None)
+    except MasterDataError as exc:
+        db.session.rollback()
+        raise click.ClickException(str(exc))
+
+    for report in reports:
+        click.echo(f"{report.table}: {report.inserted} inserted, {report.updated} updated, "
+                   f"{len(report.rejects)} rejected, {len(report.warnings)} warnings")
+        for line, reason in report.rejects:
+            click.echo(f"  line {line}: rejected - {reason}")
+        for line, message in report.warnings:
+            click.echo(f"  line {line}: {message}")
+
+    if dry_run:
+        db.session.rollback()
+        click.echo("Dry run: nothing was saved")
+    else:
+        db.session.commit()
+
+
+@cli.command("generate-data")
+@click.option("--projects", default=3, show_default=True, help="Number of projects.")
+@click.option("--days", default=30, show_default=True, help="Report days per project.")
+@click.option("--entries", default=10, show_default=True, help="Entries per tab and day.")
+@click.option("--masters", default=50, show_default=True, help="Rows per shared master table.")
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+def generate_data_cmd(projects, days, entries, masters, seed):
+    """Fill the configured database with seeded synthetic data."""
+    from app.utils.synthetic_data import generate
+
+    try:
+        counts = generate(projects=projects, days=days, entries=entries, masters=masters, seed=seed)
+    except ValueError as exc:
+        db.session.rollback()
+        raise click.ClickException(str(exc))
+    db.session.commit()
+    for table, rows in sorted(counts.items()):
+        click.echo(f"{table}: {rows}")
+
+
+@cli.command("benchmark")
+@click.option("--projects", default=5, show_default=True, help="Number of synthetic projects.")
+@click.option("--days", default=60, show_default=True, help="Report days per project.")
+@click.option("--entries", default=20, show_default=True, help="Entries per tab and day.")
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option("--repeat", default=5, show_default=True, help="Timed runs per scenario.")
+@click.option("--batch", "batch_size", default=20, show_default=True, help="Lines per confirm batch.")
+@click.option("--scenario", "scenarios", multiple=True, help="Only run these scenarios.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Write the results JSON here.")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Results JSON of an earlier run to compare with.")
+@click.option("--threshold", default=0.25, show_default=True, help="Median slowdown reported as a regression.")
+@click.option("--fail-on-regression", is_flag=True, help="Exit with an error if any scenario regressed.")
+def benchmark_cmd(projects, days, entries, seed, repeat, batch_size, scenarios, output, baseline,
+                  threshold, fail_on_regression):
+    """Time the hot endpoints against a throwaway database of synthetic data."""
+    import json
+    import os
+    import tempfile
+    from app.utils.benchmarks import (SCENARIOS, benchmark_app, compare, load_results,
+                                      run_benchmarks, save_results)
+    from app.utils.synthetic_data import generate
+
+    unknown = set(scenarios) - {name for name, _ in SCENARIOS}
+    if unknown:
+        raise click.ClickException(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = benchmark_app(f"sqlite:///{os.path.join(tmp, 'benchmark.db')}")
+        with app.app_context():
+            generate(projects=projects, days=days, entries=entries, seed=seed)
+            db.session.commit()
+        scale = {'projects': projects, 'days': days, 'entries': entries, 'seed': seed}
+        results = run_benchmarks(app, repeat=repeat, batch_size=batch_size,
+                                 scenarios=set(scenarios) or None, meta={'scale': scale})
+        with app.app_context():
+            db.engine.dispose()
+
+    for name, row in results['scenarios'].items():
+        click.echo(f"{name:26} median {row['median_ms']:9.2f} ms  p95 {row['p95_ms']:9.2f} ms  "
+                   f"queries {row['queries']}  status {row['status']}")
+    if output:
+        save_results(results, output)
+        click.echo(f"Results written to {output}")
+
+    if baseline:
+        before = load_results(baseline)
+        if before.get('meta', {}).get('scale') != results['meta']['scale']:
+            click.echo(f"Warning: baseline scale {json.dumps(before.get('meta', {}).get('scale'))} "
+                       f"differs from this run")
+        rows = compare(before, results, threshold=threshold)
+        click.echo("\nAgainst baseline (median):")
+        for row in rows:
+            if row['current_ms'] is None:
+                continue  # not run this time
+            flag = "  REGRESSION" if row['regression'] else ""
+            click.echo(f"{row['name']:26} {row['baseline_ms']} -> {row['current_ms']} ms "
+                       f"(x{row['ratio']}){flag}")
+        if fail_on_regression and any(row['regression'] for row in rows):
+            raise click.ClickException("Benchmark regressions against the baseline")
+
+
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -92,6 +92,13 @@ def run_migrations_online():
     if connectable.dialect.name == 'sqlite':
         conf_args.setdefault('render_as_batch', True)
     with connectable.connect() as connection:
+        restore_foreign_keys = None
+        if connectable.dialect.name == 'sqlite':
+            # Batch mode rebuilds tables (copy, drop, rename); with the
+            # app's foreign_keys=ON pragma that would fail or cascade.
+            restore_foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
         context.configure(
             connection=connection,
             target_metadata=get_filtered_metadata(),
@@ -102,6 +109,11 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+        if restore_foreign_keys:
+            # The connection goes back to the pool; do not leak the OFF setting
+            connection.exec_driver_sql('PRAGMA foreign_keys=ON')
+            connection.commit()
+
 # Select mode
 if context.is_offline_mode():
     run_migrations_offline()
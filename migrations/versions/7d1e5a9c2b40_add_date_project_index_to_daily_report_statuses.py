@@ -0,0 +1,32 @@
+"""add (report_date, project_id) index to daily_report_statuses
+
+Revision ID: 7d1e5a9c2b40
+Revises: c3c3c07dcbf6
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '7d1e5a9c2b40'
+down_revision = 'c3c3c07dcbf6'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_daily_report_statuses_date_project'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = {ix['name'] for ix in inspector.get_indexes('daily_report_statuses')}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, 'daily_report_statuses', ['report_date', 'project_id'])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    indexes = {ix['name'] for ix in inspector.get_indexes('daily_report_statuses')}
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name='daily_report_statuses')
@@ -0,0 +1,44 @@
+"""add report_drafts table
+
+Revision ID: 8e2f6b0d3a51
+Revises: 7d1e5a9c2b40
+Create Date: 2026-10-18 00:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '8e2f6b0d3a51'
+down_revision = '7d1e5a9c2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'report_drafts' in inspector.get_table_names():
+        return
+    op.create_table(
+        'report_drafts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('project_number', sa.String(length=50), nullable=False),
+        sa.Column('report_date', sa.Date(), nullable=False),
+        sa.Column('tab', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('entries', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'project_number', 'report_date', 'tab',
+                            name='uq_report_drafts_user_project_date_tab'),
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'report_drafts' in inspector.get_table_names():
+        op.drop_table('report_drafts')
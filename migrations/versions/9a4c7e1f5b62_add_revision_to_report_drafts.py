@@ -0,0 +1,33 @@
+"""add revision to report_drafts
+
+Revision ID: 9a4c7e1f5b62
+Revises: 8e2f6b0d3a51
+Create Date: 2026-10-18 00:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = '9a4c7e1f5b62'
+down_revision = '8e2f6b0d3a51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = {c['name'] for c in inspector.get_columns('report_drafts')}
+    with op.batch_alter_table('report_drafts') as batch_op:
+        if 'revision' not in columns:
+            batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = {c['name'] for c in inspector.get_columns('report_drafts')}
+    with op.batch_alter_table('report_drafts') as batch_op:
+        if 'revision' in columns:
+            batch_op.drop_column('revision')
@@ -0,0 +1,50 @@
+"""add daily_cost_summaries table
+
+Revision ID: a1b5d8f2c7e3
+Revises: 9a4c7e1f5b62
+Create Date: 2026-10-18 00:30:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'a1b5d8f2c7e3'
+down_revision = '9a4c7e1f5b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'daily_cost_summaries' in inspector.get_table_names():
+        return
+    op.create_table(
+        'daily_cost_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('report_date', sa.Date(), nullable=False),
+        sa.Column('activity_code_id', sa.Integer(), nullable=True),
+        sa.Column('labor_hours', sa.Float(), nullable=False),
+        sa.Column('labor_cost', sa.Float(), nullable=False),
+        sa.Column('equipment_hours', sa.Float(), nullable=False),
+        sa.Column('equipment_cost', sa.Float(), nullable=False),
+        sa.Column('material_cost', sa.Float(), nullable=False),
+        sa.Column('subcontractor_hours', sa.Float(), nullable=False),
+        sa.Column('subcontractor_cost', sa.Float(), nullable=False),
+        sa.Column('total_cost', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.ForeignKeyConstraint(['activity_code_id'], ['activity_codes.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'report_date', 'activity_code_id',
+                            name='uq_daily_cost_summaries_project_date_activity'),
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'daily_cost_summaries' in inspector.get_table_names():
+        op.drop_table('daily_cost_summaries')
@@ -0,0 +1,49 @@
+"""add (project_id, date, status, id) indexes to the entry tables
+
+Revision ID: a8b1d4f6c3e9
+Revises: f7a0c3e5b2d8
+Create Date: 2026-10-18 04:00:00.000000
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'a8b1d4f6c3e9'
+down_revision = 'f7a0c3e5b2d8'
+branch_labels = None
+depends_on = None
+
+# table -> report date column
+TABLES = {
+    'entries_workers': 'date_of_report',
+    'entries_equipment': 'date_of_report',
+    'entries_material': 'date_of_report',
+    'entries_daily_notes': 'date_of_report',
+    'subcontractor_entries': 'date',
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = set(inspector.get_table_names())
+    for table, date_column in TABLES.items():
+        if table not in existing:
+            continue
+        index_name = f'ix_{table}_project_date_status'
+        indexes = {ix['name'] for ix in inspector.get_indexes(table)}
+        if index_name not in indexes:
+            op.create_index(index_name, table, ['project_id', date_column, 'status', 'id'])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = set(inspector.get_table_names())
+    for table in TABLES:
+        if table not in existing:
+            continue
+        index_name = f'ix_{table}_project_date_status'
+        indexes = {ix['name'] for ix in inspector.get_indexes(table)}
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
@@ -0,0 +1,33 @@
+"""add evm_computed_at to project_tasks
+
+Revision ID: b2c6e9a3d8f4
+Revises: a1b5d8f2c7e3
+Create Date: 2026-10-18 00:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'b2c6e9a3d8f4'
+down_revision = 'a1b5d8f2c7e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [c['name'] for c in inspector.get_columns('project_tasks')]
+    if 'evm_computed_at' not in columns:
+        with op.batch_alter_table('project_tasks', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('evm_computed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [c['name'] for c in inspector.get_columns('project_tasks')]
+    if 'evm_computed_at' in columns:
+        with op.batch_alter_table('project_tasks', schema=None) as batch_op:
+            batch_op.drop_column('evm_computed_at')
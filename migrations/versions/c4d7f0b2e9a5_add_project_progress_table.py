@@ -0,0 +1,47 @@
+"""add project_progress table
+
+Revision ID: c4d7f0b2e9a5
+Revises: b2c6e9a3d8f4
+Create Date: 2026-10-18 00:50:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7f0b2e9a5'
+down_revision = 'b2c6e9a3d8f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'project_progress' in inspector.get_table_names():
+        return
+    op.create_table(
+        'project_progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('report_date', sa.Date(), nullable=False),
+        sa.Column('actual_hours', sa.Float(), nullable=False),
+        sa.Column('actual_cost', sa.Float(), nullable=False),
+        sa.Column('earned_value', sa.Float(), nullable=False),
+        sa.Column('planned_value', sa.Float(), nullable=False),
+        sa.Column('cumulative_actual_hours', sa.Float(), nullable=False),
+        sa.Column('cumulative_cost', sa.Float(), nullable=False),
+        sa.Column('cumulative_earned_value', sa.Float(), nullable=False),
+        sa.Column('cumulative_planned_value', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'report_date', name='uq_project_progress_project_date'),
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'project_progress' in inspector.get_table_names():
+        op.drop_table('project_progress')
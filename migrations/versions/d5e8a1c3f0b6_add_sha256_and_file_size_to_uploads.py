@@ -0,0 +1,47 @@
+"""add sha256 and file_size to documents and daily_pictures
+
+Revision ID: d5e8a1c3f0b6
+Revises: c4d7f0b2e9a5
+Create Date: 2026-10-18 01:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'd5e8a1c3f0b6'
+down_revision = 'c4d7f0b2e9a5'
+branch_labels = None
+depends_on = None
+
+TABLES = ('documents', 'daily_pictures')
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        columns = [c['name'] for c in inspector.get_columns(table)]
+        indexes = [i['name'] for i in inspector.get_indexes(table)]
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            if 'sha256' not in columns:
+                batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+            if 'file_size' not in columns:
+                batch_op.add_column(sa.Column('file_size', sa.BigInteger(), nullable=True))
+            if f'ix_{table}_sha256' not in indexes:
+                batch_op.create_index(f'ix_{table}_sha256', ['sha256'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        columns = [c['name'] for c in inspector.get_columns(table)]
+        indexes = [i['name'] for i in inspector.get_indexes(table)]
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            if f'ix_{table}_sha256' in indexes:
+                batch_op.drop_index(f'ix_{table}_sha256')
+            if 'file_size' in columns:
+                batch_op.drop_column('file_size')
+            if 'sha256' in columns:
+                batch_op.drop_column('sha256')
@@ -0,0 +1,37 @@
+"""add (project_id, status, uploaded_at, id) indexes to documents and daily_pictures
+
+Revision ID: e6f9b2d4a1c7
+Revises: d5e8a1c3f0b6
+Create Date: 2026-10-18 02:00:00.000000
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'e6f9b2d4a1c7'
+down_revision = 'd5e8a1c3f0b6'
+branch_labels = None
+depends_on = None
+
+TABLES = ('documents', 'daily_pictures')
+COLUMNS = ['project_id', 'status', 'uploaded_at', 'id']
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        index_name = f'ix_{table}_project_status_uploaded'
+        indexes = {ix['name'] for ix in inspector.get_indexes(table)}
+        if index_name not in indexes:
+            op.create_index(index_name, table, COLUMNS)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        index_name = f'ix_{table}_project_status_uploaded'
+        indexes = {ix['name'] for ix in inspector.get_indexes(table)}
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
@@ -0,0 +1,52 @@
+"""reference cw_packages by (project_id, code) from documents
+
+cw_packages has a composite primary key, so the single-column
+documents.cwp_code -> cw_packages.code constraint is a "foreign key
+mismatch" that SQLite rejects on every insert once foreign_keys=ON.
+
+Revision ID: f7a0c3e5b2d8
+Revises: e6f9b2d4a1c7
+Create Date: 2026-10-18 03:00:00.000000
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = 'f7a0c3e5b2d8'
+down_revision = 'e6f9b2d4a1c7'
+branch_labels = None
+depends_on = None
+
+FK_NAME = 'fk_documents_cwp_code'
+
+
+def _cwp_foreign_keys(inspector):
+    return [fk for fk in inspector.get_foreign_keys('documents')
+            if fk.get('referred_table') == 'cw_packages']
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = _cwp_foreign_keys(inspector)
+    if any(fk['constrained_columns'] == ['project_id', 'cwp_code'] for fk in existing):
+        return
+    with op.batch_alter_table('documents', schema=None, reflect_kwargs={'resolve_fks': False}) as batch_op:
+        for fk in existing:
+            if fk.get('name'):
+                batch_op.drop_constraint(fk['name'], type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'cw_packages', ['project_id', 'cwp_code'],
+                                    ['project_id', 'code'])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    existing = _cwp_foreign_keys(inspector)
+    if any(fk['constrained_columns'] == ['cwp_code'] for fk in existing):
+        return
+    with op.batch_alter_table('documents', schema=None, reflect_kwargs={'resolve_fks': False}) as batch_op:
+        for fk in existing:
+            if fk.get('name'):
+                batch_op.drop_constraint(fk['name'], type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'cw_packages', ['cwp_code'], ['code'])